@@ -3,14 +3,14 @@
 import asyncio
 from logging.config import fileConfig
 
-from alembic import context
 from sqlalchemy import pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
+from alembic import context
 from app.core.config import settings
 from app.db.base import Base
-from app.models import Task, User  # noqa: F401
+from app.models import Task, TaskDailyStats, TaskStats, User  # noqa: F401
 
 # this is the Alembic Config object
 config = context.config
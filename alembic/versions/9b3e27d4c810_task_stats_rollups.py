@@ -0,0 +1,184 @@
+"""Task statistics rollups maintained by triggers
+
+Adds tasks.completed_at (backfilled from updated_at for tasks already completed),
+the task_stats and task_daily_stats rollups, and the triggers that keep them
+current, then fills the rollups. Runs in one transaction; adding the column locks
+tasks until it commits, so no write can land between the fill and the triggers.
+
+Revision ID: 9b3e27d4c810
+Revises: 5f1d0c7a9e42
+Create Date: 2026-10-17 12:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3e27d4c810"
+down_revision: Union[str, None] = "5f1d0c7a9e42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copied rather than imported from app.models.task_stats, so this revision stays
+# as written
+
+# Apply the signed rows of a statement's transition tables to both rollups in one
+# statement. Rows for users already deleted (a cascade from users) are skipped, and
+# groups that net to zero are not written.
+APPLY_CHANGES_SQL = """
+    WITH changes AS ({changes}),
+    totals AS (
+        INSERT INTO task_stats AS s (user_id, total, completed)
+        SELECT user_id, sum(sign), coalesce(sum(sign) FILTER (WHERE is_completed), 0)
+        FROM changes
+        WHERE EXISTS (SELECT 1 FROM users WHERE users.id = changes.user_id)
+        GROUP BY user_id
+        HAVING sum(sign) <> 0 OR coalesce(sum(sign) FILTER (WHERE is_completed), 0) <> 0
+        ON CONFLICT (user_id) DO UPDATE
+        SET total = s.total + excluded.total, completed = s.completed + excluded.completed
+    )
+    INSERT INTO task_daily_stats AS d (user_id, day, created, completed)
+    SELECT user_id, day, sum(created), sum(completed)
+    FROM (
+        SELECT user_id, created_at::date AS day, sign AS created, 0 AS completed
+        FROM changes
+        UNION ALL
+        SELECT user_id, completed_at::date, 0, sign
+        FROM changes
+        WHERE completed_at IS NOT NULL
+    ) AS days
+    WHERE EXISTS (SELECT 1 FROM users WHERE users.id = days.user_id)
+    GROUP BY user_id, day
+    HAVING sum(created) <> 0 OR sum(completed) <> 0
+    ON CONFLICT (user_id, day) DO UPDATE
+    SET created = d.created + excluded.created, completed = d.completed + excluded.completed;
+"""
+
+CHANGED_COLUMNS = "user_id, is_completed, created_at, completed_at"
+
+# Trigger function name -> signed transition-table rows it applies
+ROLLUP_FUNCTIONS = {
+    "task_stats_after_insert": f"SELECT 1 AS sign, {CHANGED_COLUMNS} FROM new_tasks",
+    "task_stats_after_update": (
+        f"SELECT 1 AS sign, {CHANGED_COLUMNS} FROM new_tasks "
+        f"UNION ALL SELECT -1, {CHANGED_COLUMNS} FROM old_tasks"
+    ),
+    "task_stats_after_delete": f"SELECT -1 AS sign, {CHANGED_COLUMNS} FROM old_tasks",
+}
+
+TASK_STATS_DDL = [
+    # completed_at records the day a task was completed for the daily rollup. Inserts
+    # set it themselves: a BEFORE INSERT row trigger would stop COPY batching rows
+    """
+    CREATE OR REPLACE FUNCTION tasks_set_completed_at() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF NEW.is_completed AND NOT OLD.is_completed THEN
+            NEW.completed_at := now() AT TIME ZONE 'utc';
+        ELSIF NOT NEW.is_completed THEN
+            NEW.completed_at := NULL;
+        END IF;
+        RETURN NEW;
+    END $$
+    """,
+    """
+    CREATE TRIGGER tasks_set_completed_at BEFORE UPDATE OF is_completed ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_set_completed_at()
+    """,
+    *(
+        f"""
+        CREATE OR REPLACE FUNCTION {name}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            {APPLY_CHANGES_SQL.format(changes=changes)}
+            RETURN NULL;
+        END $$
+        """
+        for name, changes in ROLLUP_FUNCTIONS.items()
+    ),
+    # Statement-level, so a batch or COPY updates each counter row once
+    """
+    CREATE TRIGGER task_stats_after_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION task_stats_after_insert()
+    """,
+    # Can't be narrowed to UPDATE OF (transition tables forbid column lists); edits
+    # that don't move a counter net to zero and write nothing
+    """
+    CREATE TRIGGER task_stats_after_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION task_stats_after_update()
+    """,
+    """
+    CREATE TRIGGER task_stats_after_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION task_stats_after_delete()
+    """,
+]
+
+# Recompute both rollups from tasks; {user_filter} narrows every statement to one user
+REBUILD_SQL = [
+    "DELETE FROM task_stats WHERE {user_filter}",
+    "DELETE FROM task_daily_stats WHERE {user_filter}",
+    """
+    INSERT INTO task_stats (user_id, total, completed)
+    SELECT user_id, count(*), count(*) FILTER (WHERE is_completed)
+    FROM tasks
+    WHERE {user_filter}
+    GROUP BY user_id
+    """,
+    """
+    INSERT INTO task_daily_stats (user_id, day, created, completed)
+    SELECT user_id, day, sum(created), sum(completed)
+    FROM (
+        SELECT user_id, created_at::date AS day, 1 AS created, 0 AS completed
+        FROM tasks
+        WHERE {user_filter}
+        UNION ALL
+        SELECT user_id, completed_at::date, 0, 1
+        FROM tasks
+        WHERE completed_at IS NOT NULL AND {user_filter}
+    ) AS days
+    GROUP BY user_id, day
+    """,
+]
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("completed_at", sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE tasks SET completed_at = coalesce(updated_at, created_at) WHERE is_completed"
+    )
+    op.create_table(
+        "task_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("completed", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_table(
+        "task_daily_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("created", sa.Integer(), nullable=False),
+        sa.Column("completed", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+    for statement in TASK_STATS_DDL:
+        op.execute(statement)
+    for statement in REBUILD_SQL:
+        op.execute(statement.format(user_filter="true"))
+
+
+def downgrade() -> None:
+    for name in (*ROLLUP_FUNCTIONS, "tasks_set_completed_at"):
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON tasks")
+        op.execute(f"DROP FUNCTION IF EXISTS {name}()")
+    op.drop_table("task_daily_stats")
+    op.drop_table("task_stats")
+    op.drop_column("tasks", "completed_at")
@@ -0,0 +1,56 @@
+"""Task listing indexes
+
+Created CONCURRENTLY so they can be added to a populated tasks table without
+blocking writes. CONCURRENTLY can't run in a transaction, hence the autocommit
+block; IF NOT EXISTS lets a failed run be retried after dropping any index left
+INVALID.
+
+Revision ID: c13a2988ceb5
+Revises: 80b308922942
+Create Date: 2026-10-17 10:21:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c13a2988ceb5"
+down_revision: Union[str, None] = "80b308922942"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, columns, partial index predicate)
+INDEXES = [
+    ("ix_tasks_user_id_id", ["user_id", "id"], None),
+    ("ix_tasks_user_id_id_open", ["user_id", "id"], "NOT is_completed"),
+    ("ix_tasks_user_id_created_at_id", ["user_id", "created_at", "id"], None),
+    (
+        "ix_tasks_user_id_updated_at_id",
+        ["user_id", sa.text("coalesce(updated_at, created_at)"), "id"],
+        None,
+    ),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(
+                name,
+                "tasks",
+                columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name="tasks", postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,108 @@
+"""Per-user task change version for list ETags
+
+Adds task_stats.version and has the rollup triggers bump it on every statement
+that writes a user's tasks, even when the counts net to zero.
+
+Revision ID: e4a7c2f95b18
+Revises: 9b3e27d4c810
+Create Date: 2026-10-17 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7c2f95b18"
+down_revision: Union[str, None] = "9b3e27d4c810"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copied rather than imported from app.models.task_stats, so this revision stays
+# as written
+
+# Counter upserts: every touched user's version moves, even when the counts don't
+TOTALS_SQL = """
+        INSERT INTO task_stats AS s (user_id, total, completed, version)
+        SELECT user_id, sum(sign), coalesce(sum(sign) FILTER (WHERE is_completed), 0), 1
+        FROM changes
+        WHERE EXISTS (SELECT 1 FROM users WHERE users.id = changes.user_id)
+        GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET total = s.total + excluded.total,
+            completed = s.completed + excluded.completed,
+            version = s.version + 1
+"""
+
+# As revision 9b3e27d4c810 left them
+PREVIOUS_TOTALS_SQL = """
+        INSERT INTO task_stats AS s (user_id, total, completed)
+        SELECT user_id, sum(sign), coalesce(sum(sign) FILTER (WHERE is_completed), 0)
+        FROM changes
+        WHERE EXISTS (SELECT 1 FROM users WHERE users.id = changes.user_id)
+        GROUP BY user_id
+        HAVING sum(sign) <> 0 OR coalesce(sum(sign) FILTER (WHERE is_completed), 0) <> 0
+        ON CONFLICT (user_id) DO UPDATE
+        SET total = s.total + excluded.total, completed = s.completed + excluded.completed
+"""
+
+APPLY_CHANGES_SQL = """
+    WITH changes AS ({changes}),
+    totals AS ({totals})
+    INSERT INTO task_daily_stats AS d (user_id, day, created, completed)
+    SELECT user_id, day, sum(created), sum(completed)
+    FROM (
+        SELECT user_id, created_at::date AS day, sign AS created, 0 AS completed
+        FROM changes
+        UNION ALL
+        SELECT user_id, completed_at::date, 0, sign
+        FROM changes
+        WHERE completed_at IS NOT NULL
+    ) AS days
+    WHERE EXISTS (SELECT 1 FROM users WHERE users.id = days.user_id)
+    GROUP BY user_id, day
+    HAVING sum(created) <> 0 OR sum(completed) <> 0
+    ON CONFLICT (user_id, day) DO UPDATE
+    SET created = d.created + excluded.created, completed = d.completed + excluded.completed;
+"""
+
+CHANGED_COLUMNS = "user_id, is_completed, created_at, completed_at"
+
+ROLLUP_FUNCTIONS = {
+    "task_stats_after_insert": f"SELECT 1 AS sign, {CHANGED_COLUMNS} FROM new_tasks",
+    "task_stats_after_update": (
+        f"SELECT 1 AS sign, {CHANGED_COLUMNS} FROM new_tasks "
+        f"UNION ALL SELECT -1, {CHANGED_COLUMNS} FROM old_tasks"
+    ),
+    "task_stats_after_delete": f"SELECT -1 AS sign, {CHANGED_COLUMNS} FROM old_tasks",
+}
+
+
+def replace_rollup_functions(totals: str) -> None:
+    """Redefine the rollup trigger functions; the triggers pick them up by name."""
+    for name, changes in ROLLUP_FUNCTIONS.items():
+        op.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {name}() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                {APPLY_CHANGES_SQL.format(changes=changes, totals=totals)}
+                RETURN NULL;
+            END $$
+            """
+        )
+
+
+def upgrade() -> None:
+    op.add_column(
+        "task_stats",
+        sa.Column("version", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+    )
+    replace_rollup_functions(TOTALS_SQL)
+
+
+def downgrade() -> None:
+    replace_rollup_functions(PREVIOUS_TOTALS_SQL)
+    op.drop_column("task_stats", "version")
@@ -9,13 +9,14 @@ from app.core.exceptions import UnauthorizedError
 from app.core.security import decode_access_token
 from app.db.base import get_db
 from app.repositories.user_repository import UserRepository
+from app.schemas.user import Principal
 
 
-async def get_current_user_id(
+async def get_current_principal(
     authorization: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
-) -> int:
-    """Get current user ID from JWT token."""
+) -> Principal:
+    """Resolve the authenticated user from the JWT token once per request."""
     if not authorization:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -49,13 +50,17 @@ async def get_current_user_id(
             detail="Invalid token payload",
         )
 
-    # Verify user exists and is active
+    # Verify user exists and is active (cached, so usually no DB round trip)
     user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id)
-    if not user or not user.is_active:
+    if not await user_repo.is_active(user_id):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
 
-    return user_id
+    return Principal(user_id=user_id, email=payload.get("sub"))
+
+
+async def get_current_user_id(principal: Principal = Depends(get_current_principal)) -> int:
+    """Get current user ID from JWT token."""
+    return principal.user_id
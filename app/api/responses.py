@@ -0,0 +1,136 @@
+"""Response helpers."""
+
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Optional
+
+import msgpack
+from fastapi import Request, Response, status
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = frozenset({MSGPACK_MEDIA_TYPE, "application/x-msgpack"})
+
+# Media type the current request accepts; set per request by NegotiatedRoute
+response_media_type: ContextVar[str] = ContextVar("response_media_type", default=JSON_MEDIA_TYPE)
+
+
+@lru_cache(maxsize=256)
+def get_adapter(response_type: Any) -> TypeAdapter:
+    """Return a TypeAdapter for a response type, building it only once."""
+    return TypeAdapter(response_type)
+
+
+def serialize(response_type: Any, data: Any, media_type: str = JSON_MEDIA_TYPE) -> bytes:
+    """Validate data against a response type once and dump it straight to JSON or MessagePack.
+
+    MessagePack carries the same values as the JSON form (datetimes as ISO 8601
+    strings), packed from the validated data without going through JSON text.
+    """
+    adapter = get_adapter(response_type)
+    value = adapter.validate_python(data, from_attributes=True)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        packed: bytes = msgpack.packb(adapter.dump_python(value, mode="json"))
+        return packed
+    return adapter.dump_json(value)
+
+
+def typed_response(
+    response_type: Any,
+    data: Any,
+    status_code: int = status.HTTP_200_OK,
+    headers: Optional[dict[str, str]] = None,
+) -> Response:
+    """Build a JSON or MessagePack response validated once against response_type.
+
+    Returning a Response skips FastAPI's second response_model validation and
+    jsonable_encoder pass; keep response_model on the route for the OpenAPI schema.
+    """
+    media_type = response_media_type.get()
+    return Response(
+        content=serialize(response_type, data, media_type),
+        status_code=status_code,
+        headers={**(headers or {}), "Vary": "Accept"},
+        media_type=media_type,
+    )
+
+
+def media_type_variant() -> Optional[str]:
+    """The negotiated media type unless it is the default JSON; ETags hash it in."""
+    media_type = response_media_type.get()
+    return None if media_type == JSON_MEDIA_TYPE else media_type
+
+
+def not_modified(etag: str) -> Response:
+    """Build a 304 response for a conditional GET whose ETag still matches."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick JSON or MessagePack from an Accept header; MessagePack wins ties."""
+    if not accept:
+        return JSON_MEDIA_TYPE
+    quality = {JSON_MEDIA_TYPE: 0.0, MSGPACK_MEDIA_TYPE: 0.0}
+    for media_range in accept.split(","):
+        media_type, *params = (part.strip() for part in media_range.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media_type = media_type.lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            quality[MSGPACK_MEDIA_TYPE] = max(quality[MSGPACK_MEDIA_TYPE], q)
+        elif media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            quality[JSON_MEDIA_TYPE] = max(quality[JSON_MEDIA_TYPE], q)
+    msgpack_q = quality[MSGPACK_MEDIA_TYPE]
+    if msgpack_q > 0 and msgpack_q >= quality[JSON_MEDIA_TYPE]:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+class MsgPackRequest(Request):
+    """Request whose MessagePack body FastAPI reads as if it were JSON."""
+
+    async def json(self) -> Any:
+        """Decode the body as MessagePack."""
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """Route that accepts MessagePack request bodies and answers in the accepted media type.
+
+    Responses built with typed_response follow the Accept header; error responses
+    stay JSON. A body that isn't valid MessagePack gets FastAPI's 400.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """Wrap FastAPI's handler with body decoding and response negotiation."""
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type in MSGPACK_MEDIA_TYPES:
+                # FastAPI only calls request.json() for JSON content types
+                headers = [
+                    (name, value)
+                    for name, value in request.scope["headers"]
+                    if name != b"content-type"
+                ]
+                headers.append((b"content-type", JSON_MEDIA_TYPE.encode()))
+                request = MsgPackRequest({**request.scope, "headers": headers}, request.receive)
+            token = response_media_type.set(negotiate(request.headers.get("accept")))
+            try:
+                return await handler(request)
+            finally:
+                response_media_type.reset(token)
+
+        return negotiated_handler
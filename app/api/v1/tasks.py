@@ -1,74 +1,304 @@
 """Task endpoints."""
 
-from typing import List
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query, status
+import anyio
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user_id
-from app.db.base import get_db
-from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from app.api.dependencies import get_current_principal
+from app.api.responses import NegotiatedRoute, media_type_variant, not_modified, typed_response
+from app.core.etags import none_match, task_etag, task_list_etag, task_version, task_versions
+from app.db.base import get_db, get_read_db
+from app.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchResponse,
+    TaskBatchUpdate,
+    TaskCreate,
+    TaskFileFormat,
+    TaskFilter,
+    TaskImportResult,
+    TaskOrderBy,
+    TaskResponse,
+    TaskSearchResult,
+    TaskStatsResponse,
+    TaskUpdate,
+    parse_task_fields,
+    task_response_subset,
+)
+from app.schemas.user import Principal
 from app.services.task_service import TaskService
 
-router = APIRouter()
+router = APIRouter(route_class=NegotiatedRoute)
+
+FIELDS_DESCRIPTION = "Comma-separated subset of task fields to return (id is always included)"
+IF_NONE_MATCH_DESCRIPTION = "ETags the client has cached; 304 when one is current"
+IF_MATCH_DESCRIPTION = "Only apply if the task still has one of these ETags (412 otherwise)"
+
+
+def list_query(request: Request) -> str:
+    """The list query parameters in a stable order, for the page's ETag."""
+    return "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_data: TaskCreate,
-    user_id: int = Depends(get_current_user_id),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
-) -> TaskResponse:
+) -> Response:
     """Create a new task."""
     task_service = TaskService(db)
-    task = await task_service.create_task(user_id, task_data)
-    return TaskResponse.model_validate(task)
+    task = await task_service.create_task(principal, task_data)
+    return typed_response(TaskResponse, task, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("", response_model=List[TaskResponse])
 async def list_tasks(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    order_by: TaskOrderBy = Query(TaskOrderBy.ID, description="Prefix with - to sort descending"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    completed: Optional[bool] = Query(None),
+    created_after: Optional[datetime] = Query(None, description="Created at or after (inclusive)"),
+    created_before: Optional[datetime] = Query(None, description="Created before (exclusive)"),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """List tasks for the current user.
+
+    The next page is advertised in the ``X-Next-Cursor`` header; pass it back as
+    ``cursor`` (with the same ``order_by`` and filters) to continue. ``skip`` still
+    works but gets slower for deep pages. The created_at range requires
+    ``order_by=created_at`` or ``-created_at``.
+
+    ``X-Total-Count`` gives the number of matching tasks, from the stats rollup; it
+    is left out when filtering by created_at.
+
+    The ``ETag`` changes whenever any of the user's tasks do; sending it back in
+    ``If-None-Match`` gets a 304 decided from the stats rollup, without reading tasks.
+    """
+    selected = parse_task_fields(fields) if fields else None
+    filters = TaskFilter(
+        completed=completed, created_after=created_after, created_before=created_before
+    )
+    task_service = TaskService(db)
+    query = list_query(request)
+    if if_none_match:
+        version = await task_service.get_list_version(principal)
+        etag = task_list_etag(principal.user_id, version, query, media_type_variant())
+        if none_match(if_none_match, etag):
+            return not_modified(etag)
+
+    page, next_cursor = await task_service.list_tasks(
+        principal,
+        skip=skip,
+        limit=limit,
+        order_by=order_by.value,
+        cursor=cursor,
+        fields=selected,
+        filters=filters,
+    )
+    headers = {
+        "ETag": task_list_etag(principal.user_id, page.version, query, media_type_variant())
+    }
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if page.total is not None:
+        headers["X-Total-Count"] = str(page.total)
+    model = task_response_subset(selected) if selected else TaskResponse
+    # The sparse model is built at runtime, which static typing can't follow
+    return typed_response(list[model], page.items, headers=headers)  # type: ignore[valid-type]
+
+
+@router.get("/stats", response_model=TaskStatsResponse)
+async def get_task_stats(
+    days: int = Query(30, ge=1, le=366, description="Days of per-day counts, up to today (UTC)"),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get the current user's task counts and tasks created/completed per day.
+
+    Served from rollups that database triggers keep in step with every task
+    write, so the cost doesn't grow with the number of tasks.
+    """
+    task_service = TaskService(db)
+    stats = await task_service.get_stats(principal, days=days)
+    return typed_response(TaskStatsResponse, stats)
+
+
+@router.get("/search", response_model=List[TaskSearchResult])
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    user_id: int = Depends(get_current_user_id),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Search the current user's tasks by title and description.
+
+    Supports web-search syntax (``"exact phrase"``, ``or``, ``-word``) plus
+    typo-tolerant and prefix matching on titles. Results are ranked by relevance.
+    """
+    task_service = TaskService(db)
+    results = await task_service.search_tasks(principal, q, skip=skip, limit=limit)
+    return typed_response(list[TaskSearchResult], results)
+
+
+@router.get("/export")
+async def export_tasks(
+    export_format: TaskFileFormat = Query(TaskFileFormat.NDJSON, alias="format"),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """Stream all of the current user's tasks as NDJSON or CSV.
+
+    Rows are read from a server-side cursor in fixed-size chunks, so memory stays
+    flat however many tasks the user has. If the client disconnects, the stream is
+    cancelled and the cursor closed.
+    """
+    task_service = TaskService(db)
+
+    async def stream() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in task_service.export_tasks(principal, export_format.value):
+                yield chunk
+        finally:
+            # get_read_db is torn down before the body is sent, so close the connection the
+            # stream reopened; shielded so a disconnect can't skip the cleanup
+            with anyio.CancelScope(shield=True):
+                await db.close()
+
+    if export_format == TaskFileFormat.CSV:
+        media_type = "text/csv"
+    else:
+        media_type = "application/x-ndjson"
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{export_format.value}"'},
+    )
+
+
+@router.post("/import", response_model=TaskImportResult)
+async def import_tasks(
+    request: Request,
+    import_format: TaskFileFormat = Query(TaskFileFormat.NDJSON, alias="format"),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
-) -> List[TaskResponse]:
-    """List all tasks for the current user."""
+) -> Response:
+    """Import tasks from an NDJSON or CSV request body.
+
+    The body is read as it arrives and loaded with COPY in batches of
+    ``IMPORT_BATCH_SIZE`` rows, each committed on its own. Invalid rows are skipped
+    and reported by line number; CSV needs a header row with at least ``title``.
+    An export file can be imported as is.
+    """
     task_service = TaskService(db)
-    tasks = await task_service.list_tasks(user_id, skip=skip, limit=limit)
-    return [TaskResponse.model_validate(task) for task in tasks]
+    result = await task_service.import_tasks(principal, request.stream(), import_format.value)
+    return typed_response(TaskImportResult, result)
+
+
+@router.post("/batch", response_model=TaskBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_tasks_batch(
+    batch: TaskBatchCreate,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Create several tasks in one transaction."""
+    task_service = TaskService(db)
+    results = await task_service.create_tasks(principal, batch.items)
+    return typed_response(
+        TaskBatchResponse, TaskBatchResponse(results=results), status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.patch("/batch", response_model=TaskBatchResponse)
+async def update_tasks_batch(
+    batch: TaskBatchUpdate,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Update several tasks in one transaction, reporting each item's outcome."""
+    task_service = TaskService(db)
+    results = await task_service.update_tasks(principal, batch.items)
+    return typed_response(TaskBatchResponse, TaskBatchResponse(results=results))
+
+
+@router.delete("/batch", response_model=TaskBatchResponse)
+async def delete_tasks_batch(
+    batch: TaskBatchDelete,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Delete several tasks in one transaction, reporting each item's outcome."""
+    task_service = TaskService(db)
+    results = await task_service.delete_tasks(principal, batch.ids)
+    return typed_response(TaskBatchResponse, TaskBatchResponse(results=results))
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
-    user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
-) -> TaskResponse:
-    """Get a task by ID."""
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None, description=IF_NONE_MATCH_DESCRIPTION),
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Get a task by ID.
+
+    A matching ``If-None-Match`` gets a 304, checked against the task's version
+    without loading its body.
+    """
+    selected = parse_task_fields(fields) if fields else None
     task_service = TaskService(db)
-    task = await task_service.get_task(task_id, user_id)
-    return TaskResponse.model_validate(task)
+    if if_none_match:
+        version = await task_service.get_task_version(task_id, principal)
+        etag = task_etag(task_id, version, selected, media_type_variant())
+        if none_match(if_none_match, etag):
+            return not_modified(etag)
+
+    task = await task_service.get_task(task_id, principal, fields=selected)
+    model = task_response_subset(selected) if selected else TaskResponse
+    etag = task_etag(task_id, task_version(task), selected, media_type_variant())
+    return typed_response(model, task, headers={"ETag": etag})
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: int,
     task_data: TaskUpdate,
-    user_id: int = Depends(get_current_user_id),
+    if_match: Optional[str] = Header(None, description=IF_MATCH_DESCRIPTION),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
-) -> TaskResponse:
-    """Update a task."""
+) -> Response:
+    """Update a task.
+
+    With ``If-Match``, the version check is part of the UPDATE itself, so a
+    concurrent change can't slip in between.
+    """
+    versions = task_versions(if_match, task_id) if if_match else None
     task_service = TaskService(db)
-    task = await task_service.update_task(task_id, user_id, task_data)
-    return TaskResponse.model_validate(task)
+    task = await task_service.update_task(task_id, principal, task_data, versions)
+    etag = task_etag(task_id, task_version(task), media_type=media_type_variant())
+    return typed_response(TaskResponse, task, headers={"ETag": etag})
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: int,
-    user_id: int = Depends(get_current_user_id),
+    if_match: Optional[str] = Header(None, description=IF_MATCH_DESCRIPTION),
+    principal: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ) -> None:
-    """Delete a task."""
+    """Delete a task, only if it is still at an ``If-Match`` version when one is sent."""
+    versions = task_versions(if_match, task_id) if if_match else None
     task_service = TaskService(db)
-    await task_service.delete_task(task_id, user_id)
+    await task_service.delete_task(task_id, principal, versions)
@@ -0,0 +1,37 @@
+"""Recompute the task statistics rollups from the tasks table.
+
+Usage: python -m app.commands.rebuild_task_stats [--user-id ID]
+"""
+
+import argparse
+import asyncio
+from typing import Optional
+
+from structlog import get_logger
+
+from app.core.logging import setup_logging
+from app.db.base import AsyncSessionLocal, engine
+from app.repositories.task_stats_repository import TaskStatsRepository
+
+logger = get_logger()
+
+
+async def rebuild(user_id: Optional[int] = None) -> None:
+    """Rebuild the rollups for one user, or for everyone."""
+    async with AsyncSessionLocal() as session:
+        await TaskStatsRepository(session).rebuild(user_id)
+    await engine.dispose()
+    logger.info("Task stats rebuilt", user_id=user_id)
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", type=int, help="Only rebuild this user's rollups")
+    args = parser.parse_args()
+    setup_logging()
+    asyncio.run(rebuild(args.user_id))
+
+
+if __name__ == "__main__":
+    main()
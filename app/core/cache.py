@@ -0,0 +1,124 @@
+"""In-process caching utilities."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator
+from typing import Any, Optional
+
+from app.core.metrics import registry, sample_exposition
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a time-to-live.
+
+    Meant for use from the event loop thread, so it takes no locks. A
+    non-positive TTL disables the cache. With ``max_bytes``, keys must be str and
+    values bytes, and entries are also evicted to keep their total length under it.
+    """
+
+    def __init__(self, max_size: int, ttl: float, max_bytes: Optional[int] = None):
+        """Initialize cache with its capacity, default TTL in seconds and byte cap."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of stored entries, including expired ones not yet purged."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.max_size <= 0:
+            return
+
+        self._remove(key)
+        if self.max_bytes is not None:
+            size = self._sizeof(key, value)
+            if size > self.max_bytes:
+                return
+            self.size_bytes += size
+        self._entries[key] = (time.monotonic() + ttl, value)
+        while len(self._entries) > self.max_size or (
+            self.max_bytes is not None and self.size_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        """Drop an entry if present, keeping the byte count in step."""
+        entry = self._entries.pop(key, None)
+        if entry is not None and self.max_bytes is not None:
+            self.size_bytes -= self._sizeof(key, entry[1])
+
+    @staticmethod
+    def _sizeof(key: Hashable, value: bytes) -> int:
+        """Bytes an entry counts against max_bytes; such caches are keyed by str."""
+        assert isinstance(key, str), "byte-capped caches need str keys"
+        return len(key) + len(value)
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and current size."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Caches exported on /metrics: cache label -> function returning its stats()
+cache_stats: dict[str, Callable[[], dict]] = {}
+
+
+def cache_exposition() -> Iterator[str]:
+    """Yield the hit, miss, eviction and error counters of every exported cache."""
+    snapshots = [({"cache": name}, stats()) for name, stats in cache_stats.items()]
+    for key, description in (
+        ("hits", "Cache lookups that found a fresh entry"),
+        ("misses", "Cache lookups that found nothing usable"),
+        ("evictions", "Entries evicted to stay within the cache's bounds"),
+        ("errors", "Cache backend calls that failed"),
+    ):
+        yield from sample_exposition(
+            f"cache_{key}_total",
+            description,
+            "counter",
+            ((labels, snapshot[key]) for labels, snapshot in snapshots if key in snapshot),
+        )
+
+
+registry.register(cache_exposition)
@@ -0,0 +1,76 @@
+"""Entity tags for conditional requests."""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _micros(moment: datetime) -> int:
+    """Exact microseconds since the epoch for a naive UTC datetime."""
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def _digest(*parts: object) -> str:
+    """Short stable hash of some values."""
+    return hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).hexdigest()
+
+
+def task_version(task: Any) -> datetime:
+    """When a task (or a row with its created_at and updated_at) last changed."""
+    version: datetime = task.updated_at or task.created_at
+    return version
+
+
+def task_etag(
+    task_id: int,
+    version: datetime,
+    fields: Optional[tuple[str, ...]] = None,
+    media_type: Optional[str] = None,
+) -> str:
+    """Strong ETag for a task: its id and last change, plus the fieldset if sparse.
+
+    Representations other than the default JSON pass their ``media_type``, which
+    is hashed in along with the fieldset.
+    """
+    tag = f"{task_id}-{_micros(version)}"
+    if fields or media_type:
+        tag = f"{tag}-{_digest(*(fields or ()), media_type or '')}"
+    return f'"{tag}"'
+
+
+def task_list_etag(
+    user_id: int, version: int, query: str, media_type: Optional[str] = None
+) -> str:
+    """Strong ETag for a page of a user's tasks: their change version and the page query."""
+    return f'"v{version}-{_digest(user_id, query, media_type or "")}"'
+
+
+def parse_etags(header: str) -> list[str]:
+    """Split an If-Match or If-None-Match header into its entity tags."""
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def none_match(header: str, etag: str) -> bool:
+    """Whether If-None-Match lists the ETag; weak comparison, so W/ tags count."""
+    tags = parse_etags(header)
+    return "*" in tags or etag in {tag.removeprefix("W/") for tag in tags}
+
+
+def task_versions(header: str, task_id: int) -> Optional[list[datetime]]:
+    """Task versions an If-Match header accepts, or None for ``*`` (any version).
+
+    Strong comparison: weak tags, malformed tags and other tasks' tags never match.
+    """
+    versions = []
+    for tag in parse_etags(header):
+        if tag == "*":
+            return None
+        if len(tag) < 2 or not tag.startswith('"') or not tag.endswith('"'):
+            continue
+        tag_id, _, rest = tag[1:-1].partition("-")
+        micros = rest.partition("-")[0]
+        if tag_id == str(task_id) and micros.isdigit():
+            versions.append(EPOCH + timedelta(microseconds=int(micros)))
+    return versions
@@ -1,12 +1,26 @@
 """Global exception handlers."""
 
+from collections.abc import Awaitable, Callable
+from typing import TypeVar, cast
+
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import IntegrityError
 from structlog import get_logger
 
+from app.core.metrics import Counter, registry
+
 logger = get_logger()
 
+E = TypeVar("E", bound=Exception)
+
+handled_exceptions = Counter(
+    "app_exceptions_total",
+    "Exceptions turned into error responses, by the exception type handled",
+    ("exception",),
+)
+registry.register(handled_exceptions)
+
 
 class TaskNotFoundError(Exception):
     """Task not found exception."""
@@ -32,6 +46,18 @@ class ValidationError(Exception):
     pass
 
 
+class PreconditionFailedError(Exception):
+    """Conditional request precondition failed exception."""
+
+    pass
+
+
+class ServiceUnavailableError(Exception):
+    """Service temporarily overloaded exception."""
+
+    pass
+
+
 async def task_not_found_handler(request: Request, exc: TaskNotFoundError) -> JSONResponse:
     """Handle TaskNotFoundError."""
     logger.warning("Task not found", path=request.url.path)
@@ -68,6 +94,29 @@ async def validation_error_handler(request: Request, exc: ValidationError) -> JS
     )
 
 
+async def precondition_failed_handler(
+    request: Request, exc: PreconditionFailedError
+) -> JSONResponse:
+    """Handle PreconditionFailedError."""
+    logger.info("Precondition failed", path=request.url.path)
+    return JSONResponse(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        content={"detail": str(exc)},
+    )
+
+
+async def service_unavailable_handler(
+    request: Request, exc: ServiceUnavailableError
+) -> JSONResponse:
+    """Handle ServiceUnavailableError."""
+    logger.warning("Service unavailable", path=request.url.path, error=str(exc))
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
 async def integrity_error_handler(request: Request, exc: IntegrityError) -> JSONResponse:
     """Handle SQLAlchemy IntegrityError."""
     logger.error("Database integrity error", path=request.url.path, error=str(exc))
@@ -86,11 +135,35 @@ async def generic_exception_handler(request: Request, exc: Exception) -> JSONRes
     )
 
 
+def counted(
+    exc_class: type[E], handler: Callable[[Request, E], Awaitable[JSONResponse]]
+) -> Callable[[Request, Exception], Awaitable[JSONResponse]]:
+    """Wrap an exception handler to count its calls in handled_exceptions."""
+    # Labelled by the registered class, so the catch-all can't add label values
+    name = exc_class.__name__
+    handled_exceptions.inc(name, amount=0)
+
+    async def counting_handler(request: Request, exc: Exception) -> JSONResponse:
+        handled_exceptions.inc(name)
+        # Starlette only passes exceptions of the class the handler is registered for
+        return await handler(request, cast(E, exc))
+
+    return counting_handler
+
+
 def setup_exception_handlers(app: FastAPI) -> None:
     """Setup exception handlers for the application."""
-    app.add_exception_handler(TaskNotFoundError, task_not_found_handler)
-    app.add_exception_handler(UserNotFoundError, user_not_found_handler)
-    app.add_exception_handler(UnauthorizedError, unauthorized_handler)
-    app.add_exception_handler(ValidationError, validation_error_handler)
-    app.add_exception_handler(IntegrityError, integrity_error_handler)
-    app.add_exception_handler(Exception, generic_exception_handler)
+
+    def register(
+        exc_class: type[E], handler: Callable[[Request, E], Awaitable[JSONResponse]]
+    ) -> None:
+        app.add_exception_handler(exc_class, counted(exc_class, handler))
+
+    register(TaskNotFoundError, task_not_found_handler)
+    register(UserNotFoundError, user_not_found_handler)
+    register(UnauthorizedError, unauthorized_handler)
+    register(ValidationError, validation_error_handler)
+    register(PreconditionFailedError, precondition_failed_handler)
+    register(ServiceUnavailableError, service_unavailable_handler)
+    register(IntegrityError, integrity_error_handler)
+    register(Exception, generic_exception_handler)
@@ -1,22 +1,210 @@
 """Logging configuration."""
 
+import atexit
 import logging
+import queue
 import sys
+import threading
+from collections.abc import Iterator
+from typing import Any, Optional, TextIO
 
 import structlog
-from structlog.types import Processor
+from structlog.types import EventDict, Processor
 
 from app.core.config import settings
+from app.core.metrics import registry, sample_exposition
 
+# Lines written per stream write by the background writer, at most
+WRITE_BATCH_SIZE = 256
 
-def setup_logging() -> None:
-    """Setup structured logging."""
-    processors: list[Processor] = [
-        structlog.contextvars.merge_contextvars,
-        structlog.processors.add_log_level,
-        structlog.processors.StackInfoRenderer(),
-        structlog.dev.set_exc_info,
-    ]
+
+class EventSampler:
+    """Processor keeping only a share of some events, by event name.
+
+    A rate of 0.01 keeps one record in a hundred. Selection is by running credit
+    rather than at random, so the kept share is exact; kept records carry their
+    ``sample_rate`` so counts can be scaled back up.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        """Initialize sampler with event name -> share of records kept."""
+        self.rates = rates
+        # Start one step short of a whole record, so the first occurrence is kept
+        self._credit = {event: 1 - rate for event, rate in rates.items()}
+
+    def __call__(self, logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+        """Drop the record unless its event is unsampled or its turn has come."""
+        event = str(event_dict.get("event"))
+        rate = self.rates.get(event)
+        if rate is None:
+            return event_dict
+        credit = self._credit[event] + rate
+        if credit < 1:
+            self._credit[event] = credit
+            raise structlog.DropEvent
+        self._credit[event] = credit - 1
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+class QueuedWriter:
+    """Writes rendered log lines to a stream from a background thread.
+
+    Callers only enqueue. When ``max_size`` lines are already waiting, new lines
+    are dropped and counted instead of blocking the caller; the writer reports
+    the drops in a line of its own once it catches up.
+    """
+
+    def __init__(self, stream: TextIO, max_size: int):
+        """Initialize writer for a stream and start its thread."""
+        self.stream = stream
+        self.queue: queue.Queue[Optional[str]] = queue.Queue(maxsize=max_size)
+        self.dropped = 0
+        self.written = 0
+        self._reported_dropped = 0
+        self._drop_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, line: str) -> None:
+        """Queue a line for writing, or drop it if the queue is full."""
+        try:
+            self.queue.put_nowait(line)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write everything queued so far and stop the thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        """Return lines written, dropped and currently queued."""
+        return {"written": self.written, "dropped": self.dropped, "queued": self.queue.qsize()}
+
+    def _run(self) -> None:
+        """Write queued lines in batches until closed."""
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = None in batch
+            lines: list[str] = [line for line in batch if line is not None]
+            dropped = self.dropped
+            if dropped > self._reported_dropped:
+                report = structlog.processors.JSONRenderer()(
+                    None,
+                    "warning",
+                    {
+                        "event": "Log records dropped",
+                        "level": "warning",
+                        "dropped": dropped - self._reported_dropped,
+                    },
+                )
+                lines.append(report if isinstance(report, str) else report.decode())
+                self._reported_dropped = dropped
+            if lines:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+                self.written += len(lines)
+
+
+class QueueLogger:
+    """structlog logger that hands rendered lines to a QueuedWriter."""
+
+    def __init__(self, writer: QueuedWriter):
+        """Initialize logger with the writer it queues to."""
+        self._writer = writer
+
+    def msg(self, message: str) -> None:
+        """Queue a rendered line."""
+        self._writer.put(message)
+
+    log = debug = info = warn = warning = error = critical = exception = fatal = msg
+
+
+class QueueLoggerFactory:
+    """structlog logger factory for QueueLogger."""
+
+    def __init__(self, writer: QueuedWriter):
+        """Initialize factory with the shared writer."""
+        self._writer = writer
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        """Return a logger; the name arguments are ignored."""
+        return QueueLogger(self._writer)
+
+
+class QueueHandler(logging.Handler):
+    """Standard logging handler that formats on the caller and queues to a QueuedWriter."""
+
+    def __init__(self, writer: QueuedWriter):
+        """Initialize handler with the shared writer."""
+        super().__init__()
+        self._writer = writer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue the formatted record."""
+        try:
+            self._writer.put(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+# The production writer, while one is running
+log_writer: Optional[QueuedWriter] = None
+
+
+def log_writer_exposition() -> Iterator[str]:
+    """Yield the background log writer's line counters and queue depth, if it is running."""
+    if log_writer is None:
+        return
+    stats = log_writer.stats()
+    for key, kind, description in (
+        ("written", "counter", "Log lines written by the background writer"),
+        ("dropped", "counter", "Log lines dropped because the writer's queue was full"),
+        ("queued", "gauge", "Log lines waiting for the background writer"),
+    ):
+        metric = f"log_lines_{key}_total" if kind == "counter" else f"log_lines_{key}"
+        yield from sample_exposition(metric, description, kind, [({}, stats[key])])
+
+
+registry.register(log_writer_exposition)
+
+
+def setup_logging(stream: Optional[TextIO] = None) -> None:
+    """Setup structured logging.
+
+    In production (DEBUG off) records are rendered as JSON by the caller and, when
+    LOG_QUEUE_SIZE is positive, written by a background thread; events listed in
+    LOG_SAMPLE_RATES are sampled.
+    """
+    global log_writer
+    shutdown_logging()
+    stream = stream or sys.stdout
+
+    processors: list[Processor] = []
+    if settings.LOG_SAMPLE_RATES:
+        # First, so dropped records cost no further processing
+        processors.append(EventSampler(settings.LOG_SAMPLE_RATES))
+    processors.extend(
+        [
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            structlog.dev.set_exc_info,
+        ]
+    )
 
     if settings.DEBUG:
         processors.append(structlog.dev.ConsoleRenderer())
@@ -29,17 +217,37 @@ def setup_logging() -> None:
             ]
         )
 
+    if not settings.DEBUG and settings.LOG_QUEUE_SIZE > 0:
+        log_writer = QueuedWriter(stream, settings.LOG_QUEUE_SIZE)
+        logger_factory: Any = QueueLoggerFactory(log_writer)
+        handler: logging.Handler = QueueHandler(log_writer)
+    else:
+        logger_factory = structlog.PrintLoggerFactory(stream)
+        handler = logging.StreamHandler(stream)
+
     structlog.configure(
         processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(settings.LOG_LEVEL)),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
-        cache_logger_on_first_use=False,
+        logger_factory=logger_factory,
+        cache_logger_on_first_use=True,
     )
 
     # Configure standard logging
+    handler.setFormatter(logging.Formatter("%(message)s"))
     logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
+        handlers=[handler],
         level=getattr(logging, settings.LOG_LEVEL.upper()),
+        force=True,
     )
+
+
+def shutdown_logging() -> None:
+    """Flush and stop the background writer, if any."""
+    global log_writer
+    if log_writer is not None:
+        log_writer.close()
+        log_writer = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,187 @@
+"""Lightweight in-process metrics and their Prometheus text exposition."""
+
+import math
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Content type of the Prometheus text format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, in the Prometheus style.
+
+    Observations are expected from the event loop thread, so no locking is done.
+    """
+
+    def __init__(self, name: str, description: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """Initialize histogram with a name, help text and bucket upper bounds."""
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        """Return count, sum and cumulative bucket counts keyed by upper bound."""
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(
+            (*self.buckets, float("inf")), self.bucket_counts, strict=True
+        ):
+            cumulative += bucket_count
+            buckets[bound] = cumulative
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+class LabeledHistogram:
+    """Histograms of one metric, one per combination of label values.
+
+    Like Histogram, meant for the event loop thread: a child is created on first
+    use and observing it is a dict lookup plus a bisect.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        """Initialize histogram family with a name, help text, label names and buckets."""
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self.children: dict[tuple[str, ...], Histogram] = {}
+
+    def labels(self, *values: str) -> Histogram:
+        """Return the histogram for the given label values, creating it on first use."""
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = Histogram(self.name, self.description, self.buckets)
+        return child
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record a single observation under the given label values."""
+        self.labels(*label_values).observe(value)
+
+    def exposition(self) -> Iterator[str]:
+        """Yield the family in the Prometheus text format."""
+        yield from histogram_exposition(
+            self.name,
+            self.description,
+            (
+                (dict(zip(self.label_names, values, strict=True)), child.snapshot())
+                for values, child in self.children.items()
+            ),
+        )
+
+
+class Counter:
+    """Counter per combination of label values; increments are plain dict updates."""
+
+    def __init__(self, name: str, description: str, label_names: tuple[str, ...] = ()):
+        """Initialize counter with a name, help text and label names."""
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """Add to the count under the given label values."""
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def exposition(self) -> Iterator[str]:
+        """Yield the counter in the Prometheus text format."""
+        yield from sample_exposition(
+            self.name,
+            self.description,
+            "counter",
+            (
+                (dict(zip(self.label_names, values, strict=True)), value)
+                for values, value in self.values.items()
+            ),
+        )
+
+
+def format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """Format a label set, escaping values; empty when there are no labels."""
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{escape_label(str(value))}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def escape_label(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def sample_exposition(
+    name: str, description: str, kind: str, samples: Iterable[tuple[dict[str, str], float]]
+) -> Iterator[str]:
+    """Yield HELP, TYPE and one line per sample of a counter or gauge."""
+    yield f"# HELP {name} {description}"
+    yield f"# TYPE {name} {kind}"
+    for labels, value in samples:
+        yield f"{name}{format_labels(labels)} {format_value(value)}"
+
+
+def histogram_exposition(
+    name: str, description: str, snapshots: Iterable[tuple[dict[str, str], dict]]
+) -> Iterator[str]:
+    """Yield HELP, TYPE and the bucket, sum and count lines of histogram snapshots."""
+    yield f"# HELP {name} {description}"
+    yield f"# TYPE {name} histogram"
+    for labels, snapshot in snapshots:
+        for bound, count in snapshot["buckets"].items():
+            bucket_labels = format_labels({**labels, "le": format_value(bound)})
+            yield f"{name}_bucket{bucket_labels} {count}"
+        yield f"{name}_sum{format_labels(labels)} {format_value(snapshot['sum'])}"
+        yield f"{name}_count{format_labels(labels)} {snapshot['count']}"
+
+
+class MetricsRegistry:
+    """Collectors rendered together by the /metrics endpoint.
+
+    A collector is anything with an ``exposition()`` method, or a callable
+    returning lines, for values read only at scrape time (gauges).
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.collectors: list[Callable[[], Iterable[str]]] = []
+
+    def register(self, collector: Any) -> None:
+        """Add a metric, or a callable yielding exposition lines."""
+        self.collectors.append(getattr(collector, "exposition", collector))
+
+    def render(self) -> str:
+        """Return every collector's lines in the Prometheus text format."""
+        lines = [line for collector in self.collectors for line in collector()]
+        return "\n".join(lines) + "\n"
+
+
+# Everything served by /metrics
+registry = MetricsRegistry()
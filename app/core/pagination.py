@@ -0,0 +1,34 @@
+"""Cursor pagination utilities."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from app.core.exceptions import ValidationError
+
+
+def encode_cursor(order_by: str, key: Any, last_id: int) -> str:
+    """Encode an opaque keyset cursor from the last row's sort key and id."""
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = json.dumps([order_by, key, last_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> tuple[Any, int]:
+    """Decode a keyset cursor into (sort key, id) for the given sort order."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, key, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(last_id, int):
+            raise ValueError("cursor id must be an integer")
+        if order_by.removeprefix("-") != "id":
+            key = datetime.fromisoformat(key)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValidationError("Invalid cursor") from None
+
+    if cursor_order != order_by:
+        raise ValidationError("Cursor does not match the requested order_by")
+    return key, last_id
@@ -0,0 +1,243 @@
+"""Versioned read-through cache with in-process and Redis backends.
+
+Entries are keyed by an owner's version stamp, and writers bump the stamp once
+their change is committed, so a reader can never find an entry cached before
+the latest write: old entries are simply never asked for again and age out.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from structlog import get_logger
+
+from app.core.cache import TTLCache
+from app.core.redis import RedisClient, RedisError
+
+logger = get_logger()
+
+# Errors that make the cache step aside rather than fail the request
+BACKEND_ERRORS = (OSError, RedisError, TimeoutError, asyncio.IncompleteReadError)
+
+
+def seed_version() -> int:
+    """Starting value for a version stamp that is missing (never set, or evicted).
+
+    Taken from the clock, so it is beyond anything a lost stamp could have
+    counted up to and entries cached under an old stamp can't be reached again.
+    """
+    return time.time_ns()
+
+
+class CacheBackend:
+    """Storage for a ReadCache: bytes values with a TTL plus counters."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return a stored value, or None."""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds."""
+        raise NotImplementedError
+
+    async def get_version(self, key: str) -> int:
+        """Return a version stamp, seeding it when missing."""
+        raise NotImplementedError
+
+    async def bump_version(self, key: str) -> None:
+        """Move a version stamp forward, seeding it when missing."""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """Return backend-specific counters."""
+        return {}
+
+    async def close(self) -> None:
+        """Release any connections."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU capped by the total length of keys and values.
+
+    Only correct with a single worker: stamps bumped in one process are not
+    seen by others.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        """Initialize backend with its byte cap and longest TTL in seconds."""
+        # The byte cap is the real bound; the entry count only guards tiny values
+        self.entries = TTLCache(max_size=max_bytes, ttl=ttl, max_bytes=max_bytes)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return a stored value, or None."""
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds."""
+        self.entries.set(key, value, ttl=ttl)
+
+    async def get_version(self, key: str) -> int:
+        """Return a version stamp, seeding it when missing."""
+        version = self.entries.get(key)
+        if version is None:
+            version = str(seed_version()).encode()
+            self.entries.set(key, version)
+        return int(version)
+
+    async def bump_version(self, key: str) -> None:
+        """Move a version stamp forward, seeding it when missing."""
+        version = self.entries.get(key)
+        version = int(version) + 1 if version is not None else seed_version()
+        self.entries.set(key, str(version).encode())
+
+    def stats(self) -> dict:
+        """Return size and eviction counters."""
+        stats = self.entries.stats()
+        return {
+            "size": stats["size"],
+            "size_bytes": stats["size_bytes"],
+            "max_bytes": self.entries.max_bytes,
+            "evictions": stats["evictions"],
+        }
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared cache on a Redis-protocol server; stamps are seen by every worker.
+
+    Evictions happen on the server (set a maxmemory policy) and are not counted here.
+    """
+
+    def __init__(self, client: RedisClient):
+        """Initialize backend with a client."""
+        self.client = client
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return a stored value, or None."""
+        (value,) = await self.client.execute(("GET", key))
+        if value is not None and not isinstance(value, bytes):
+            raise RedisError(f"Unexpected GET reply: {value!r}")
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds."""
+        await self.client.execute(("SET", key, value, "PX", max(int(ttl * 1000), 1)))
+
+    async def get_version(self, key: str) -> int:
+        """Return a version stamp, seeding it when missing, in one round trip."""
+        _, version = await self.client.execute(("SET", key, seed_version(), "NX"), ("GET", key))
+        if not isinstance(version, bytes | int):
+            raise RedisError(f"Unexpected version reply: {version!r}")
+        return int(version)
+
+    async def bump_version(self, key: str) -> None:
+        """Move a version stamp forward, seeding it when missing, in one round trip."""
+        await self.client.execute(("SET", key, seed_version(), "NX"), ("INCR", key))
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        await self.client.close()
+
+
+class ReadCache:
+    """Read-through cache of serialized values, invalidated per owner by version stamps.
+
+    With no backend every lookup misses and nothing is stored. Backend failures
+    are logged and counted, and the caller falls back to the database.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], namespace: str, ttl: float):
+        """Initialize cache with a backend, a key prefix and an entry TTL in seconds."""
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether reads go through the cache at all."""
+        return self.backend is not None and self.ttl > 0
+
+    def _live_backend(self) -> Optional[CacheBackend]:
+        """The backend, or None while the cache is off."""
+        return self.backend if self.enabled else None
+
+    async def version(self, owner_id: int) -> Optional[int]:
+        """Return an owner's current version stamp, or None if the cache is off or failing."""
+        backend = self._live_backend()
+        if backend is None:
+            return None
+        try:
+            return await backend.get_version(f"{self.namespace}:{owner_id}:version")
+        except BACKEND_ERRORS as exc:
+            self._failed("version", exc)
+            return None
+
+    async def get(self, owner_id: int, version: int, name: str) -> Optional[bytes]:
+        """Return the value cached under an owner's version stamp, or None."""
+        backend = self._live_backend()
+        if backend is None:
+            return None
+        try:
+            value = await backend.get(self._key(owner_id, version, name))
+        except BACKEND_ERRORS as exc:
+            self._failed("get", exc)
+            return None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, owner_id: int, version: int, name: str, value: bytes) -> None:
+        """Cache a value read while the owner's stamp was ``version``."""
+        backend = self._live_backend()
+        if backend is None:
+            return
+        try:
+            await backend.set(self._key(owner_id, version, name), value, self.ttl)
+        except BACKEND_ERRORS as exc:
+            self._failed("set", exc)
+
+    async def invalidate(self, owner_id: int) -> None:
+        """Bump an owner's stamp; call after the write has committed."""
+        backend = self._live_backend()
+        if backend is None:
+            return
+        try:
+            await backend.bump_version(f"{self.namespace}:{owner_id}:version")
+        except BACKEND_ERRORS as exc:
+            # Entries already cached for this owner may be served until their TTL
+            self._failed("invalidate", exc)
+
+    def stats(self) -> dict:
+        """Return hit/miss/error counters and the backend's own."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            **(self.backend.stats() if self.backend is not None else {}),
+        }
+
+    def _key(self, owner_id: int, version: int, name: str) -> str:
+        """Backend key of an entry."""
+        return f"{self.namespace}:{owner_id}:{version}:{name}"
+
+    def _failed(self, operation: str, exc: Exception) -> None:
+        """Count and log a backend failure."""
+        self.errors += 1
+        logger.warning("Read cache unavailable", operation=operation, error=repr(exc))
+
+
+def create_backend(
+    backend: str, url: str, max_bytes: int, ttl: float, timeout: float
+) -> Optional[CacheBackend]:
+    """Build the backend named in settings: none, memory or redis."""
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return MemoryCacheBackend(max_bytes=max_bytes, ttl=ttl)
+    if backend == "redis":
+        return RedisCacheBackend(RedisClient(url, timeout=timeout))
+    raise ValueError(f"Unknown cache backend: {backend!r}")
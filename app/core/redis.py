@@ -0,0 +1,147 @@
+"""Minimal asyncio client for the Redis protocol (RESP2)."""
+
+import asyncio
+from typing import Optional, Union
+from urllib.parse import urlsplit
+
+Reply = Union[None, int, bytes, list]
+
+
+class RedisError(Exception):
+    """Error reply from the server or a broken connection."""
+
+    pass
+
+
+def encode_command(*args: Union[str, bytes, int]) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Reply:
+    """Read one RESP reply; error replies are raised."""
+    line = await reader.readuntil(b"\r\n")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body
+    if kind == b"-":
+        raise RedisError(body.decode(errors="replace"))
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(body)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RedisError(f"Unexpected reply type {kind!r}")
+
+
+class RedisConnection:
+    """One connection; commands are pipelined and answered in order."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Initialize connection from an open stream pair."""
+        self.reader = reader
+        self.writer = writer
+
+    async def execute(self, *commands: tuple) -> list[Reply]:
+        """Send several commands in one write and read all their replies.
+
+        Every reply is read before an error reply is raised, so the connection
+        stays usable.
+        """
+        self.writer.write(b"".join(encode_command(*command) for command in commands))
+        await self.writer.drain()
+        replies: list[Reply] = []
+        error: Optional[RedisError] = None
+        for _ in commands:
+            try:
+                replies.append(await read_reply(self.reader))
+            except RedisError as exc:
+                error = error or exc
+                replies.append(None)
+        if error is not None:
+            raise error
+        return replies
+
+    def close(self) -> None:
+        """Close the connection without waiting."""
+        self.writer.close()
+
+
+class RedisClient:
+    """Small pool of connections to one server, given as redis://[:password@]host:port/db.
+
+    Connections are opened on demand, up to ``max_connections`` kept idle; one that
+    fails or times out is dropped rather than returned to the pool.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0, max_connections: int = 10):
+        """Initialize client for a server URL with a per-call timeout in seconds."""
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"Unsupported Redis URL scheme: {parts.scheme!r}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._idle: list[RedisConnection] = []
+
+    async def execute(self, *commands: tuple) -> list[Reply]:
+        """Run commands as one pipeline on a pooled connection."""
+        connection = self._idle.pop() if self._idle else None
+        try:
+            async with asyncio.timeout(self.timeout):
+                if connection is None:
+                    connection = await self._connect()
+                replies = await connection.execute(*commands)
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, TimeoutError):
+            if connection is not None:
+                connection.close()
+            raise
+        except RedisError:
+            # An error reply leaves the connection usable, unless setup itself failed
+            if connection is not None:
+                self._release(connection)
+            raise
+        self._release(connection)
+        return replies
+
+    async def _connect(self) -> RedisConnection:
+        """Open, authenticate and select the database on a new connection."""
+        connection = RedisConnection(*await asyncio.open_connection(self.host, self.port))
+        setup: list[tuple[str, str | int]] = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            try:
+                await connection.execute(*setup)
+            except RedisError:
+                connection.close()
+                raise
+        return connection
+
+    def _release(self, connection: RedisConnection) -> None:
+        """Return a healthy connection to the pool, or close it if the pool is full."""
+        if len(self._idle) < self.max_connections:
+            self._idle.append(connection)
+        else:
+            connection.close()
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        while self._idle:
+            self._idle.pop().close()
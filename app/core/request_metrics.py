@@ -0,0 +1,55 @@
+"""Per-route request latency metrics."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import LabeledHistogram, registry
+
+# Route label of requests that matched no route, so scanners can't add label values
+UNMATCHED_ROUTE = "unmatched"
+
+request_duration = LabeledHistogram(
+    "http_request_duration_seconds",
+    "Time to handle an HTTP request, by method, route template and status",
+    ("method", "route", "status"),
+)
+registry.register(request_duration)
+
+
+class RequestMetricsMiddleware:
+    """Time each HTTP request into request_duration.
+
+    Requests are labelled by the matched route's path template (``/tasks/{task_id}``,
+    not the raw path), which FastAPI leaves in the scope while routing.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap an ASGI app."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass the request through, recording its duration once the response is sent."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                str(status_code),
+            )
@@ -1,15 +1,33 @@
 """Security utilities."""
 
+import asyncio
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Optional, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.core.metrics import Histogram, histogram_exposition, registry, sample_exposition
+
+T = TypeVar("T")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Longer tokens are verified every time so the cache stays memory-bounded
+MAX_CACHED_TOKEN_LENGTH = 2048
+
+# Verified token -> payload; each entry expires at the token's own exp
+token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
@@ -23,6 +41,115 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashPool:
+    """Bounded thread pool for bcrypt so hashing never blocks the event loop.
+
+    bcrypt releases the GIL, so threads give real parallelism. At most
+    ``max_workers`` calls run at once and ``max_queue`` more may wait; anything
+    beyond that fails fast with ServiceUnavailableError (503).
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        """Initialize pool limits and metrics; threads are started lazily."""
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.rejected = 0
+        self.queue_wait = Histogram(
+            "password_hash_queue_wait_seconds", "Time password operations wait for a worker"
+        )
+        self.run_time = Histogram(
+            "password_hash_run_seconds", "Time spent hashing or verifying passwords"
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a password function on the pool and record queue vs. run time."""
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ServiceUnavailableError("Too many concurrent authentication requests")
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+
+        submitted = time.perf_counter()
+
+        def timed_call() -> tuple[T, float, float]:
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started - submitted, time.perf_counter() - started
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, waited, ran = await loop.run_in_executor(self._executor, timed_call)
+        finally:
+            self.in_flight -= 1
+
+        # Observed here rather than in the worker so metrics stay single-threaded
+        self.queue_wait.observe(waited)
+        self.run_time.observe(ran)
+        return result
+
+    def stats(self) -> dict:
+        """Return pool load, rejections and timing histograms."""
+        return {
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.snapshot(),
+            "run_time": self.run_time.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        """Stop worker threads after pending calls finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+def password_hash_exposition() -> Iterator[str]:
+    """Yield the load, rejections and timing histograms of the password hashing pool."""
+    stats = password_hash_pool.stats()
+    yield from sample_exposition(
+        "password_hash_in_flight",
+        "Password operations running or waiting for a worker",
+        "gauge",
+        [({}, stats["in_flight"])],
+    )
+    yield from sample_exposition(
+        "password_hash_rejected_total",
+        "Password operations rejected because the queue was full",
+        "counter",
+        [({}, stats["rejected"])],
+    )
+    for key, histogram in (
+        ("queue_wait", password_hash_pool.queue_wait),
+        ("run_time", password_hash_pool.run_time),
+    ):
+        yield from histogram_exposition(histogram.name, histogram.description, [({}, stats[key])])
+
+
+registry.register(password_hash_exposition)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash on the password hashing pool."""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password hashing pool."""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -35,10 +162,19 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def decode_access_token(token: str) -> Optional[dict]:
-    """Decode a JWT access token."""
+def decode_access_token(token: str, use_cache: bool = True) -> Optional[dict]:
+    """Decode a JWT access token, reusing earlier verifications of the same token."""
+    if use_cache:
+        payload = token_cache.get(token)
+        if payload is not None:
+            return dict(payload)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+
+    exp = payload.get("exp")
+    if use_cache and isinstance(exp, int | float) and len(token) <= MAX_CACHED_TOKEN_LENGTH:
+        token_cache.set(token, dict(payload), ttl=exp - time.time())
+    return payload
@@ -1,14 +1,55 @@
 """Database base configuration."""
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from collections.abc import AsyncIterator
+from typing import Optional
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from starlette.requests import Request
+from structlog import get_logger
 
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncPool, instrument_pool, instrument_queries
+from app.db.replicas import ReplicaSet, reads_primary
+
+logger = get_logger()
+
+
+def build_engine(url: str, pool_name: str, connect_args: Optional[dict] = None) -> AsyncEngine:
+    """Create an async engine with the configured pool, its checkouts and queries instrumented."""
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        future=True,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            **(connect_args or {}),
+        },
+    )
+    instrument_pool(engine, pool_name)
+    instrument_queries(engine, pool_name)
+    return engine
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
+
+engine = build_engine(settings.DATABASE_URL, "primary")
+
+replicas = ReplicaSet(
+    [
+        # Fail fast, so a replica that is down costs little before the fallback
+        build_engine(
+            url, f"replica{number}", {"timeout": settings.DB_REPLICA_CONNECT_TIMEOUT}
+        )
+        for number, url in enumerate(settings.DATABASE_REPLICA_URLS, 1)
+    ],
+    selection=settings.DB_REPLICA_SELECTION,
+    retry_after=settings.DB_REPLICA_RETRY_SECONDS,
 )
 
 AsyncSessionLocal = sessionmaker(
@@ -29,3 +70,33 @@ async def get_db() -> AsyncSession:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Dependency for a session for reads only: a replica when one is up, else the primary.
+
+    Clients that wrote recently stay on the primary (see ReadYourWritesMiddleware).
+    Replica sessions carry ``info["replica"]`` and may lag behind the primary.
+    """
+    if len(replicas) and not reads_primary(request):
+        for replica in replicas.candidates():
+            session = AsyncSessionLocal(bind=replica, info={"replica": True})
+            try:
+                # Connect now, so a replica that is down can be skipped
+                await session.connection()
+            except (OSError, DBAPIError) as exc:
+                await session.close()
+                replicas.mark_down(replica)
+                logger.warning("Read replica unavailable", replica=str(replica.url), error=str(exc))
+                continue
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -0,0 +1,210 @@
+"""Connection pool and query instrumentation."""
+
+import time
+from collections.abc import Iterator
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
+
+from app.core.metrics import (
+    Counter,
+    Histogram,
+    LabeledHistogram,
+    histogram_exposition,
+    registry,
+    sample_exposition,
+)
+from app.db.query_accounting import record_query
+
+# Buckets for connection counts rather than seconds
+COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class PoolMetrics:
+    """Checkout wait, occupancy and lifecycle counters for one connection pool."""
+
+    def __init__(self, name: str):
+        """Initialize metrics for the pool with the given name."""
+        self.name = name
+        self.checkout_wait = Histogram(
+            "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection"
+        )
+        self.checked_out = Histogram(
+            "db_pool_checked_out", "Connections in use, sampled at checkout", COUNT_BUCKETS
+        )
+        self.overflow = Histogram(
+            "db_pool_overflow", "Overflow connections, sampled at checkout", COUNT_BUCKETS
+        )
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.current_checked_out = 0
+        self.current_overflow = 0
+        self.size = 0
+
+    def snapshot(self) -> dict:
+        """Return current gauges, counters and histogram snapshots."""
+        return {
+            "size": self.size,
+            "checked_out": self.current_checked_out,
+            "overflow": self.current_overflow,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "checkout_wait": self.checkout_wait.snapshot(),
+            "checked_out_at_checkout": self.checked_out.snapshot(),
+            "overflow_at_checkout": self.overflow.snapshot(),
+        }
+
+
+# Metrics of every instrumented pool, keyed by pool name
+pool_metrics: dict[str, PoolMetrics] = {}
+
+# Statement label values; anything else counts as OTHER
+STATEMENT_KINDS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY"})
+
+query_duration = LabeledHistogram(
+    "db_query_duration_seconds",
+    "Time from sending a statement to its cursor returning, by pool and statement kind",
+    ("pool", "statement"),
+)
+query_errors = Counter("db_query_errors_total", "Statements that raised, by pool", ("pool",))
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Async queue pool that times checkouts, including waits for a free slot."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        if self.metrics is None:
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.checkout_wait.observe(time.perf_counter() - started)
+
+        self._record_gauges(self.metrics)
+        self.metrics.checked_out.observe(self.metrics.current_checked_out)
+        self.metrics.overflow.observe(self.metrics.current_overflow)
+        return record
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        if self.metrics is not None:
+            self._record_gauges(self.metrics)
+
+    def _record_gauges(self, metrics: PoolMetrics) -> None:
+        metrics.size = self.size()
+        metrics.current_checked_out = self.checkedout()
+        metrics.current_overflow = max(self.overflow(), 0)
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        # QueuePool.recreate builds the new pool with type(self), so this holds
+        if isinstance(pool, InstrumentedAsyncPool):
+            pool.metrics = self.metrics
+        return pool
+
+
+def instrument_pool(engine: AsyncEngine, name: str) -> PoolMetrics:
+    """Attach metrics to an engine's pool and count lifecycle events."""
+    metrics = pool_metrics.setdefault(name, PoolMetrics(name))
+    pool = engine.sync_engine.pool
+    if isinstance(pool, InstrumentedAsyncPool):
+        pool.metrics = metrics
+
+    def on_connect(*args: Any) -> None:
+        metrics.connects += 1
+
+    def on_checkout(*args: Any) -> None:
+        metrics.checkouts += 1
+
+    def on_checkin(*args: Any) -> None:
+        metrics.checkins += 1
+
+    def on_invalidate(*args: Any) -> None:
+        metrics.invalidations += 1
+
+    event.listen(pool, "connect", on_connect)
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
+    event.listen(pool, "invalidate", on_invalidate)
+    return metrics
+
+
+def statement_kind(statement: str) -> str:
+    """Label value for a statement: its leading keyword, if a common one."""
+    # Only the first few characters are looked at, however long the statement
+    words = statement.lstrip()[:7].split(maxsplit=1)
+    keyword = words[0].upper() if words else ""
+    return keyword if keyword in STATEMENT_KINDS else "OTHER"
+
+
+def instrument_queries(engine: AsyncEngine, name: str) -> None:
+    """Time every statement an engine executes into query_duration and the request's stats."""
+
+    # The start time rides on the execution context: cheaper than connection info,
+    # and nothing is left behind when a statement fails. Statements run without a
+    # context (sequence pre-fetches) aren't timed.
+    def before_cursor_execute(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, *args: Any
+    ) -> None:
+        if context is not None:
+            context.query_started = time.perf_counter()
+
+    def after_cursor_execute(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, *args: Any
+    ) -> None:
+        if context is not None:
+            elapsed = time.perf_counter() - context.query_started
+            query_duration.observe(elapsed, name, statement_kind(statement))
+            record_query(statement, elapsed)
+
+    def handle_error(context: Any) -> None:
+        query_errors.inc(name)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
+
+
+def pool_exposition() -> Iterator[str]:
+    """Yield the gauges, counters and checkout wait histogram of every pool."""
+    snapshots = [({"pool": name}, metrics.snapshot()) for name, metrics in pool_metrics.items()]
+    for key, kind, description in (
+        ("size", "gauge", "Connections the pool keeps open"),
+        ("checked_out", "gauge", "Connections currently in use"),
+        ("overflow", "gauge", "Overflow connections currently open"),
+        ("connects", "counter", "Connections opened"),
+        ("checkouts", "counter", "Connections checked out"),
+        ("checkins", "counter", "Connections returned"),
+        ("invalidations", "counter", "Connections invalidated"),
+        ("timeouts", "counter", "Checkouts that timed out waiting for a connection"),
+    ):
+        metric = f"db_pool_{key}_total" if kind == "counter" else f"db_pool_{key}"
+        yield from sample_exposition(
+            metric, description, kind, ((labels, snapshot[key]) for labels, snapshot in snapshots)
+        )
+    yield from histogram_exposition(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a pooled connection",
+        ((labels, snapshot["checkout_wait"]) for labels, snapshot in snapshots),
+    )
+
+
+registry.register(query_duration)
+registry.register(query_errors)
+registry.register(pool_exposition)
@@ -0,0 +1,109 @@
+"""Per-request SQL query accounting."""
+
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from structlog import get_logger
+
+from app.core.config import settings
+
+logger = get_logger()
+
+# Longest statement text logged when flagging repeats
+LOGGED_STATEMENT_LENGTH = 200
+
+
+class QueryStats:
+    """Statements run on behalf of one request: count, total time and repeats."""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self) -> None:
+        """Initialize empty stats."""
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: dict[str, int] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        """Count one statement and its execution time."""
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Statements run at least ``threshold`` times, with their counts."""
+        return {
+            statement: count for statement, count in self.statements.items() if count >= threshold
+        }
+
+
+# Stats of the request being handled; None outside requests
+request_queries: ContextVar[Optional[QueryStats]] = ContextVar("request_queries", default=None)
+
+
+def record_query(statement: str, seconds: float) -> None:
+    """Add a statement to the current request's stats, if there is a request."""
+    stats = request_queries.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+
+class QueryAccountingMiddleware:
+    """Count the SQL statements each request runs and flag repeated ones.
+
+    With DB_QUERY_HEADERS on, responses carry X-DB-Query-Count and X-DB-Time-Ms,
+    plus X-DB-Repeated-Statements when some statement ran ``repeat_threshold``
+    times or more, the usual sign of an N+1 loop. Headers go out with the
+    response start, so queries a streaming body runs later are left out of
+    them; the repeated statements warning, logged at the end, includes them.
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int) -> None:
+        """Wrap an ASGI app; a ``repeat_threshold`` of 0 turns the warning off."""
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass the request through with fresh stats in request_queries."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.DB_QUERY_HEADERS:
+                headers = [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.seconds * 1000:.2f}".encode()),
+                ]
+                if self.repeat_threshold and stats.count >= self.repeat_threshold:
+                    repeated = len(stats.repeated(self.repeat_threshold))
+                    if repeated:
+                        headers.append((b"x-db-repeated-statements", str(repeated).encode()))
+                message = {**message, "headers": [*message.get("headers", []), *headers]}
+            await send(message)
+
+        token = request_queries.set(stats)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            request_queries.reset(token)
+            if self.repeat_threshold and stats.count >= self.repeat_threshold:
+                self._flag_repeats(scope, stats)
+
+    def _flag_repeats(self, scope: Scope, stats: QueryStats) -> None:
+        """Log statements the request ran at least repeat_threshold times."""
+        repeated = stats.repeated(self.repeat_threshold)
+        if repeated:
+            logger.warning(
+                "Repeated SQL statements",
+                method=scope["method"],
+                route=getattr(scope.get("route"), "path", scope["path"]),
+                query_count=stats.count,
+                statements={
+                    statement[:LOGGED_STATEMENT_LENGTH]: count
+                    for statement, count in repeated.items()
+                },
+            )
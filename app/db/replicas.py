@@ -0,0 +1,104 @@
+"""Read replica selection and read-your-writes stickiness."""
+
+import itertools
+import time
+from typing import cast
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Cookie set after a write; until the time it holds, the client reads from the primary
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+REPLICA_SELECTIONS = ("round_robin", "least_connections")
+
+
+class ReplicaSet:
+    """Replica engines in order of preference for the next read.
+
+    A replica that fails to connect is skipped for ``retry_after`` seconds.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], selection: str, retry_after: float):
+        """Initialize with replica engines, a selection strategy and the retry delay."""
+        if selection not in REPLICA_SELECTIONS:
+            raise ValueError(f"Unknown replica selection: {selection!r}")
+        self.engines = engines
+        self.selection = selection
+        self.retry_after = retry_after
+        self._turn = itertools.count()
+        self._down_until: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        """Number of configured replicas, up or not."""
+        return len(self.engines)
+
+    def candidates(self) -> list[AsyncEngine]:
+        """Replicas to try, best first; replicas marked down are left out."""
+        now = time.monotonic()
+        healthy = [
+            (index, engine)
+            for index, engine in enumerate(self.engines)
+            if self._down_until.get(index, 0) <= now
+        ]
+        if not healthy:
+            return []
+        if self.selection == "least_connections":
+            # Stable sort keeps configuration order among equally busy replicas; replica
+            # engines come from build_engine, so their pools are queue pools
+            healthy.sort(key=lambda item: cast(QueuePool, item[1].sync_engine.pool).checkedout())
+        else:
+            start = next(self._turn) % len(healthy)
+            healthy = healthy[start:] + healthy[:start]
+        return [engine for _, engine in healthy]
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        """Skip a replica that failed to connect until the retry delay has passed."""
+        index = self.engines.index(engine)
+        self._down_until[index] = time.monotonic() + self.retry_after
+
+
+def reads_primary(request: Request) -> bool:
+    """Whether the client wrote recently enough that replicas may not have its change."""
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """Pin a client's reads to the primary for a while after each successful write.
+
+    Sets READ_PRIMARY_COOKIE on responses to unsafe methods below 400, so the
+    client's next reads skip replicas until they have had time to catch up.
+    """
+
+    SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(self, app: ASGIApp, window: float) -> None:
+        """Wrap an ASGI app; ``window`` is how long reads stay on the primary, in seconds."""
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass the request through, adding the cookie to successful writes."""
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{READ_PRIMARY_COOKIE}={time.time() + self.window:.3f}; "
+                    f"Max-Age={max(int(self.window), 1)}; Path=/; "
+                    "HttpOnly; SameSite=Lax"
+                )
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())],
+                }
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,11 +1,36 @@
 """FastAPI application entry point."""
 
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 
 from app.api.v1 import router as v1_router
 from app.core.config import settings
 from app.core.exceptions import setup_exception_handlers
-from app.core.logging import setup_logging
+from app.core.logging import setup_logging, shutdown_logging
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, registry
+from app.core.request_metrics import RequestMetricsMiddleware
+from app.core.security import password_hash_pool
+from app.db.base import replicas
+from app.db.query_accounting import QueryAccountingMiddleware
+from app.db.replicas import ReadYourWritesMiddleware
+from app.warmup import warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Application startup and shutdown."""
+    if settings.WARMUP_ENABLED:
+        await warmup.run()
+    else:
+        warmup.ready = True
+    yield
+    warmup.ready = False
+    password_hash_pool.shutdown()
+    shutdown_logging()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -13,6 +38,7 @@ app = FastAPI(
     description="REST API for Task Management",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Setup logging
@@ -21,6 +47,20 @@ setup_logging()
 # Setup exception handlers
 setup_exception_handlers(app)
 
+# Keep a client's reads on the primary briefly after its writes
+if len(replicas):
+    app.add_middleware(ReadYourWritesMiddleware, window=settings.DB_REPLICA_STICKY_SECONDS)
+
+# Count each request's SQL statements (headers, repeated statement warnings)
+if settings.DB_QUERY_HEADERS or settings.DB_REPEATED_QUERY_THRESHOLD > 0:
+    app.add_middleware(
+        QueryAccountingMiddleware, repeat_threshold=settings.DB_REPEATED_QUERY_THRESHOLD
+    )
+
+# Outermost, so request timings include the other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
 # Include routers
 app.include_router(v1_router, prefix="/api/v1")
 
@@ -35,3 +75,22 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check() -> JSONResponse:
+    """Readiness check: 503 until startup warmup has finished and once shutdown starts."""
+    body = {
+        "status": "ready" if warmup.ready else "starting",
+        "warmup_ms": {name: round(seconds * 1000, 1) for name, seconds in warmup.phases.items()},
+        "warmup_failed": warmup.failed,
+    }
+    return JSONResponse(status_code=200 if warmup.ready else 503, content=body)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Metrics in the Prometheus text format."""
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,6 +1,7 @@
 """SQLAlchemy models."""
 
 from app.models.task import Task
+from app.models.task_stats import TaskDailyStats, TaskStats
 from app.models.user import User
 
-__all__ = ["User", "Task"]
+__all__ = ["User", "Task", "TaskStats", "TaskDailyStats"]
@@ -3,11 +3,21 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import DDL, Computed, ForeignKey, Index, String, Text, event, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
 
+# Text search configuration; "simple" doesn't stem, so it works for any language
+SEARCH_CONFIG = "simple"
+
+# Title matches outrank description matches
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
 
 class Task(Base):
     """Task model."""
@@ -21,10 +31,47 @@ class Task(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[Optional[datetime]] = mapped_column(default=None, onupdate=datetime.utcnow)
+    # Set when a task is marked completed (by a trigger on update), cleared when reopened
+    completed_at: Mapped[Optional[datetime]] = mapped_column(default=None)
+    # Maintained by PostgreSQL; deferred so task loads don't fetch it
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), deferred=True
+    )
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="tasks")
 
+    # Keyset pagination indexes, one per supported sort order, one for the
+    # open-task listing and two for search; keep in sync with the migrations
+    # that create them
+    __table_args__ = (
+        Index("ix_tasks_user_id_id", "user_id", "id"),
+        Index(
+            "ix_tasks_user_id_id_open",
+            "user_id",
+            "id",
+            postgresql_where=text("NOT is_completed"),
+        ),
+        Index("ix_tasks_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index(
+            "ix_tasks_user_id_updated_at_id",
+            "user_id",
+            func.coalesce(updated_at, created_at),
+            "id",
+        ),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_tasks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
+
     def __repr__(self) -> str:
         """String representation."""
         return f"<Task(id={self.id}, title={self.title}, is_completed={self.is_completed})>"
+
+
+# The title trigram index needs pg_trgm (the migrations create it as well)
+event.listen(Task.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
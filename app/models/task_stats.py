@@ -0,0 +1,173 @@
+"""Task statistics rollup models."""
+
+from datetime import date
+
+from sqlalchemy import DDL, BigInteger, ForeignKey, event, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.task import Task
+
+
+class TaskStats(Base):
+    """Per-user task counters, maintained by triggers on tasks."""
+
+    __tablename__ = "task_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    total: Mapped[int] = mapped_column(default=0)
+    completed: Mapped[int] = mapped_column(default=0)
+    # Bumped by every statement that writes the user's tasks; list ETags derive from it
+    version: Mapped[int] = mapped_column(BigInteger, server_default=text("0"))
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<TaskStats(user_id={self.user_id}, total={self.total}, version={self.version})>"
+
+
+class TaskDailyStats(Base):
+    """Per-user, per-day (UTC) counts of tasks created and completed on that day."""
+
+    __tablename__ = "task_daily_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(primary_key=True)
+    created: Mapped[int] = mapped_column(default=0)
+    completed: Mapped[int] = mapped_column(default=0)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<TaskDailyStats(user_id={self.user_id}, day={self.day})>"
+
+
+# Apply the signed rows of a statement's transition tables to both rollups in one
+# statement. Rows for users already deleted (a cascade from users) are skipped.
+# Every touched user's version moves even when the counts don't; daily groups that
+# net to zero are not written.
+APPLY_CHANGES_SQL = """
+    WITH changes AS ({changes}),
+    totals AS (
+        INSERT INTO task_stats AS s (user_id, total, completed, version)
+        SELECT user_id, sum(sign), coalesce(sum(sign) FILTER (WHERE is_completed), 0), 1
+        FROM changes
+        WHERE EXISTS (SELECT 1 FROM users WHERE users.id = changes.user_id)
+        GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET total = s.total + excluded.total,
+            completed = s.completed + excluded.completed,
+            version = s.version + 1
+    )
+    INSERT INTO task_daily_stats AS d (user_id, day, created, completed)
+    SELECT user_id, day, sum(created), sum(completed)
+    FROM (
+        SELECT user_id, created_at::date AS day, sign AS created, 0 AS completed
+        FROM changes
+        UNION ALL
+        SELECT user_id, completed_at::date, 0, sign
+        FROM changes
+        WHERE completed_at IS NOT NULL
+    ) AS days
+    WHERE EXISTS (SELECT 1 FROM users WHERE users.id = days.user_id)
+    GROUP BY user_id, day
+    HAVING sum(created) <> 0 OR sum(completed) <> 0
+    ON CONFLICT (user_id, day) DO UPDATE
+    SET created = d.created + excluded.created, completed = d.completed + excluded.completed;
+"""
+
+CHANGED_COLUMNS = "user_id, is_completed, created_at, completed_at"
+
+# Trigger function name -> signed transition-table rows it applies
+ROLLUP_FUNCTIONS = {
+    "task_stats_after_insert": f"SELECT 1 AS sign, {CHANGED_COLUMNS} FROM new_tasks",
+    "task_stats_after_update": (
+        f"SELECT 1 AS sign, {CHANGED_COLUMNS} FROM new_tasks "
+        f"UNION ALL SELECT -1, {CHANGED_COLUMNS} FROM old_tasks"
+    ),
+    "task_stats_after_delete": f"SELECT -1 AS sign, {CHANGED_COLUMNS} FROM old_tasks",
+}
+
+TASK_STATS_DDL = [
+    # completed_at records the day a task was completed for the daily rollup. Inserts
+    # set it themselves: a BEFORE INSERT row trigger would stop COPY batching rows
+    """
+    CREATE OR REPLACE FUNCTION tasks_set_completed_at() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF NEW.is_completed AND NOT OLD.is_completed THEN
+            NEW.completed_at := now() AT TIME ZONE 'utc';
+        ELSIF NOT NEW.is_completed THEN
+            NEW.completed_at := NULL;
+        END IF;
+        RETURN NEW;
+    END $$
+    """,
+    """
+    CREATE TRIGGER tasks_set_completed_at BEFORE UPDATE OF is_completed ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_set_completed_at()
+    """,
+    *(
+        f"""
+        CREATE OR REPLACE FUNCTION {name}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            {APPLY_CHANGES_SQL.format(changes=changes)}
+            RETURN NULL;
+        END $$
+        """
+        for name, changes in ROLLUP_FUNCTIONS.items()
+    ),
+    # Statement-level, so a batch or COPY updates each counter row once
+    """
+    CREATE TRIGGER task_stats_after_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION task_stats_after_insert()
+    """,
+    # Every update moves the version, so this can't be narrowed to UPDATE OF (which
+    # transition tables forbid anyway)
+    """
+    CREATE TRIGGER task_stats_after_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION task_stats_after_update()
+    """,
+    """
+    CREATE TRIGGER task_stats_after_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION task_stats_after_delete()
+    """,
+]
+
+# Recompute both rollups from tasks; {user_filter} narrows every statement to one
+# user. Counter rows are updated in place so versions keep increasing
+REBUILD_SQL = [
+    "UPDATE task_stats SET total = 0, completed = 0, version = version + 1 WHERE {user_filter}",
+    "DELETE FROM task_daily_stats WHERE {user_filter}",
+    """
+    INSERT INTO task_stats (user_id, total, completed)
+    SELECT user_id, count(*), count(*) FILTER (WHERE is_completed)
+    FROM tasks
+    WHERE {user_filter}
+    GROUP BY user_id
+    ON CONFLICT (user_id) DO UPDATE SET total = excluded.total, completed = excluded.completed
+    """,
+    """
+    INSERT INTO task_daily_stats (user_id, day, created, completed)
+    SELECT user_id, day, sum(created), sum(completed)
+    FROM (
+        SELECT user_id, created_at::date AS day, 1 AS created, 0 AS completed
+        FROM tasks
+        WHERE {user_filter}
+        UNION ALL
+        SELECT user_id, completed_at::date, 0, 1
+        FROM tasks
+        WHERE completed_at IS NOT NULL AND {user_filter}
+    ) AS days
+    GROUP BY user_id, day
+    """,
+]
+
+for statement in TASK_STATS_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement))
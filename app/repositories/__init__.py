@@ -1,6 +1,7 @@
 """Repository layer."""
 
 from app.repositories.task_repository import TaskRepository
+from app.repositories.task_stats_repository import TaskStatsRepository
 from app.repositories.user_repository import UserRepository
 
-__all__ = ["UserRepository", "TaskRepository"]
+__all__ = ["UserRepository", "TaskRepository", "TaskStatsRepository"]
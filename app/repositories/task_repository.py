@@ -1,11 +1,166 @@
 """Task repository."""
 
-from typing import Optional
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Boolean,
+    ColumnClause,
+    ColumnElement,
+    Row,
+    Select,
+    SQLColumnExpression,
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
-from app.models.task import Task
+from app.core.etags import task_version
+from app.models.task import SEARCH_CONFIG, Task
+from app.repositories.task_stats_repository import stats_version, task_count
+from app.schemas.task import TaskFilter
+
+# When a task last changed, as task_version computes it; its ETag derives from this
+TASK_VERSION = func.coalesce(Task.updated_at, Task.created_at)
+
+# Sort expressions for keyset pagination; each is backed by an index on tasks
+SORT_COLUMNS = {
+    "id": Task.id,
+    "created_at": Task.created_at,
+    "updated_at": TASK_VERSION,
+}
+
+
+# Columns a client may change through an update
+UPDATABLE_COLUMNS = ("title", "description", "is_completed")
+
+# Columns written by a bulk COPY import, in record order
+IMPORT_COLUMNS = (
+    "title",
+    "description",
+    "is_completed",
+    "user_id",
+    "created_at",
+    "completed_at",
+)
+
+
+# RETURNING Task fetches deferred columns too unless told otherwise
+SKIP_SEARCH_VECTOR = defer(Task.search_vector)
+
+# Columns a keyset cursor needs besides the ones a client asked for
+CURSOR_COLUMNS = {
+    "id": ("id",),
+    "created_at": ("id", "created_at"),
+    "updated_at": ("id", "created_at", "updated_at"),
+}
+
+
+class TaskPage(NamedTuple):
+    """A page of tasks with the matching-task count and the user's change version."""
+
+    items: list[Any]
+    total: Optional[int]
+    version: int
+
+
+def sort_key(task: Task | Row, order_by: str) -> Any:
+    """Return the value of a task's sort expression for building a cursor."""
+    field = order_by.removeprefix("-")
+    if field == "updated_at":
+        return task_version(task)
+    return getattr(task, field)
+
+
+def owned_task(
+    task_id: int, user_id: int, versions: Optional[list[datetime]] = None
+) -> list[ColumnElement]:
+    """Conditions matching a user's task, optionally only at one of some versions."""
+    conditions = [Task.id == task_id, Task.user_id == user_id]
+    if versions is not None:
+        conditions.append(TASK_VERSION.in_(versions))
+    return conditions
+
+
+def filter_tasks(query: Select, filters: Optional[TaskFilter]) -> Select:
+    """Apply listing filters; each is served by one of the task indexes."""
+    if filters is None:
+        return query
+    if filters.completed is not None:
+        # Matches the ix_tasks_user_id_id_open predicate, so open tasks use that index
+        query = query.where(Task.is_completed if filters.completed else ~Task.is_completed)
+    if filters.created_after is not None:
+        query = query.where(Task.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        query = query.where(Task.created_at < filters.created_before)
+    return query
+
+
+def paginate(
+    query: Select,
+    skip: int,
+    limit: int,
+    order_by: str,
+    after: Optional[tuple[Any, int]],
+) -> Select:
+    """Order a task query by (sort key, id) and start it after a keyset cursor.
+
+    A ``-`` prefix on ``order_by`` reverses both keys, which the indexes serve
+    with a backward scan.
+    """
+    field = order_by.removeprefix("-")
+    descending = order_by.startswith("-")
+    keys: list[SQLColumnExpression[Any]] = (
+        [Task.id] if field == "id" else [SORT_COLUMNS[field], Task.id]
+    )
+    if after is not None:
+        if field == "id":
+            condition = Task.id < after[1] if descending else Task.id > after[1]
+        else:
+            row_key = tuple_(*keys)
+            cursor_key = tuple_(*(literal(value) for value in after))
+            condition = row_key < cursor_key if descending else row_key > cursor_key
+        query = query.where(condition)
+    query = query.order_by(*(key.desc() if descending else key for key in keys))
+    return query.offset(skip).limit(limit)
+
+
+def search_tasks(user_id: int, query_text: str) -> Select:
+    """Select a user's tasks matching a search query with their rank, best first.
+
+    Full-text matches on title and description use the search_vector GIN index;
+    word prefixes and typos in titles are caught by trigram word similarity
+    through the title trigram index. For users with few tasks the planner may
+    prefer filtering their rows from a user_id index instead.
+    """
+    tsquery = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), query_text)
+    rank = func.ts_rank_cd(Task.search_vector, tsquery) + func.word_similarity(
+        query_text, Task.title
+    )
+    return (
+        select(Task, rank.label("rank"))
+        .where(
+            Task.user_id == user_id,
+            or_(
+                Task.search_vector.bool_op("@@")(tsquery),
+                literal(query_text).bool_op("<%")(Task.title),
+            ),
+        )
+        .order_by(rank.desc(), Task.id)
+    )
 
 
 class TaskRepository:
@@ -16,11 +171,12 @@ class TaskRepository:
         self.session = session
 
     async def create(self, task_data: dict) -> Task:
-        """Create a new task."""
-        task = Task(**task_data)
-        self.session.add(task)
+        """Create a new task with a single INSERT ... RETURNING."""
+        result = await self.session.scalars(
+            insert(Task).values(**task_data).returning(Task).options(SKIP_SEARCH_VECTOR)
+        )
+        task = result.one()
         await self.session.commit()
-        await self.session.refresh(task)
         return task
 
     async def get_by_id(self, task_id: int) -> Optional[Task]:
@@ -28,12 +184,166 @@ class TaskRepository:
         result = await self.session.execute(select(Task).where(Task.id == task_id))
         return result.scalar_one_or_none()
 
-    async def get_by_user_id(self, user_id: int, skip: int = 0, limit: int = 100) -> list[Task]:
-        """Get tasks by user ID with pagination."""
+    async def get_by_user_id(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: str = "id",
+        after: Optional[tuple[Any, int]] = None,
+        filters: Optional[TaskFilter] = None,
+    ) -> TaskPage:
+        """Get tasks by user ID, ordered by (sort key, id), starting after a keyset cursor.
+
+        The page also carries how many tasks match the filters overall (None when
+        the stats rollup can't tell) and the user's change version, both read in
+        the same statement.
+        """
+        query = filter_tasks(select(Task).where(Task.user_id == user_id), filters)
+        page = await self._get_page(query, user_id, skip, limit, order_by, after, filters)
+        return page._replace(items=[row[0] for row in page.items])
+
+    async def get_columns_by_id(self, task_id: int, columns: tuple[str, ...]) -> Optional[Row]:
+        """Get selected columns of a task without building an ORM entity.
+
+        user_id and the version columns come along for the ownership check and ETag.
+        """
+        selected = dict.fromkeys((*columns, "user_id", "created_at", "updated_at"))
         result = await self.session.execute(
-            select(Task).where(Task.user_id == user_id).offset(skip).limit(limit)
+            select(*(getattr(Task, name) for name in selected)).where(Task.id == task_id)
         )
-        return list(result.scalars().all())
+        return result.one_or_none()
+
+    async def get_version(self, task_id: int) -> Optional[Row]:
+        """Get a task's owner and version without loading the task itself."""
+        result = await self.session.execute(
+            select(Task.user_id, TASK_VERSION.label("version")).where(Task.id == task_id)
+        )
+        return result.one_or_none()
+
+    async def get_columns_by_user_id(
+        self,
+        user_id: int,
+        columns: tuple[str, ...],
+        skip: int = 0,
+        limit: int = 100,
+        order_by: str = "id",
+        after: Optional[tuple[Any, int]] = None,
+        filters: Optional[TaskFilter] = None,
+    ) -> TaskPage:
+        """Get selected columns of a user's tasks as plain rows, paginated like get_by_user_id."""
+        selected = dict.fromkeys((*columns, *CURSOR_COLUMNS[order_by.removeprefix("-")]))
+        query = select(*(getattr(Task, name) for name in selected)).where(Task.user_id == user_id)
+        query = filter_tasks(query, filters)
+        return await self._get_page(query, user_id, skip, limit, order_by, after, filters)
+
+    async def _get_page(
+        self,
+        query: Select,
+        user_id: int,
+        skip: int,
+        limit: int,
+        order_by: str,
+        after: Optional[tuple[Any, int]],
+        filters: Optional[TaskFilter],
+    ) -> TaskPage:
+        """Run a paginated task query with the rollup's count and version as columns."""
+        total = task_count(user_id, filters)
+        version = stats_version(user_id)
+        query = query.add_columns(version.label("stats_version"))
+        if total is not None:
+            query = query.add_columns(total.label("total_count"))
+        result = await self.session.execute(paginate(query, skip, limit, order_by, after))
+        rows = list(result.all())
+        if rows:
+            first = rows[0]
+            count = first.total_count if total is not None else None
+            return TaskPage(rows, count, first.stats_version)
+        # An empty page carries neither, so ask for them separately
+        if total is None:
+            current = (await self.session.execute(select(version))).scalar_one()
+            return TaskPage(rows, None, current)
+        count, current = (await self.session.execute(select(total, version))).one()
+        return TaskPage(rows, count, current)
+
+    async def stream_by_user_id(
+        self, user_id: int, columns: tuple[str, ...], chunk_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Stream selected columns of a user's tasks in ID order from a server-side cursor.
+
+        Yields sequences of at most ``chunk_size`` rows, so only one chunk is in memory.
+        """
+        result = await self.session.stream(
+            select(*(getattr(Task, name) for name in columns))
+            .where(Task.user_id == user_id)
+            .order_by(Task.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        try:
+            async for rows in result.partitions(chunk_size):
+                yield rows
+        finally:
+            await result.close()
+
+    async def search(
+        self, user_id: int, query_text: str, skip: int = 0, limit: int = 100
+    ) -> list[Row]:
+        """Search a user's tasks and return (task, rank) rows, best match first."""
+        result = await self.session.execute(
+            search_tasks(user_id, query_text).offset(skip).limit(limit)
+        )
+        return list(result.all())
+
+    async def get_owner_id(self, task_id: int) -> Optional[int]:
+        """Get the owner of a task without loading the task itself."""
+        result = await self.session.execute(select(Task.user_id).where(Task.id == task_id))
+        return result.scalar_one_or_none()
+
+    async def update_owned(
+        self,
+        task_id: int,
+        user_id: int,
+        task_data: dict,
+        versions: Optional[list[datetime]] = None,
+    ) -> Optional[Task]:
+        """Update a user's task with a single UPDATE ... RETURNING.
+
+        With ``versions``, only a task currently at one of them is updated. Returns
+        None when no task with this ID (and version) belongs to the user.
+        """
+        conditions = owned_task(task_id, user_id, versions)
+        if not task_data:
+            selected = await self.session.execute(select(Task).where(*conditions))
+            return selected.scalar_one_or_none()
+
+        updated = await self.session.scalars(
+            update(Task)
+            .where(*conditions)
+            .values(**task_data)
+            .returning(Task)
+            .options(SKIP_SEARCH_VECTOR)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        task = updated.one_or_none()
+        await self.session.commit()
+        return task
+
+    async def delete_owned(
+        self, task_id: int, user_id: int, versions: Optional[list[datetime]] = None
+    ) -> bool:
+        """Delete a user's task with a single DELETE ... RETURNING; False if none matched.
+
+        With ``versions``, only a task currently at one of them is deleted.
+        """
+        result = await self.session.scalars(
+            delete(Task)
+            .where(*owned_task(task_id, user_id, versions))
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = result.one_or_none() is not None
+        await self.session.commit()
+        return deleted
 
     async def update(self, task: Task, task_data: dict) -> Task:
         """Update task."""
@@ -48,6 +358,83 @@ class TaskRepository:
         await self.session.delete(task)
         await self.session.commit()
 
+    async def create_many(self, tasks_data: list[dict]) -> list[Task]:
+        """Create tasks with a single multi-row INSERT ... RETURNING."""
+        result = await self.session.scalars(
+            insert(Task)
+            .returning(Task, sort_by_parameter_order=True)
+            .options(SKIP_SEARCH_VECTOR)
+            .execution_options(render_nulls=True),
+            tasks_data,
+        )
+        tasks = list(result.all())
+        await self.session.commit()
+        return tasks
+
+    async def update_many(self, user_id: int, tasks_data: list[dict]) -> list[Task]:
+        """Update a user's tasks with a single UPDATE ... FROM (VALUES ...) RETURNING.
+
+        Each item carries an ``id`` plus the fields to change; fields absent from an
+        item keep their current value. Tasks that don't exist or belong to another
+        user are left out of the result.
+        """
+        value_columns: list[ColumnClause[Any]] = [column("id", Task.id.type)]
+        for name in UPDATABLE_COLUMNS:
+            value_columns.append(column(name, Task.__table__.c[name].type))
+            value_columns.append(column(f"set_{name}", Boolean))
+
+        rows = []
+        for item in tasks_data:
+            row = [item["id"]]
+            for name in UPDATABLE_COLUMNS:
+                row.extend([item.get(name), name in item])
+            rows.append(tuple(row))
+        changes = values(*value_columns, name="changes").data(rows)
+
+        # The casts keep a VALUES column that is NULL in every row from defaulting to text
+        assignments = {
+            name: case(
+                (changes.c[f"set_{name}"], cast(changes.c[name], Task.__table__.c[name].type)),
+                else_=getattr(Task, name),
+            )
+            for name in UPDATABLE_COLUMNS
+        }
+        result = await self.session.scalars(
+            update(Task)
+            .where(Task.id == changes.c.id, Task.user_id == user_id)
+            .values(**assignments)
+            .returning(Task)
+            .options(SKIP_SEARCH_VECTOR)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        tasks = list(result.all())
+        await self.session.commit()
+        return tasks
+
+    async def delete_many(self, user_id: int, task_ids: list[int]) -> list[int]:
+        """Delete a user's tasks with a single DELETE ... RETURNING and return deleted IDs."""
+        result = await self.session.scalars(
+            delete(Task)
+            .where(Task.id.in_(task_ids), Task.user_id == user_id)
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_ids = list(result.all())
+        await self.session.commit()
+        return deleted_ids
+
+    async def copy_records(self, records: list[tuple]) -> None:
+        """Bulk load task rows, given in IMPORT_COLUMNS order, with COPY and commit."""
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        # Only None once the pooled connection has been invalidated
+        assert driver_connection is not None, "connection was invalidated"
+        await driver_connection.copy_records_to_table(
+            Task.__tablename__, records=records, columns=IMPORT_COLUMNS
+        )
+        await self.session.commit()
+
     async def list_all(self, skip: int = 0, limit: int = 100) -> list[Task]:
         """List all tasks with pagination."""
         result = await self.session.execute(select(Task).offset(skip).limit(limit))
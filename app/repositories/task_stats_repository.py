@@ -0,0 +1,87 @@
+"""Task statistics repository."""
+
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import ColumnElement, SQLColumnExpression, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task_stats import REBUILD_SQL, TaskDailyStats, TaskStats
+from app.schemas.task import TaskFilter
+
+
+def task_count(user_id: int, filters: Optional[TaskFilter] = None) -> Optional[ColumnElement]:
+    """Number of a user's tasks matching the filters, read from the rollup.
+
+    Returns a scalar expression to select alongside other columns, or None when
+    the rollup can't answer (created_at ranges).
+    """
+    if filters is not None and filters.by_created_at:
+        return None
+    counter: SQLColumnExpression[int]
+    if filters is None or filters.completed is None:
+        counter = TaskStats.total
+    elif filters.completed:
+        counter = TaskStats.completed
+    else:
+        counter = TaskStats.total - TaskStats.completed
+    # Users who never had a task have no rollup row
+    return func.coalesce(
+        select(counter).where(TaskStats.user_id == user_id).scalar_subquery(), 0
+    )
+
+
+def stats_version(user_id: int) -> ColumnElement[int]:
+    """A user's task change version as a scalar expression; 0 before their first task."""
+    return func.coalesce(
+        select(TaskStats.version).where(TaskStats.user_id == user_id).scalar_subquery(), 0
+    )
+
+
+class TaskStatsRepository:
+    """Repository for the task statistics rollups."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize repository with database session."""
+        self.session = session
+
+    async def get_totals(self, user_id: int) -> Optional[TaskStats]:
+        """Get a user's task counters."""
+        # Triggers change these rows behind the ORM's back, so never trust the identity map
+        return await self.session.get(TaskStats, user_id, populate_existing=True)
+
+    async def get_version(self, user_id: int) -> int:
+        """Get a user's task change version without touching tasks."""
+        result = await self.session.execute(select(stats_version(user_id)))
+        return result.scalar_one()
+
+    async def get_daily(self, user_id: int, since: date) -> list[TaskDailyStats]:
+        """Get a user's per-day counts from ``since`` on, oldest first.
+
+        Days whose tasks have all been deleted keep a zeroed row; those are skipped.
+        """
+        result = await self.session.scalars(
+            select(TaskDailyStats)
+            .where(
+                TaskDailyStats.user_id == user_id,
+                TaskDailyStats.day >= since,
+                or_(TaskDailyStats.created != 0, TaskDailyStats.completed != 0),
+            )
+            .order_by(TaskDailyStats.day)
+            .execution_options(populate_existing=True)
+        )
+        return list(result.all())
+
+    async def rebuild(self, user_id: Optional[int] = None) -> None:
+        """Recompute the rollups from tasks, for one user or everyone.
+
+        Task writes are blocked (reads are not) until the rebuild commits, so no
+        trigger update can slip between the recount and the swap.
+        """
+        await self.session.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+        user_filter = "user_id = :user_id" if user_id is not None else "true"
+        for statement in REBUILD_SQL:
+            await self.session.execute(
+                text(statement.format(user_filter=user_filter)), {"user_id": user_id}
+            )
+        await self.session.commit()
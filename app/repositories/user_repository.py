@@ -2,11 +2,23 @@
 
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache, cache_stats
+from app.core.config import settings
 from app.models.user import User
 
+# Per-process cache of user_id -> active status. Writes through this repository
+# invalidate it; changes made elsewhere (other workers, manual SQL) show up
+# once the TTL expires.
+user_status_cache = TTLCache(
+    max_size=settings.USER_STATUS_CACHE_MAX_SIZE,
+    ttl=settings.USER_STATUS_CACHE_TTL_SECONDS,
+)
+cache_stats["user_status"] = user_status_cache.stats
+
 
 class UserRepository:
     """Repository for User operations."""
@@ -15,12 +27,23 @@ class UserRepository:
         """Initialize repository with database session."""
         self.session = session
 
+    async def connect(self) -> None:
+        """Check out the session's connection ahead of the first statement."""
+        await self.session.connection()
+
     async def create(self, user_data: dict) -> User:
-        """Create a new user."""
-        user = User(**user_data)
-        self.session.add(user)
-        await self.session.commit()
-        await self.session.refresh(user)
+        """Create a new user with a single INSERT ... RETURNING.
+
+        Raises IntegrityError (after rolling back) when the email or username is taken.
+        """
+        try:
+            result = await self.session.scalars(insert(User).values(**user_data).returning(User))
+            user = result.one()
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            raise
+        user_status_cache.invalidate(user.id)
         return user
 
     async def get_by_id(self, user_id: int) -> Optional[User]:
@@ -28,6 +51,17 @@ class UserRepository:
         result = await self.session.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
+    async def is_active(self, user_id: int) -> bool:
+        """Check that a user exists and is active, using the status cache."""
+        cached = user_status_cache.get(user_id)
+        if cached is not None:
+            return bool(cached)
+
+        result = await self.session.execute(select(User.is_active).where(User.id == user_id))
+        active = bool(result.scalar_one_or_none())
+        user_status_cache.set(user_id, active)
+        return active
+
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         result = await self.session.execute(select(User).where(User.email == email))
@@ -44,12 +78,14 @@ class UserRepository:
             setattr(user, key, value)
         await self.session.commit()
         await self.session.refresh(user)
+        user_status_cache.invalidate(user.id)
         return user
 
     async def delete(self, user: User) -> None:
         """Delete user."""
         await self.session.delete(user)
         await self.session.commit()
+        user_status_cache.invalidate(user.id)
 
     async def list_all(self, skip: int = 0, limit: int = 100) -> list[User]:
         """List all users with pagination."""
@@ -1,13 +1,49 @@
 """Pydantic schemas."""
 
-from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate
-from app.schemas.user import UserCreate, UserResponse, UserUpdate
+from app.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchItemResult,
+    TaskBatchResponse,
+    TaskBatchUpdate,
+    TaskBatchUpdateItem,
+    TaskCreate,
+    TaskDailyStatsResponse,
+    TaskFileFormat,
+    TaskFilter,
+    TaskImportError,
+    TaskImportResult,
+    TaskImportRow,
+    TaskOrderBy,
+    TaskResponse,
+    TaskSearchResult,
+    TaskStatsResponse,
+    TaskUpdate,
+)
+from app.schemas.user import Principal, TokenResponse, UserCreate, UserResponse, UserUpdate
 
 __all__ = [
     "UserCreate",
     "UserUpdate",
     "UserResponse",
+    "Principal",
+    "TokenResponse",
     "TaskCreate",
+    "TaskOrderBy",
+    "TaskFileFormat",
+    "TaskFilter",
     "TaskUpdate",
     "TaskResponse",
+    "TaskSearchResult",
+    "TaskStatsResponse",
+    "TaskDailyStatsResponse",
+    "TaskBatchCreate",
+    "TaskBatchUpdate",
+    "TaskBatchUpdateItem",
+    "TaskBatchDelete",
+    "TaskBatchItemResult",
+    "TaskBatchResponse",
+    "TaskImportRow",
+    "TaskImportError",
+    "TaskImportResult",
 ]
@@ -1,9 +1,31 @@
 """Task schemas."""
 
-from datetime import datetime
-from typing import Optional
+from datetime import UTC, date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, create_model, field_validator
+
+from app.core.exceptions import ValidationError
+
+
+class TaskOrderBy(str, Enum):
+    """Sort orders supported by task listings; a leading ``-`` sorts descending."""
+
+    ID = "id"
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    ID_DESC = "-id"
+    CREATED_AT_DESC = "-created_at"
+    UPDATED_AT_DESC = "-updated_at"
+
+
+class TaskFileFormat(str, Enum):
+    """File formats supported by task export and import."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
 
 
 class TaskBase(BaseModel):
@@ -27,6 +49,27 @@ class TaskUpdate(BaseModel):
     is_completed: Optional[bool] = None
 
 
+class TaskFilter(BaseModel):
+    """Task listing filters; the created_at range is half-open."""
+
+    completed: Optional[bool] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+    @field_validator("created_after", "created_before")
+    @classmethod
+    def to_naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Convert aware datetimes to naive UTC, as created_at is stored."""
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(UTC).replace(tzinfo=None)
+        return value
+
+    @property
+    def by_created_at(self) -> bool:
+        """Whether the filter restricts created_at."""
+        return self.created_after is not None or self.created_before is not None
+
+
 class TaskResponse(TaskBase):
     """Task response schema."""
 
@@ -40,3 +83,119 @@ class TaskResponse(TaskBase):
         """Pydantic config."""
 
         from_attributes = True
+
+
+class TaskSearchResult(BaseModel):
+    """A search hit and its relevance score."""
+
+    task: TaskResponse
+    rank: float
+
+
+class TaskDailyStatsResponse(BaseModel):
+    """Tasks created and completed on one day (UTC)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    day: date
+    created: int
+    completed: int
+
+
+class TaskStatsResponse(BaseModel):
+    """Task statistics response schema."""
+
+    total: int
+    open: int
+    completed: int
+    daily: list[TaskDailyStatsResponse]
+
+
+# Upper bound on items accepted by a single batch request
+TASK_BATCH_MAX_SIZE = 500
+
+
+class TaskBatchUpdateItem(TaskUpdate):
+    """Single item of a batch update."""
+
+    id: int
+
+
+class TaskBatchCreate(BaseModel):
+    """Batch task creation schema."""
+
+    items: list[TaskCreate] = Field(..., min_length=1, max_length=TASK_BATCH_MAX_SIZE)
+
+
+class TaskBatchUpdate(BaseModel):
+    """Batch task update schema."""
+
+    items: list[TaskBatchUpdateItem] = Field(..., min_length=1, max_length=TASK_BATCH_MAX_SIZE)
+
+
+class TaskBatchDelete(BaseModel):
+    """Batch task deletion schema."""
+
+    ids: list[int] = Field(..., min_length=1, max_length=TASK_BATCH_MAX_SIZE)
+
+
+class TaskBatchItemResult(BaseModel):
+    """Outcome of a single batch item."""
+
+    index: int
+    id: Optional[int] = None
+    success: bool
+    task: Optional[TaskResponse] = None
+    error: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    """Batch operation response schema."""
+
+    results: list[TaskBatchItemResult]
+
+
+class TaskImportRow(TaskCreate):
+    """A task row read from an import file."""
+
+    is_completed: bool = False
+
+
+class TaskImportError(BaseModel):
+    """A rejected import row."""
+
+    line: int
+    error: str
+
+
+class TaskImportResult(BaseModel):
+    """Task import summary."""
+
+    imported: int
+    failed: int
+    batches: int
+    errors: list[TaskImportError]
+    errors_truncated: bool = False
+
+
+def parse_task_fields(fields: str) -> tuple[str, ...]:
+    """Parse a comma-separated sparse fieldset; id is always included."""
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - TaskResponse.model_fields.keys()
+    if unknown:
+        raise ValidationError(f"Unknown task fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    # Keep TaskResponse order so equal fieldsets share one cached model
+    return tuple(name for name in TaskResponse.model_fields if name in requested)
+
+
+@lru_cache(maxsize=128)
+def task_response_subset(fields: tuple[str, ...]) -> type[BaseModel]:
+    """Build a TaskResponse variant limited to the given fields."""
+    field_definitions: dict[str, Any] = {
+        name: (TaskResponse.model_fields[name].annotation, ...) for name in fields
+    }
+    model: type[BaseModel] = create_model(
+        "TaskResponsePartial", __config__=ConfigDict(from_attributes=True), **field_definitions
+    )
+    return model
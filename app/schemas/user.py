@@ -39,3 +39,23 @@ class UserResponse(UserBase):
         """Pydantic config."""
 
         from_attributes = True
+
+
+class TokenResponse(BaseModel):
+    """Access token response schema."""
+
+    access_token: str
+    token_type: str
+    user_id: int
+
+
+class Principal(BaseModel):
+    """Authenticated user, resolved once per request by the auth dependency."""
+
+    user_id: int
+    email: Optional[str] = None
+
+    class Config:
+        """Pydantic config."""
+
+        frozen = True
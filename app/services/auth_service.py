@@ -1,14 +1,21 @@
 """Authentication service."""
 
+import asyncio
 from datetime import timedelta
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.exceptions import UnauthorizedError, UserNotFoundError, ValidationError
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    verify_password_async,
+)
+from app.models.user import User
 from app.repositories.user_repository import UserRepository
-from app.schemas.user import UserCreate
+from app.schemas.user import Principal, UserCreate
 
 
 class AuthService:
@@ -20,19 +27,21 @@ class AuthService:
 
     async def register_user(self, user_data: UserCreate) -> dict:
         """Register a new user."""
-        # Check if user already exists
-        existing_user = await self.user_repo.get_by_email(user_data.email)
-        if existing_user:
-            raise ValidationError("User with this email already exists")
+        user_dict = user_data.model_dump()
+        password = user_dict.pop("password")
 
-        existing_username = await self.user_repo.get_by_username(user_data.username)
-        if existing_username:
-            raise ValidationError("User with this username already exists")
+        # Hash on the worker pool while the session checks out its connection
+        user_dict["hashed_password"], _ = await asyncio.gather(
+            get_password_hash_async(password), self.user_repo.connect()
+        )
 
-        # Create user
-        user_dict = user_data.model_dump()
-        user_dict["hashed_password"] = get_password_hash(user_dict.pop("password"))
-        user = await self.user_repo.create(user_dict)
+        # Rely on the unique indexes instead of checking for duplicates first
+        try:
+            user = await self.user_repo.create(user_dict)
+        except IntegrityError:
+            if await self.user_repo.get_by_email(user_data.email):
+                raise ValidationError("User with this email already exists") from None
+            raise ValidationError("User with this username already exists") from None
 
         # Create access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -48,7 +57,7 @@ class AuthService:
         if not user:
             raise UserNotFoundError("User not found")
 
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             raise UnauthorizedError("Incorrect password")
 
         if not user.is_active:
@@ -61,3 +70,10 @@ class AuthService:
         )
 
         return {"access_token": access_token, "token_type": "bearer", "user_id": user.id}
+
+    async def get_profile(self, principal: Principal) -> User:
+        """Load the authenticated user's profile."""
+        user = await self.user_repo.get_by_id(principal.user_id)
+        if not user:
+            raise UserNotFoundError("User not found")
+        return user
@@ -1,11 +1,77 @@
 """Task service."""
 
+import csv
+import hashlib
+import io
+import json
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime, timedelta
+from typing import Any, NoReturn, Optional
+
+import pydantic
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
+from structlog import get_logger
+
+from app.core.cache import cache_stats
+from app.core.config import settings
+from app.core.exceptions import (
+    PreconditionFailedError,
+    TaskNotFoundError,
+    UnauthorizedError,
+    ValidationError,
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.read_cache import ReadCache, create_backend
+from app.repositories.task_repository import TaskPage, TaskRepository, sort_key
+from app.repositories.task_stats_repository import TaskStatsRepository
+from app.schemas.task import (
+    TaskBatchItemResult,
+    TaskBatchUpdateItem,
+    TaskCreate,
+    TaskDailyStatsResponse,
+    TaskFilter,
+    TaskImportError,
+    TaskImportResult,
+    TaskImportRow,
+    TaskResponse,
+    TaskSearchResult,
+    TaskStatsResponse,
+    TaskUpdate,
+)
+from app.schemas.user import Principal
+
+logger = get_logger()
+
+# Fields that may be omitted from an update but not set to null
+NOT_NULL_FIELDS = ("title", "is_completed")
 
-from app.core.exceptions import TaskNotFoundError, UnauthorizedError
-from app.repositories.task_repository import TaskRepository
-from app.repositories.user_repository import UserRepository
-from app.schemas.task import TaskCreate, TaskUpdate
+# Exported columns, in CSV header order
+EXPORT_FIELDS = tuple(TaskResponse.model_fields)
+
+# Import limits: rejected rows listed in the summary, longest accepted line
+MAX_IMPORT_ERRORS = 100
+MAX_IMPORT_LINE_BYTES = 1024 * 1024
+
+# Full-object task reads, cached per user. Every write below invalidates the
+# user's entries once committed; changes made elsewhere (manual SQL, a stats
+# rebuild) show up once the TTL expires. Only reads on the primary fill it.
+task_cache = ReadCache(
+    create_backend(
+        settings.TASK_CACHE_BACKEND,
+        url=settings.TASK_CACHE_URL,
+        max_bytes=settings.TASK_CACHE_MAX_BYTES,
+        ttl=settings.TASK_CACHE_TTL_SECONDS,
+        timeout=settings.TASK_CACHE_TIMEOUT_SECONDS,
+    ),
+    namespace="tasks",
+    ttl=settings.TASK_CACHE_TTL_SECONDS,
+)
+cache_stats["task"] = task_cache.stats
+
+# Cached values: a task, or a list page (items, count, version, next cursor)
+CACHED_TASK = TypeAdapter(TaskResponse)
+CACHED_PAGE = TypeAdapter(tuple[list[TaskResponse], Optional[int], int, Optional[str]])
 
 
 class TaskService:
@@ -14,56 +80,498 @@ class TaskService:
     def __init__(self, session: AsyncSession):
         """Initialize service with database session."""
         self.task_repo = TaskRepository(session)
-        self.user_repo = UserRepository(session)
-
-    async def create_task(self, user_id: int, task_data: TaskCreate) -> dict:
-        """Create a new task for a user."""
-        # Verify user exists
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
-            raise UnauthorizedError("User not found")
+        self.stats_repo = TaskStatsRepository(session)
+        # A lagging replica could read data older than the version it is cached under
+        self.fills_cache = not session.info.get("replica")
 
+    async def create_task(self, principal: Principal, task_data: TaskCreate) -> dict:
+        """Create a new task for the authenticated user."""
         task_dict = task_data.model_dump()
-        task_dict["user_id"] = user_id
+        task_dict["user_id"] = principal.user_id
         task = await self.task_repo.create(task_dict)
+        await task_cache.invalidate(principal.user_id)
         return task
 
-    async def get_task(self, task_id: int, user_id: int) -> dict:
-        """Get a task by ID."""
-        task = await self.task_repo.get_by_id(task_id)
+    async def get_task(
+        self, task_id: int, principal: Principal, fields: Optional[tuple[str, ...]] = None
+    ) -> Any:
+        """Get a task by ID, optionally loading only the given fields.
+
+        Returns the task, or a row of just ``fields`` when they are given.
+        """
+        if fields:
+            task = await self.task_repo.get_columns_by_id(task_id, fields)
+        else:
+            task = await self._get_task_cached(task_id, principal)
         if not task:
             raise TaskNotFoundError("Task not found")
 
-        if task.user_id != user_id:
+        if task.user_id != principal.user_id:
             raise UnauthorizedError("You don't have permission to access this task")
 
         return task
 
-    async def list_tasks(self, user_id: int, skip: int = 0, limit: int = 100) -> list[dict]:
-        """List tasks for a user."""
-        tasks = await self.task_repo.get_by_user_id(user_id, skip=skip, limit=limit)
-        return tasks
+    async def _get_task_cached(self, task_id: int, principal: Principal) -> Any:
+        """Get a task through the cache; only the principal's own tasks are cached."""
+        version = await task_cache.version(principal.user_id)
+        name = f"task:{task_id}"
+        if version is not None:
+            cached = await task_cache.get(principal.user_id, version, name)
+            if cached is not None:
+                return CACHED_TASK.validate_json(cached)
 
-    async def update_task(self, task_id: int, user_id: int, task_data: TaskUpdate) -> dict:
-        """Update a task."""
         task = await self.task_repo.get_by_id(task_id)
-        if not task:
+        owned = task is not None and task.user_id == principal.user_id
+        if version is not None and self.fills_cache and owned:
+            value = CACHED_TASK.validate_python(task, from_attributes=True)
+            await task_cache.set(principal.user_id, version, name, CACHED_TASK.dump_json(value))
+        return task
+
+    async def get_task_version(self, task_id: int, principal: Principal) -> datetime:
+        """Get when a task last changed without loading it, checking ownership as get_task."""
+        row = await self.task_repo.get_version(task_id)
+        if not row:
             raise TaskNotFoundError("Task not found")
 
-        if task.user_id != user_id:
-            raise UnauthorizedError("You don't have permission to update this task")
+        if row.user_id != principal.user_id:
+            raise UnauthorizedError("You don't have permission to access this task")
+
+        version: datetime = row.version
+        return version
 
+    async def get_list_version(self, principal: Principal) -> int:
+        """Get the user's task change version, which moves on every write to their tasks."""
+        return await self.stats_repo.get_version(principal.user_id)
+
+    async def list_tasks(
+        self,
+        principal: Principal,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: str = "id",
+        cursor: Optional[str] = None,
+        fields: Optional[tuple[str, ...]] = None,
+        filters: Optional[TaskFilter] = None,
+    ) -> tuple[TaskPage, Optional[str]]:
+        """List tasks for a user: a page with its count and version, and the next cursor.
+
+        The cursor is None on the last page; the count is None when the stats
+        rollup can't answer for these filters. With ``fields``, only those columns
+        are selected and plain rows are returned; otherwise the page is cached.
+        """
+        by_created_at = filters is not None and filters.by_created_at
+        if by_created_at and order_by.removeprefix("-") != "created_at":
+            # Only the created_at index can both range-scan and order the page
+            raise ValidationError(
+                "created_after and created_before require order_by=created_at or -created_at"
+            )
+        after = decode_cursor(cursor, order_by) if cursor else None
+        version = None if fields else await task_cache.version(principal.user_id)
+        if version is not None:
+            params = [skip, limit, order_by, cursor, filters and filters.model_dump_json()]
+            digest = hashlib.blake2b(json.dumps(params).encode(), digest_size=16).hexdigest()
+            name = f"page:{digest}"
+            cached = await task_cache.get(principal.user_id, version, name)
+            if cached is not None:
+                tasks, total, stats_version, next_cursor = CACHED_PAGE.validate_json(cached)
+                return TaskPage(tasks, total, stats_version), next_cursor
+
+        # Fetch one extra row to learn whether another page exists
+        if fields:
+            result = await self.task_repo.get_columns_by_user_id(
+                principal.user_id,
+                fields,
+                skip=skip,
+                limit=limit + 1,
+                order_by=order_by,
+                after=after,
+                filters=filters,
+            )
+        else:
+            result = await self.task_repo.get_by_user_id(
+                principal.user_id,
+                skip=skip,
+                limit=limit + 1,
+                order_by=order_by,
+                after=after,
+                filters=filters,
+            )
+        next_cursor = None
+        if len(result.items) > limit:
+            result = result._replace(items=result.items[:limit])
+            last = result.items[-1]
+            next_cursor = encode_cursor(order_by, sort_key(last, order_by), last.id)
+
+        if version is not None and self.fills_cache:
+            value = CACHED_PAGE.validate_python(
+                (result.items, result.total, result.version, next_cursor), from_attributes=True
+            )
+            await task_cache.set(principal.user_id, version, name, CACHED_PAGE.dump_json(value))
+        return result, next_cursor
+
+    async def get_stats(self, principal: Principal, days: int = 30) -> TaskStatsResponse:
+        """Get the user's task counters and per-day counts for the last ``days`` days (UTC)."""
+        since = datetime.utcnow().date() - timedelta(days=days - 1)
+        totals = await self.stats_repo.get_totals(principal.user_id)
+        daily = await self.stats_repo.get_daily(principal.user_id, since)
+        total = totals.total if totals else 0
+        completed = totals.completed if totals else 0
+        return TaskStatsResponse(
+            total=total,
+            open=total - completed,
+            completed=completed,
+            daily=[TaskDailyStatsResponse.model_validate(day) for day in daily],
+        )
+
+    async def search_tasks(
+        self, principal: Principal, query: str, skip: int = 0, limit: int = 100
+    ) -> list[TaskSearchResult]:
+        """Search the user's tasks, best match first."""
+        rows = await self.task_repo.search(principal.user_id, query, skip=skip, limit=limit)
+        return [
+            TaskSearchResult(task=TaskResponse.model_validate(task), rank=rank)
+            for task, rank in rows
+        ]
+
+    async def update_task(
+        self,
+        task_id: int,
+        principal: Principal,
+        task_data: TaskUpdate,
+        versions: Optional[list[datetime]] = None,
+    ) -> dict:
+        """Update a task, only if it is at one of ``versions`` when they are given."""
         update_dict = task_data.model_dump(exclude_unset=True)
-        updated_task = await self.task_repo.update(task, update_dict)
+        updated_task = await self.task_repo.update_owned(
+            task_id, principal.user_id, update_dict, versions
+        )
+        if updated_task is None:
+            await self._raise_not_owned(
+                task_id, principal, "You don't have permission to update this task"
+            )
+        await task_cache.invalidate(principal.user_id)
         return updated_task
 
-    async def delete_task(self, task_id: int, user_id: int) -> None:
-        """Delete a task."""
-        task = await self.task_repo.get_by_id(task_id)
-        if not task:
+    async def delete_task(
+        self, task_id: int, principal: Principal, versions: Optional[list[datetime]] = None
+    ) -> None:
+        """Delete a task, only if it is at one of ``versions`` when they are given."""
+        if not await self.task_repo.delete_owned(task_id, principal.user_id, versions):
+            await self._raise_not_owned(
+                task_id, principal, "You don't have permission to delete this task"
+            )
+        await task_cache.invalidate(principal.user_id)
+
+    async def export_tasks(self, principal: Principal, export_format: str) -> AsyncIterator[bytes]:
+        """Encode all of a user's tasks as NDJSON or CSV, one chunk of rows at a time."""
+        if export_format == "csv":
+            yield _encode_csv([EXPORT_FIELDS])
+
+        chunks = self.task_repo.stream_by_user_id(
+            principal.user_id, EXPORT_FIELDS, settings.EXPORT_CHUNK_SIZE
+        )
+        async for rows in chunks:
+            tasks = [TaskResponse.model_validate(row) for row in rows]
+            if export_format == "csv":
+                yield _encode_csv(
+                    [_csv_value(value) for value in task.model_dump(mode="json").values()]
+                    for task in tasks
+                )
+            else:
+                yield b"".join(task.model_dump_json().encode() + b"\n" for task in tasks)
+
+    async def import_tasks(
+        self, principal: Principal, body: AsyncIterator[bytes], import_format: str
+    ) -> TaskImportResult:
+        """Validate a streamed NDJSON or CSV body row by row and COPY it in batches.
+
+        Each batch is committed on its own, so rows loaded before a failure stay
+        imported; only one batch of rows is held in memory at a time.
+        """
+        result = TaskImportResult(imported=0, failed=0, batches=0, errors=[])
+        records: list[tuple] = []
+
+        async def flush() -> None:
+            now = datetime.utcnow()
+            # Fill created_at and, for completed rows, completed_at (see IMPORT_COLUMNS)
+            await self.task_repo.copy_records(
+                [(*record, now, now if record[2] else None) for record in records]
+            )
+            await task_cache.invalidate(principal.user_id)
+            result.imported += len(records)
+            result.batches += 1
+            records.clear()
+            logger.info(
+                "Task import progress",
+                user_id=principal.user_id,
+                imported=result.imported,
+                failed=result.failed,
+                batches=result.batches,
+            )
+
+        parse = _parse_csv if import_format == "csv" else _parse_ndjson
+        async for line, row, error in parse(_read_lines(body)):
+            if error is None:
+                try:
+                    task = TaskImportRow.model_validate(row)
+                except pydantic.ValidationError as exc:
+                    error = _format_errors(exc)
+            if error is not None:
+                result.failed += 1
+                if len(result.errors) < MAX_IMPORT_ERRORS:
+                    result.errors.append(TaskImportError(line=line, error=error))
+                else:
+                    result.errors_truncated = True
+                continue
+
+            records.append((task.title, task.description, task.is_completed, principal.user_id))
+            if len(records) >= settings.IMPORT_BATCH_SIZE:
+                await flush()
+
+        if records:
+            await flush()
+        return result
+
+    async def _raise_not_owned(self, task_id: int, principal: Principal, message: str) -> NoReturn:
+        """Explain why an ownership- and version-scoped statement matched no task."""
+        # Only reached on the failure path, so the happy path stays one statement
+        owner_id = await self.task_repo.get_owner_id(task_id)
+        if owner_id is None:
             raise TaskNotFoundError("Task not found")
+        if owner_id != principal.user_id:
+            raise UnauthorizedError(message)
+        # The user owns the task, so it was the If-Match version that didn't match
+        raise PreconditionFailedError("Task has changed since it was read")
+
+    async def create_tasks(
+        self, principal: Principal, items: list[TaskCreate]
+    ) -> list[TaskBatchItemResult]:
+        """Create several tasks for the authenticated user in one statement."""
+        tasks = await self.task_repo.create_many(
+            [{**item.model_dump(), "user_id": principal.user_id} for item in items]
+        )
+        await task_cache.invalidate(principal.user_id)
+        return [
+            TaskBatchItemResult(
+                index=index, id=task.id, success=True, task=TaskResponse.model_validate(task)
+            )
+            for index, task in enumerate(tasks)
+        ]
+
+    async def update_tasks(
+        self, principal: Principal, items: list[TaskBatchUpdateItem]
+    ) -> list[TaskBatchItemResult]:
+        """Update several tasks of a user in one statement, reporting each item's outcome."""
+        results: dict[int, TaskBatchItemResult] = {}
+        pending: dict[int, int] = {}
+        updates = []
+        for index, item in enumerate(items):
+            update_dict = item.model_dump(exclude_unset=True)
+            if item.id in pending:
+                error = "Duplicate task id in batch"
+            elif any(name in update_dict and update_dict[name] is None for name in NOT_NULL_FIELDS):
+                error = "Fields title and is_completed cannot be null"
+            else:
+                pending[item.id] = index
+                updates.append(update_dict)
+                continue
+            results[index] = TaskBatchItemResult(index=index, id=item.id, success=False, error=error)
+
+        updated_tasks = []
+        if updates:
+            updated_tasks = await self.task_repo.update_many(principal.user_id, updates)
+            await task_cache.invalidate(principal.user_id)
+        for task in updated_tasks:
+            index = pending.pop(task.id)
+            results[index] = TaskBatchItemResult(
+                index=index, id=task.id, success=True, task=TaskResponse.model_validate(task)
+            )
+        for task_id, index in pending.items():
+            results[index] = TaskBatchItemResult(
+                index=index, id=task_id, success=False, error="Task not found"
+            )
+
+        return [results[index] for index in range(len(items))]
+
+    async def delete_tasks(
+        self, principal: Principal, task_ids: list[int]
+    ) -> list[TaskBatchItemResult]:
+        """Delete several tasks of a user in one statement, reporting each item's outcome."""
+        deleted_ids = set(
+            await self.task_repo.delete_many(principal.user_id, list(set(task_ids)))
+        )
+        await task_cache.invalidate(principal.user_id)
+        results = []
+        seen: set[int] = set()
+        for index, task_id in enumerate(task_ids):
+            if task_id in seen:
+                error = "Duplicate task id in batch"
+            elif task_id not in deleted_ids:
+                error = "Task not found"
+            else:
+                error = None
+            seen.add(task_id)
+            results.append(
+                TaskBatchItemResult(index=index, id=task_id, success=error is None, error=error)
+            )
+        return results
+
+
+def _csv_value(value: object) -> object:
+    """Render a JSON-mode value for CSV: lowercase booleans, empty string for null."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def _encode_csv(rows: Iterable[Iterable[object]]) -> bytes:
+    """Encode rows as CSV bytes."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _format_errors(exc: pydantic.ValidationError) -> str:
+    """Summarize a row's validation errors on one line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def _read_lines(body: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, Optional[str]]]:
+    """Split a byte stream into numbered lines; unusable lines come back as None.
+
+    A line is unusable when it is longer than MAX_IMPORT_LINE_BYTES (it is skipped
+    without being buffered) or not valid UTF-8.
+    """
+    buffer = bytearray()
+    oversized = False
+    number = 0
+    async for chunk in body:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            number += 1
+            if oversized or len(buffer) + end - start > MAX_IMPORT_LINE_BYTES:
+                yield number, None
+            else:
+                yield number, _decode_line(bytes(buffer) + chunk[start:end])
+            buffer.clear()
+            oversized = False
+            start = end + 1
+        if not oversized:
+            buffer += chunk[start:]
+            if len(buffer) > MAX_IMPORT_LINE_BYTES:
+                buffer.clear()
+                oversized = True
+
+    if oversized:
+        yield number + 1, None
+    elif buffer:
+        yield number + 1, _decode_line(bytes(buffer))
+
+
+def _decode_line(data: bytes) -> Optional[str]:
+    """Decode a UTF-8 line without its line ending, or None if it isn't valid UTF-8."""
+    try:
+        return data.decode("utf-8").removesuffix("\r")
+    except UnicodeDecodeError:
+        return None
+
+
+# Parsed import rows: (line number, field mapping, error message)
+ImportRows = AsyncIterator[tuple[int, Optional[dict[str, Any]], Optional[str]]]
+
+UNREADABLE_LINE = f"Line is not valid UTF-8 or exceeds {MAX_IMPORT_LINE_BYTES} bytes"
+
+
+async def _parse_ndjson(lines: AsyncIterator[tuple[int, Optional[str]]]) -> ImportRows:
+    """Parse one JSON object per line, skipping blank lines."""
+    async for number, line in lines:
+        if line is None:
+            yield number, None, UNREADABLE_LINE
+            continue
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Expected a JSON object"
+            continue
+        yield number, row, None
+
+
+async def _parse_csv(lines: AsyncIterator[tuple[int, Optional[str]]]) -> ImportRows:
+    """Parse CSV with a header row; quoted fields may span lines.
+
+    Columns other than the task's own (for example those of an export) are ignored,
+    and empty cells count as missing. A record spanning lines is held only up to
+    MAX_IMPORT_LINE_BYTES; a longer one is reported and parsing restarts after it.
+    """
+    header: Optional[list[str]] = None
+    record: list[str] = []
+    record_bytes = 0
+    quotes = 0
+    start = 0
+    async for number, line in lines:
+        if line is None:
+            # Drop any partial record too: its closing quote can't be trusted
+            yield start if record else number, None, UNREADABLE_LINE
+            record = []
+            continue
+        if not record:
+            if not line.strip():
+                continue
+            start = number
+            record_bytes = quotes = 0
+        record.append(line)
+        record_bytes += len(line.encode()) + 1
+        quotes += line.count('"')
+        # An odd number of quotes means a quoted field continues on the next line,
+        # unless the record's only line just has a quote inside an unquoted cell
+        if quotes % 2 and (len(record) > 1 or _opens_quoted_field(line)):
+            if record_bytes > MAX_IMPORT_LINE_BYTES:
+                yield start, None, f"Record exceeds {MAX_IMPORT_LINE_BYTES} bytes"
+                record = []
+            continue
+        text = "\n".join(record)
+        record = []
+
+        try:
+            values = next(csv.reader([text], strict=True))
+        except csv.Error as exc:
+            yield start, None, f"Invalid CSV: {exc}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            if "title" not in header:
+                raise ValidationError("CSV header must include a title column")
+            continue
+        if len(values) != len(header):
+            yield start, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        row = {name: value for name, value in zip(header, values, strict=True) if value != ""}
+        yield start, row, None
+
+    if record:
+        yield start, None, "Unterminated quoted field"
 
-        if task.user_id != user_id:
-            raise UnauthorizedError("You don't have permission to delete this task")
 
-        await self.task_repo.delete(task)
+def _opens_quoted_field(line: str) -> bool:
+    """Whether a line ends inside a quoted field, which a closing quote would end."""
+    try:
+        next(csv.reader([line], strict=True))
+    except csv.Error:
+        pass
+    else:
+        return False
+    try:
+        next(csv.reader([line + '"'], strict=True))
+    except csv.Error:
+        return False
+    return True
@@ -0,0 +1,205 @@
+"""Startup warmup, so a new worker's first requests run at steady-state speed.
+
+Without it those requests pay for SQLAlchemy mapper configuration, pydantic
+response adapters, opening pool connections, and compiling and preparing the
+hot statements on each connection. The lifespan runs the phases in order and
+the app reports ready (GET /ready) once they are done.
+"""
+
+import asyncio
+import inspect
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import date
+from typing import Any
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import configure_mappers
+from structlog import get_logger
+
+from app.api.responses import get_adapter
+from app.core.config import settings
+from app.core.metrics import registry, sample_exposition
+from app.db.base import engine, replicas
+from app.repositories.task_repository import TaskRepository
+from app.repositories.task_stats_repository import TaskStatsRepository
+from app.repositories.user_repository import UserRepository, user_status_cache
+from app.schemas.task import (
+    TaskBatchResponse,
+    TaskImportResult,
+    TaskResponse,
+    TaskSearchResult,
+    TaskStatsResponse,
+)
+from app.schemas.user import TokenResponse, UserResponse
+
+logger = get_logger()
+
+# Types the endpoints pass to typed_response
+RESPONSE_TYPES = (
+    TaskResponse,
+    list[TaskResponse],
+    list[TaskSearchResult],
+    TaskStatsResponse,
+    TaskBatchResponse,
+    TaskImportResult,
+    TokenResponse,
+    UserResponse,
+)
+
+# An ID no row has, so primed statements find nothing
+MISSING_ID = 0
+
+
+class Warmup:
+    """Phase timings of the startup warmup and whether the app is ready for traffic."""
+
+    def __init__(self) -> None:
+        """Initialize as not ready, with no phases run."""
+        self.ready = False
+        self.phases: dict[str, float] = {}
+        self.failed: list[str] = []
+
+    async def run(self) -> None:
+        """Run every phase; a failing phase is logged and skipped, not fatal.
+
+        The app works without warmup, only slower at first, so a database that
+        is down at startup doesn't keep the worker from starting.
+        """
+        started = time.perf_counter()
+        connections: list[AsyncConnection] = []
+        await self._phase("mappers", configure_mappers)
+        await self._phase("adapters", build_adapters)
+        await self._phase("connections", lambda: self._open_connections(connections))
+        await self._phase("statements", lambda: self._prime_statements(connections))
+        self.ready = True
+        logger.info(
+            "Warmup finished",
+            total_ms=round((time.perf_counter() - started) * 1000, 1),
+            phases_ms={name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            failed=self.failed,
+        )
+
+    async def _phase(self, name: str, work: Callable[[], Any]) -> None:
+        """Time one phase, plain or async, under WARMUP_TIMEOUT_SECONDS."""
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(settings.WARMUP_TIMEOUT_SECONDS):
+                result = work()
+                if inspect.isawaitable(result):
+                    await result
+        except (OSError, DBAPIError, TimeoutError) as exc:
+            self.failed.append(name)
+            logger.warning("Warmup phase failed", phase=name, error=repr(exc))
+        self.phases[name] = time.perf_counter() - started
+
+    async def _open_connections(self, connections: list[AsyncConnection]) -> None:
+        """Open up to WARMUP_DB_CONNECTIONS on the primary and on each replica at once.
+
+        Capped at the pool size: overflow connections would be closed on return.
+        """
+        count = min(settings.WARMUP_DB_CONNECTIONS, settings.DB_POOL_SIZE)
+        engines = [engine, *replicas.engines]
+        # Collected as they open, so a timeout can't lose track of any
+        results = await asyncio.gather(
+            *(open_connection(target, connections) for target in engines for _ in range(count)),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+    async def _prime_statements(self, connections: list[AsyncConnection]) -> None:
+        """Run the hot statements on every opened connection, then return it to its pool."""
+        try:
+            results = await asyncio.gather(
+                *(
+                    prime_connection(connection, writes=is_primary(connection))
+                    for connection in connections
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            for connection in connections:
+                await connection.close()
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+    def exposition(self) -> Iterator[str]:
+        """Yield phase durations for /metrics."""
+        yield from sample_exposition(
+            "app_warmup_seconds",
+            "Time spent in each startup warmup phase",
+            "gauge",
+            (({"phase": name}, seconds) for name, seconds in self.phases.items()),
+        )
+
+
+def build_adapters() -> None:
+    """Build the pydantic adapters typed_response serializes with."""
+    for response_type in RESPONSE_TYPES:
+        get_adapter(response_type)
+
+
+async def open_connection(target: AsyncEngine, connections: list[AsyncConnection]) -> None:
+    """Check out a connection, opening it if the pool has none idle, and add it to the list."""
+    connections.append(await target.connect())
+
+
+def is_primary(connection: AsyncConnection) -> bool:
+    """Whether a warmup connection belongs to the primary, which takes writes."""
+    return connection.engine is engine
+
+
+async def prime_connection(connection: AsyncConnection, writes: bool) -> None:
+    """Run the repositories' hot statements on a connection, leaving nothing changed.
+
+    Statements run for rows that don't exist, inside a transaction that is rolled
+    back, so SQLAlchemy compiles each one and asyncpg prepares it on this
+    connection. INSERTs are left out: they would use up sequence values, and the
+    user they'd need doesn't exist.
+    """
+    transaction = await connection.begin()
+    # Repository commits release a savepoint; the rollback below undoes it all
+    session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        for statement in hot_statements(session, writes):
+            await statement()
+    finally:
+        await session.close()
+        await transaction.rollback()
+    # The primed lookup cached a status for a user that doesn't exist
+    user_status_cache.invalidate(MISSING_ID)
+
+
+def hot_statements(session: AsyncSession, writes: bool) -> list[Callable[[], Awaitable]]:
+    """Calls that issue the statements behind the auth and task endpoints."""
+    users = UserRepository(session)
+    tasks = TaskRepository(session)
+    stats = TaskStatsRepository(session)
+    statements: list[Callable[[], Awaitable]] = [
+        lambda: users.get_by_email(""),
+        lambda: users.get_by_id(MISSING_ID),
+        lambda: users.is_active(MISSING_ID),
+        lambda: tasks.get_by_id(MISSING_ID),
+        lambda: tasks.get_version(MISSING_ID),
+        lambda: tasks.get_owner_id(MISSING_ID),
+        lambda: tasks.get_by_user_id(MISSING_ID),
+        lambda: tasks.get_by_user_id(MISSING_ID, after=(MISSING_ID, MISSING_ID)),
+        lambda: tasks.search(MISSING_ID, "warmup"),
+        lambda: stats.get_version(MISSING_ID),
+        lambda: stats.get_totals(MISSING_ID),
+        lambda: stats.get_daily(MISSING_ID, date.today()),
+    ]
+    if writes:
+        statements += [
+            lambda: tasks.update_owned(MISSING_ID, MISSING_ID, {"is_completed": True}),
+            lambda: tasks.delete_owned(MISSING_ID, MISSING_ID),
+        ]
+    return statements
+
+
+warmup = Warmup()
+registry.register(warmup)
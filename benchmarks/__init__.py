@@ -0,0 +1 @@
+"""Benchmarks for the Task Management API."""
@@ -0,0 +1,330 @@
+"""End-to-end load test: concurrent clients running a weighted mix of API operations.
+
+Run it against a server on a database seeded by benchmarks.seed (the clients log
+in as its users), or pass --start-server to run uvicorn on DATABASE_URL for the
+duration. Prints RPS and p50/p95/p99 latency per operation as JSON and, given a
+baseline from an earlier run, flags operations that got slower.
+
+Usage: python -m benchmarks.load [--start-server] [--concurrency N] [--duration S]
+                                 [--mix login=1,list=10,...] [--output FILE]
+                                 [--baseline FILE] [--tolerance 0.1]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Optional
+
+import httpx
+
+from benchmarks.seed import BENCH_PASSWORD, bench_email
+
+OPERATIONS = ("register", "login", "create", "list", "get", "update", "delete")
+
+# Reads dominate, as for a typical task list UI; registering (bcrypt) stays rare
+DEFAULT_MIX = "register=0.1,login=1,create=4,list=10,get=10,update=4,delete=1"
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parse ``operation=weight,...`` into weights for known operations."""
+    weights = {}
+    for item in mix.split(","):
+        operation, _, weight = item.partition("=")
+        operation = operation.strip()
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation!r}")
+        weights[operation] = float(weight or 1)
+    return weights
+
+
+def percentile(sorted_values: list[float], share: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(share * len(sorted_values)) - 1, 0)]
+
+
+class LoadStats:
+    """Latencies and errors per operation, recorded once the warmup is over."""
+
+    def __init__(self):
+        """Initialize empty stats."""
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    def record(self, operation: str, seconds: float, ok: bool) -> None:
+        """Record one operation's latency, counting failures separately."""
+        if not self.recording:
+            return
+        if ok:
+            self.latencies[operation].append(seconds)
+        else:
+            self.errors[operation] += 1
+
+    def report(self, duration: float) -> dict:
+        """Requests, errors, RPS and latency percentiles in ms, per operation and overall."""
+        operations = {}
+        for operation in sorted(set(self.latencies) | set(self.errors)):
+            latencies = sorted(self.latencies[operation])
+            operations[operation] = {
+                "requests": len(latencies),
+                "errors": self.errors[operation],
+                "rps": round(len(latencies) / duration, 1),
+                "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            }
+        requests = sum(stats["requests"] for stats in operations.values())
+        return {
+            "requests": requests,
+            "errors": sum(stats["errors"] for stats in operations.values()),
+            "rps": round(requests / duration, 1),
+            "operations": operations,
+        }
+
+
+class Client:
+    """One simulated user: logs in as a seeded user and works on its own tasks."""
+
+    def __init__(self, http: httpx.AsyncClient, stats: LoadStats, email: str):
+        """Initialize client for a seeded user's email."""
+        self.http = http
+        self.stats = stats
+        self.email = email
+        self.headers: dict[str, str] = {}
+        self.task_ids: list[int] = []
+        self.created_ids: list[int] = []
+
+    async def call(
+        self, operation: str, method: str, url: str, **kwargs
+    ) -> Optional[httpx.Response]:
+        """Send a request, timing it under ``operation``; None if it failed."""
+        started = time.perf_counter()
+        try:
+            response = await self.http.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(operation, time.perf_counter() - started, ok=False)
+            return None
+        ok = response.status_code < 400
+        self.stats.record(operation, time.perf_counter() - started, ok=ok)
+        return response if ok else None
+
+    async def login(self) -> None:
+        """Log in and remember the token."""
+        response = await self.call(
+            "login",
+            "POST",
+            "/api/v1/auth/login",
+            params={"email": self.email, "password": BENCH_PASSWORD},
+        )
+        if response is not None:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def register(self) -> None:
+        """Register a throwaway user; the client keeps its own login."""
+        name = f"load{uuid.uuid4().hex[:16]}"
+        await self.call(
+            "register",
+            "POST",
+            "/api/v1/auth/register",
+            json={"email": f"{name}@example.com", "username": name, "password": BENCH_PASSWORD},
+        )
+
+    async def create(self) -> None:
+        """Create a task."""
+        response = await self.call(
+            "create", "POST", "/api/v1/tasks", json={"title": "Load test task"}
+        )
+        if response is not None:
+            self.created_ids.append(response.json()["id"])
+
+    async def list(self) -> None:
+        """List a page of tasks, remembering their IDs for reads and updates."""
+        response = await self.call("list", "GET", "/api/v1/tasks", params={"limit": 50})
+        if response is not None:
+            self.task_ids = [task["id"] for task in response.json()] or self.task_ids
+
+    async def get(self) -> None:
+        """Read one of the user's tasks."""
+        task_id = self.pick_task()
+        if task_id is not None:
+            await self.call("get", "GET", f"/api/v1/tasks/{task_id}")
+
+    async def update(self) -> None:
+        """Toggle one of the user's tasks."""
+        task_id = self.pick_task()
+        if task_id is not None:
+            await self.call(
+                "update",
+                "PUT",
+                f"/api/v1/tasks/{task_id}",
+                json={"is_completed": random.random() < 0.5},
+            )
+
+    async def delete(self) -> None:
+        """Delete a task this client created, so seeded data stays as it was."""
+        if self.created_ids:
+            task_id = self.created_ids.pop()
+            if task_id in self.task_ids:
+                self.task_ids.remove(task_id)
+            await self.call("delete", "DELETE", f"/api/v1/tasks/{task_id}")
+
+    def pick_task(self) -> Optional[int]:
+        """A known task of the user, if any."""
+        ids = self.task_ids or self.created_ids
+        return random.choice(ids) if ids else None
+
+    async def run(self, weights: dict[str, float], deadline: float) -> None:
+        """Run randomly chosen operations until the deadline."""
+        await self.login()
+        await self.list()
+        operations = list(weights)
+        cumulative = list(weights.values())
+        while time.monotonic() < deadline:
+            (operation,) = random.choices(operations, cumulative)
+            await getattr(self, operation)()
+
+
+async def run_load(
+    base_url: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    weights: dict[str, float],
+    users: int,
+) -> dict:
+    """Run the clients for warmup + duration seconds; report on the last ``duration``."""
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as http:
+        deadline = time.monotonic() + warmup + duration
+        clients = [
+            Client(http, stats, bench_email(number % users + 1)) for number in range(concurrency)
+        ]
+        tasks = [asyncio.create_task(client.run(weights, deadline)) for client in clients]
+        await asyncio.sleep(warmup)
+        stats.recording = True
+        started = time.monotonic()
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+    return stats.report(elapsed)
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Operations whose RPS fell or p95 rose by more than ``tolerance`` against the baseline."""
+    regressions = []
+    for operation, before in baseline["operations"].items():
+        after = report["operations"].get(operation)
+        if after is None:
+            continue
+        if after["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{operation}: rps {before['rps']} -> {after['rps']}")
+        if after["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{operation}: p95 {before['p95_ms']}ms -> {after['p95_ms']}ms")
+    return regressions
+
+
+def start_server(host: str, port: int, workers: int) -> subprocess.Popen:
+    """Start uvicorn in production mode and wait until /health answers."""
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            host,
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--no-access-log",
+        ],
+        env={**os.environ, "DEBUG": "False"},
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://{host}:{port}/health").status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30 seconds")
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--start-server", action="store_true", help="Run uvicorn on the --base-url port"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers to start")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds first")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Operation weights")
+    parser.add_argument("--users", type=int, default=100, help="Seeded users to log in as")
+    parser.add_argument("--label", default="", help="Free-form run label, e.g. the seed scale")
+    parser.add_argument("--output", help="Also write the report to this file")
+    parser.add_argument("--baseline", help="Compare with a report saved by an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    server = None
+    if args.start_server:
+        url = httpx.URL(args.base_url)
+        server = start_server(url.host, url.port or 80, args.workers)
+    try:
+        report = asyncio.run(
+            run_load(
+                args.base_url,
+                args.concurrency,
+                args.duration,
+                args.warmup,
+                parse_mix(args.mix),
+                args.users,
+            )
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "label": args.label,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "mix": args.mix,
+        **report,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
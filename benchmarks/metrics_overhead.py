@@ -0,0 +1,135 @@
+"""Cost of the metrics collectors: per observation, per request, per statement and per scrape.
+
+Usage: python -m benchmarks.metrics_overhead [--requests N] [--statements N] [--rounds N]
+"""
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, text
+
+from app.core.metrics import Histogram, registry
+from app.core.request_metrics import RequestMetricsMiddleware, request_duration
+from app.db.pool import instrument_queries, query_duration
+from benchmarks.response_formats import timed
+
+
+def make_app() -> FastAPI:
+    """A minimal app with one templated route."""
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+async def request_us(app, requests: int) -> float:
+    """Microseconds per GET /items/{n}, calling the ASGI app directly."""
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = 0.0
+    # The first rounds warm up routing and validation and aren't timed
+    for number in range(-min(requests, 500), requests):
+        if number == 0:
+            started = time.perf_counter()
+        path = f"/items/{number}"
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "server": ("bench", 80),
+            "client": ("bench", 1),
+        }
+        await app(scope, receive, send)
+    return round((time.perf_counter() - started) / requests * 1e6, 2)
+
+
+def statement_us(listeners: str, statements: int) -> float:
+    """Microseconds per SELECT 1 on in-memory SQLite.
+
+    ``listeners`` is none, noop (empty cursor listeners: SQLAlchemy's own event
+    dispatch cost) or timed (instrument_queries).
+    """
+    engine = create_engine("sqlite://")
+    if listeners == "noop":
+        event.listen(engine, "before_cursor_execute", lambda *args: None)
+        event.listen(engine, "after_cursor_execute", lambda *args: None)
+    elif listeners == "timed":
+        # instrument_queries only needs the sync engine of an AsyncEngine
+        instrument_queries(SimpleNamespace(sync_engine=engine), "bench")
+    with engine.connect() as conn:
+        statement = text("SELECT 1")
+        for _ in range(1000):
+            conn.execute(statement)
+        started = time.perf_counter()
+        for _ in range(statements):
+            conn.execute(statement)
+        elapsed = time.perf_counter() - started
+    engine.dispose()
+    return round(elapsed / statements * 1e6, 2)
+
+
+def run(requests: int, statements: int, rounds: int) -> dict:
+    """Measure each collector against the same work without it.
+
+    Runs with and without alternate, and the best round of each is kept, so
+    noise from other processes mostly drops out of the difference.
+    """
+    histogram = Histogram("bench_seconds", "Benchmark histogram")
+    app = make_app()
+    measured_app = RequestMetricsMiddleware(app)
+    bare_us = measured_us = float("inf")
+    plain_statement_us = noop_statement_us = timed_statement_us = float("inf")
+    for _ in range(rounds):
+        bare_us = min(bare_us, asyncio.run(request_us(app, requests)))
+        measured_us = min(measured_us, asyncio.run(request_us(measured_app, requests)))
+        plain_statement_us = min(plain_statement_us, statement_us("none", statements))
+        noop_statement_us = min(noop_statement_us, statement_us("noop", statements))
+        timed_statement_us = min(timed_statement_us, statement_us("timed", statements))
+    return {
+        "histogram_observe_us": timed(lambda: histogram.observe(0.003), 100_000),
+        "labeled_observe_us": timed(
+            lambda: request_duration.observe(0.003, "GET", "/items/{item_id}", "200"), 100_000
+        ),
+        "request_us": bare_us,
+        "request_with_metrics_us": measured_us,
+        "request_overhead_us": round(measured_us - bare_us, 2),
+        "statement_us": plain_statement_us,
+        "statement_with_noop_listeners_us": noop_statement_us,
+        "statement_with_metrics_us": timed_statement_us,
+        "statement_overhead_us": round(timed_statement_us - plain_statement_us, 2),
+        "statement_timing_us": round(timed_statement_us - noop_statement_us, 2),
+        "query_series": len(query_duration.children),
+        "scrape_us": timed(registry.render, 200),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--statements", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    for key, value in run(args.requests, args.statements, args.rounds).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
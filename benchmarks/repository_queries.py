@@ -0,0 +1,89 @@
+"""Repository query latency on a seeded database (see benchmarks.seed).
+
+Runs each query as the first benchmark user, whose share of the seeded tasks
+grows with the seed scale, and reports p50/p95 in milliseconds.
+
+Usage: python -m benchmarks.repository_queries [--iterations N]
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+
+from app.db.base import AsyncSessionLocal, engine
+from app.repositories.task_repository import TaskRepository
+from app.repositories.task_stats_repository import TaskStatsRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.task import TaskFilter
+from benchmarks.load import percentile
+from benchmarks.seed import bench_email
+
+
+async def timed_async(func: Callable[[], Awaitable], iterations: int) -> dict:
+    """p50/p95 milliseconds of an awaitable call, after one untimed warmup call."""
+    await func()
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await func()
+        durations.append(time.perf_counter() - started)
+    durations.sort()
+    return {
+        "p50_ms": round(percentile(durations, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(durations, 0.95) * 1000, 3),
+    }
+
+
+async def run(iterations: int) -> dict:
+    """Time the queries behind the task and auth endpoints."""
+    async with AsyncSessionLocal() as session:
+        user = await UserRepository(session).get_by_email(bench_email(1))
+        if user is None:
+            raise SystemExit("No benchmark users; run python -m benchmarks.seed first")
+        tasks = TaskRepository(session)
+        stats = TaskStatsRepository(session)
+        users = UserRepository(session)
+        first_page = await tasks.get_by_user_id(user.id, limit=50)
+        if not first_page.items:
+            raise SystemExit("The benchmark user has no tasks; seed some first")
+        task_id = first_page.items[0].id
+        middle = first_page.total // 2 if first_page.total else 0
+        middle_page = await tasks.get_columns_by_user_id(user.id, ("id",), skip=middle, limit=1)
+        middle_id = middle_page.items[0].id if middle_page.items else task_id
+        since = datetime.utcnow().date() - timedelta(days=29)
+
+        queries: dict[str, Callable[[], Awaitable]] = {
+            "task_by_id": lambda: tasks.get_by_id(task_id),
+            "task_columns_by_id": lambda: tasks.get_columns_by_id(task_id, ("id", "title")),
+            "list_first_page": lambda: tasks.get_by_user_id(user.id, limit=50),
+            "list_keyset_middle": lambda: tasks.get_by_user_id(
+                user.id, limit=50, after=(middle_id, middle_id)
+            ),
+            "list_open_by_created_at": lambda: tasks.get_by_user_id(
+                user.id, limit=50, order_by="-created_at", filters=TaskFilter(completed=False)
+            ),
+            "search": lambda: tasks.search(user.id, "report", limit=20),
+            "stats_totals": lambda: stats.get_totals(user.id),
+            "stats_daily": lambda: stats.get_daily(user.id, since),
+            "user_is_active_cached": lambda: users.is_active(user.id),
+        }
+        results = {"user_tasks": first_page.total}
+        for name, query in queries.items():
+            results[name] = await timed_async(query, iterations)
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    for key, value in asyncio.run(run(args.iterations)).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Task list payloads as JSON vs. MessagePack: bytes, encode time and client decode time.
+
+Usage: python -m benchmarks.response_formats [--page-sizes 10,100,1000] [--iterations N]
+"""
+
+import argparse
+import json
+import time
+
+import msgpack
+
+from app.api.responses import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, serialize
+from app.schemas.task import TaskResponse
+from benchmarks.serialization import make_tasks
+
+
+def timed(func, iterations: int) -> float:
+    """Microseconds per call, averaged over the iterations."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return round((time.perf_counter() - started) / iterations * 1e6, 1)
+
+
+def run(page_size: int, iterations: int) -> dict:
+    """Encode the same page both ways and decode it as a client would."""
+    tasks = make_tasks(page_size)
+    as_json = serialize(list[TaskResponse], tasks, JSON_MEDIA_TYPE)
+    as_msgpack = serialize(list[TaskResponse], tasks, MSGPACK_MEDIA_TYPE)
+    return {
+        "page_size": page_size,
+        "json_bytes": len(as_json),
+        "msgpack_bytes": len(as_msgpack),
+        "size_ratio": round(len(as_msgpack) / len(as_json), 2),
+        "json_encode_us": timed(
+            lambda: serialize(list[TaskResponse], tasks, JSON_MEDIA_TYPE), iterations
+        ),
+        "msgpack_encode_us": timed(
+            lambda: serialize(list[TaskResponse], tasks, MSGPACK_MEDIA_TYPE), iterations
+        ),
+        "json_decode_us": timed(lambda: json.loads(as_json), iterations),
+        "msgpack_decode_us": timed(lambda: msgpack.unpackb(as_msgpack), iterations),
+    }
+
+
+def main() -> None:
+    """Run the benchmark for each page size and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-sizes", default="10,100,1000")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    for page_size in (int(size) for size in args.page_sizes.split(",")):
+        print(", ".join(f"{key}: {value}" for key, value in run(page_size, args.iterations).items()))
+
+
+if __name__ == "__main__":
+    main()
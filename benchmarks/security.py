@@ -0,0 +1,64 @@
+"""app.core.security throughput: bcrypt inline and on the hashing pool, JWT encode/decode.
+
+Verified-token caching has its own benchmark (benchmarks.token_cache).
+
+Usage: python -m benchmarks.security [--hashes N] [--tokens N]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    get_password_hash,
+    password_hash_pool,
+    verify_password,
+    verify_password_async,
+)
+from benchmarks.response_formats import timed
+
+
+async def pool_verifies_per_sec(hashed: str, calls: int) -> float:
+    """Concurrent verifications per second on the hashing pool."""
+    started = time.perf_counter()
+    await asyncio.gather(*(verify_password_async("benchpassword", hashed) for _ in range(calls)))
+    return round(calls / (time.perf_counter() - started), 1)
+
+
+def run(hashes: int, tokens: int) -> dict:
+    """Time each security function; bcrypt gets far fewer iterations than JWT."""
+    hashed = get_password_hash("benchpassword")
+    token = create_access_token({"sub": "bench@example.com", "user_id": 1})
+    hash_us = timed(lambda: get_password_hash("benchpassword"), hashes)
+    verify_us = timed(lambda: verify_password("benchpassword", hashed), hashes)
+    # Within the pool's queue limit, so nothing is rejected
+    calls = min(hashes * password_hash_pool.max_workers, password_hash_pool.max_queue)
+    pool_rate = asyncio.run(pool_verifies_per_sec(hashed, calls))
+    password_hash_pool.shutdown()
+    return {
+        "hash_ms": round(hash_us / 1000, 1),
+        "verify_ms": round(verify_us / 1000, 1),
+        "verify_inline_per_sec": round(1e6 / verify_us, 1),
+        "verify_pool_per_sec": pool_rate,
+        "pool_workers": password_hash_pool.max_workers,
+        "create_token_us": timed(
+            lambda: create_access_token({"sub": "bench@example.com", "user_id": 1}), tokens
+        ),
+        "decode_token_us": timed(lambda: decode_access_token(token, use_cache=False), tokens),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hashes", type=int, default=10)
+    parser.add_argument("--tokens", type=int, default=5_000)
+    args = parser.parse_args()
+    for key, value in run(args.hashes, args.tokens).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Seed the database at DATABASE_URL with benchmark users and tasks.
+
+Tasks are generated by PostgreSQL itself (INSERT ... SELECT generate_series) in
+chunks, so even 10^7 rows take minutes rather than hours; the stats rollups are
+kept up to date by their triggers as usual. Every user gets the same password.
+
+Usage: python -m benchmarks.seed --tasks 1e6 [--users 100] [--reset]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, INTEGER
+
+from app.core.security import get_password_hash
+from app.db.base import AsyncSessionLocal, engine
+
+BENCH_PASSWORD = "benchpassword123"
+# Tasks inserted per statement (and commit)
+CHUNK_SIZE = 100_000
+
+
+def bench_email(number: int) -> str:
+    """Email of the numbered benchmark user; the load generator logs in with it."""
+    return f"bench{number}@example.com"
+
+
+INSERT_USERS_SQL = text(
+    """
+    INSERT INTO users (email, username, hashed_password, is_active, created_at)
+    SELECT 'bench' || n || '@example.com', 'bench' || n, :hashed_password, true, :now
+    FROM generate_series(1, :users) AS n
+    ON CONFLICT DO NOTHING
+    """
+)
+
+BENCH_USER_IDS_SQL = text(
+    """
+    SELECT id FROM users
+    WHERE email LIKE 'bench%@example.com' AND username ~ '^bench[0-9]+$'
+    ORDER BY id
+    LIMIT :users
+    """
+)
+
+DELETE_USERS_SQL = text(
+    "DELETE FROM users WHERE email LIKE 'bench%@example.com' AND username ~ '^bench[0-9]+$'"
+)
+
+# Titles start with one of a few words, so searches have something to match
+INSERT_TASKS_SQL = text(
+    """
+    INSERT INTO tasks (title, description, is_completed, completed_at, user_id, created_at)
+    SELECT
+        (ARRAY['report', 'invoice', 'meeting', 'deploy', 'review', 'budget', 'design',
+               'release'])[1 + g % 8] || ' ' || g,
+        CASE WHEN g % 4 = 0 THEN NULL
+             ELSE 'Seeded task ' || g || ': lorem ipsum dolor sit amet, consectetur' END,
+        g % 3 = 0,
+        CASE WHEN g % 3 = 0 THEN CAST(:now AS timestamp) - make_interval(secs => g / 2.0) END,
+        (:user_ids)[1 + g % cardinality(:user_ids)],
+        CAST(:now AS timestamp) - make_interval(secs => g::float8)
+    FROM generate_series(CAST(:start AS bigint), CAST(:stop AS bigint)) AS g
+    """
+).bindparams(bindparam("user_ids", type_=ARRAY(INTEGER)))
+
+
+async def seed(tasks: int, users: int, reset: bool) -> dict:
+    """Create the benchmark users and give them ``tasks`` tasks between them."""
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as session:
+        if reset:
+            await session.execute(DELETE_USERS_SQL)
+        await session.execute(
+            INSERT_USERS_SQL,
+            {"hashed_password": get_password_hash(BENCH_PASSWORD), "now": now, "users": users},
+        )
+        await session.commit()
+        user_ids = list(await session.scalars(BENCH_USER_IDS_SQL, {"users": users}))
+
+        for start in range(1, tasks + 1, CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE - 1, tasks)
+            await session.execute(
+                INSERT_TASKS_SQL, {"now": now, "user_ids": user_ids, "start": start, "stop": stop}
+            )
+            await session.commit()
+            print(f"seeded {stop}/{tasks} tasks", flush=True)
+
+        await session.execute(text("ANALYZE users"))
+        await session.execute(text("ANALYZE tasks"))
+        await session.commit()
+    await engine.dispose()
+    return {
+        "users": len(user_ids),
+        "tasks": tasks,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tasks", type=float, required=True, help="Tasks to add, e.g. 1e3 up to 1e7"
+    )
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument(
+        "--reset", action="store_true", help="Delete benchmark users and their tasks first"
+    )
+    args = parser.parse_args()
+    for key, value in asyncio.run(seed(int(args.tasks), args.users, args.reset)).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Task list serialization: FastAPI response_model path vs. the single-validation path.
+
+Usage: python -m benchmarks.serialization [--page-size N] [--iterations N]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.responses import serialize
+from app.models.task import Task
+from app.schemas.task import TaskResponse
+
+
+def make_tasks(page_size: int) -> list[Task]:
+    """Build transient ORM tasks shaped like a realistic list page."""
+    now = datetime.utcnow()
+    return [
+        Task(
+            id=i,
+            title=f"Task {i}",
+            description="Lorem ipsum dolor sit amet " * 8,
+            is_completed=i % 3 == 0,
+            user_id=1,
+            created_at=now,
+            updated_at=now if i % 2 else None,
+        )
+        for i in range(page_size)
+    ]
+
+
+async def fastapi_path(tasks: list[Task], field) -> bytes:
+    """model_validate per row, then FastAPI's response_model validation and encoding."""
+    content = [TaskResponse.model_validate(task) for task in tasks]
+    encoded = await serialize_response(field=field, response_content=content)
+    return JSONResponse(encoded).body
+
+
+def run(page_size: int, iterations: int) -> dict:
+    """Time both paths over the same page of tasks."""
+    tasks = make_tasks(page_size)
+    field = create_model_field("response", list[TaskResponse], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        loop.run_until_complete(fastapi_path(tasks, field))
+    baseline = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        serialize(list[TaskResponse], tasks)
+    fast = time.perf_counter() - started
+    loop.close()
+
+    return {
+        "page_size": page_size,
+        "iterations": iterations,
+        "response_model_us_per_page": round(baseline / iterations * 1e6, 1),
+        "typed_response_us_per_page": round(fast / iterations * 1e6, 1),
+        "speedup": round(baseline / fast, 1),
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    for key, value in run(args.page_size, args.iterations).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Pytest configuration and fixtures."""
 
+import asyncio
 import os
 
 import pytest
@@ -11,10 +12,13 @@ load_dotenv(_load_env_path)
 
 
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.db.base import Base, get_db
+from app.core.config import settings
+from app.db.base import Base, get_db, get_read_db
+from app.db.pool import instrument_queries
 from app.main import app
 
 # Берём URL тестовой БД из окружения (пароль и хост могут отличаться)
@@ -45,6 +49,8 @@ def test_database_url():
 async def test_engine(test_database_url):
     """Create test database engine (function scope to avoid event loop mismatch)."""
     engine = create_async_engine(test_database_url, echo=False)
+    # Time and count statements like the application's engines do
+    instrument_queries(engine, "test")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield engine
@@ -71,6 +77,88 @@ async def client(db_session: AsyncSession):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def sql_statements(test_engine):
+    """Record every SQL statement sent through the test engine."""
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def query_budget(monkeypatch):
+    """Turn on the X-DB-* headers; returns check(response, budget) for an endpoint's queries.
+
+    check fails when the response took more queries than budgeted or repeated
+    a statement (see QueryAccountingMiddleware).
+    """
+    monkeypatch.setattr(settings, "DB_QUERY_HEADERS", True)
+
+    def check(response, budget: int) -> None:
+        request = f"{response.request.method} {response.request.url.path}"
+        count = int(response.headers["X-DB-Query-Count"])
+        assert count <= budget, f"{request} ran {count} queries, budget {budget}"
+        assert "X-DB-Repeated-Statements" not in response.headers, f"{request} repeats queries"
+
+    return check
+
+
+class FakeRedis:
+    """In-memory server for the handful of Redis commands the read cache sends."""
+
+    def __init__(self):
+        """Initialize with an empty keyspace."""
+        self.data: dict[bytes, bytes] = {}
+        self.commands: list[list[bytes]] = []
+
+    async def handle(self, reader, writer) -> None:
+        """Answer RESP commands on one connection until it closes."""
+        try:
+            while True:
+                count = int((await reader.readuntil(b"\r\n"))[1:-2])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readuntil(b"\r\n"))[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                self.commands.append(args)
+                writer.write(self.reply(args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
+
+    def reply(self, args: list[bytes]) -> bytes:
+        """Execute one command; TTLs are accepted and ignored."""
+        name, key = args[0].upper(), args[1] if len(args) > 1 else b""
+        if name == b"GET":
+            value = self.data.get(key)
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == b"SET":
+            if b"NX" in (arg.upper() for arg in args[3:]) and key in self.data:
+                return b"$-1\r\n"
+            self.data[key] = args[2]
+            return b"+OK\r\n"
+        if name == b"INCR":
+            self.data[key] = b"%d" % (int(self.data.get(key, b"0")) + 1)
+            return b":%s\r\n" % self.data[key]
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture
+async def fake_redis():
+    """Run a FakeRedis server on a free local port; yields (url, server state)."""
+    state = FakeRedis()
+    server = await asyncio.start_server(state.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"redis://127.0.0.1:{port}/0", state
+    server.close()
@@ -2,6 +2,9 @@
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.user_repository import UserRepository, user_status_cache
 
 
 @pytest.mark.asyncio
@@ -45,6 +48,56 @@ async def test_register_duplicate_email(client: AsyncClient):
     assert response.status_code == 400
 
 
+@pytest.mark.asyncio
+async def test_register_duplicate_username(client: AsyncClient):
+    """Test registration with duplicate username."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "first@example.com",
+            "username": "sameuser",
+            "password": "password123",
+        },
+    )
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "second@example.com",
+            "username": "sameuser",
+            "password": "password123",
+        },
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "User with this username already exists"
+
+    # Email wins when both are taken, as before
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "first@example.com",
+            "username": "sameuser",
+            "password": "password123",
+        },
+    )
+    assert response.json()["detail"] == "User with this email already exists"
+
+
+@pytest.mark.asyncio
+async def test_register_single_statement(client: AsyncClient, sql_statements: list[str]):
+    """Test that a successful registration is a single INSERT."""
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "onestatement@example.com",
+            "username": "onestatement",
+            "password": "password123",
+        },
+    )
+    assert response.status_code == 201
+    assert len(sql_statements) == 1
+    assert sql_statements[0].startswith("INSERT INTO users")
+
+
 @pytest.mark.asyncio
 async def test_login_success(client: AsyncClient):
     """Test successful login."""
@@ -100,3 +153,56 @@ async def test_get_current_user(client: AsyncClient):
     data = response.json()
     assert data["email"] == "current@example.com"
     assert data["username"] == "currentuser"
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_query_count(client: AsyncClient, sql_statements: list[str]):
+    """Test that /me loads the user once per request."""
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "mequery@example.com",
+            "username": "mequery",
+            "password": "mequerypassword123",
+        },
+    )
+    headers = {"Authorization": f"Bearer {register_response.json()['access_token']}"}
+
+    # First request resolves the active status, later ones hit the cache
+    sql_statements.clear()
+    await client.get("/api/v1/auth/me", headers=headers)
+    assert len(sql_statements) == 2
+
+    sql_statements.clear()
+    response = await client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert len(sql_statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_deactivated_user_is_rejected(client: AsyncClient, db_session: AsyncSession):
+    """Test that deactivating a user invalidates the cached active status."""
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "inactive@example.com",
+            "username": "inactiveuser",
+            "password": "inactivepassword123",
+        },
+    )
+    token = register_response.json()["access_token"]
+    user_id = register_response.json()["user_id"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Two requests: the second one is served from the status cache
+    hits = user_status_cache.hits
+    assert (await client.get("/api/v1/tasks", headers=headers)).status_code == 200
+    assert (await client.get("/api/v1/tasks", headers=headers)).status_code == 200
+    assert user_status_cache.hits == hits + 1
+
+    user_repo = UserRepository(db_session)
+    user = await user_repo.get_by_id(user_id)
+    await user_repo.update(user, {"is_active": False})
+
+    response = await client.get("/api/v1/tasks", headers=headers)
+    assert response.status_code == 401
@@ -0,0 +1,144 @@
+"""Tests for in-process caches."""
+
+import time
+
+import pytest
+
+from app.core.cache import TTLCache
+from app.core.read_cache import MemoryCacheBackend, ReadCache, RedisCacheBackend
+from app.core.redis import RedisClient, RedisError
+
+
+def test_ttl_cache_hit_and_miss():
+    """Test cache hits, misses and counters."""
+    cache = TTLCache(max_size=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", False)
+    assert cache.get("a") is False
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_expiry(monkeypatch):
+    """Test that entries expire after their TTL."""
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache = TTLCache(max_size=10, ttl=5)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=1)
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 2)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_lru_eviction():
+    """Test that the least recently used entry is evicted when full."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_disabled():
+    """Test that a non-positive TTL disables caching."""
+    cache = TTLCache(max_size=10, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_byte_cap():
+    """Test that entries are evicted to keep keys and values under max_bytes."""
+    cache = TTLCache(max_size=100, ttl=60, max_bytes=20)
+    cache.set("a", b"x" * 9)
+    cache.set("b", b"y" * 9)
+    assert cache.stats()["size_bytes"] == 20
+    cache.set("c", b"z" * 4)
+    assert cache.get("a") is None
+    assert cache.get("b") == b"y" * 9
+    assert cache.stats()["evictions"] == 1
+    cache.set("b", b"y")
+    assert cache.stats()["size_bytes"] == 7
+    # Too big to ever fit
+    cache.set("d", b"w" * 20)
+    assert cache.get("d") is None
+
+
+@pytest.mark.asyncio
+async def test_read_cache_versions():
+    """Test that invalidating an owner hides everything cached for them before."""
+    cache = ReadCache(MemoryCacheBackend(max_bytes=1024, ttl=60), namespace="t", ttl=60)
+    version = await cache.version(1)
+    assert await cache.version(1) == version
+    await cache.set(1, version, "page", b"old")
+    await cache.set(2, await cache.version(2), "page", b"other")
+    assert await cache.get(1, version, "page") == b"old"
+
+    await cache.invalidate(1)
+    new_version = await cache.version(1)
+    assert new_version > version
+    assert await cache.get(1, new_version, "page") is None
+    assert await cache.get(2, await cache.version(2), "page") == b"other"
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_cache_lost_version_is_reseeded():
+    """Test that an evicted version stamp never comes back as an old value."""
+    backend = MemoryCacheBackend(max_bytes=1024, ttl=60)
+    cache = ReadCache(backend, namespace="t", ttl=60)
+    await cache.invalidate(1)
+    version = await cache.version(1)
+    backend.entries.clear()
+    assert await cache.version(1) > version
+
+
+@pytest.mark.asyncio
+async def test_read_cache_redis_backend(fake_redis):
+    """Test the Redis backend against a local fake server, pipelining included."""
+    url, server = fake_redis
+    cache = ReadCache(RedisCacheBackend(RedisClient(url)), namespace="t", ttl=60)
+    version = await cache.version(7)
+    await cache.set(7, version, "task:1", b'{"id": 1}')
+    assert await cache.get(7, version, "task:1") == b'{"id": 1}'
+
+    await cache.invalidate(7)
+    assert await cache.version(7) == version + 1
+    assert await cache.get(7, version + 1, "task:1") is None
+    # Seeding and reading the stamp went out together
+    assert [command[0] for command in server.commands[:2]] == [b"SET", b"GET"]
+    assert server.commands[2][:2] == [b"SET", f"t:7:{version}:task:1".encode()]
+    await cache.backend.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_client_setup_failure(fake_redis):
+    """Test that a connection whose SELECT fails is closed, not pooled."""
+    url, server = fake_redis
+    # The fake server answers SELECT with an error reply
+    client = RedisClient(url.rsplit("/", 1)[0] + "/1")
+    with pytest.raises(RedisError):
+        await client.execute(("GET", "key"))
+    assert client._idle == []
+    assert server.commands == [[b"SELECT", b"1"]]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_read_cache_backend_down():
+    """Test that an unreachable backend turns the cache off instead of failing reads."""
+    cache = ReadCache(
+        RedisCacheBackend(RedisClient("redis://127.0.0.1:1/0", timeout=0.5)), namespace="t", ttl=60
+    )
+    assert await cache.version(1) is None
+    await cache.invalidate(1)
+    assert cache.stats()["errors"] == 2
@@ -0,0 +1,46 @@
+"""Tests for connection pool configuration and instrumentation."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.db.base import build_engine
+from app.db.pool import InstrumentedAsyncPool, pool_metrics
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_record_checkouts(test_database_url):
+    """Test that checkouts, occupancy and wait times are recorded."""
+    engine = build_engine(test_database_url, "test-pool")
+    assert isinstance(engine.sync_engine.pool, InstrumentedAsyncPool)
+
+    async def query() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT pg_sleep(0.05)"))
+
+    try:
+        await asyncio.gather(*(query() for _ in range(3)))
+    finally:
+        await engine.dispose()
+
+    metrics = pool_metrics["test-pool"].snapshot()
+    assert metrics["checkouts"] >= 3
+    assert metrics["connects"] >= 1
+    assert metrics["checked_out"] == 0
+    assert metrics["checkout_wait"]["count"] >= 3
+    assert metrics["checked_out_at_checkout"]["buckets"][float("inf")] >= 3
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_survive_dispose(test_database_url):
+    """Test that a recreated pool keeps reporting into the same metrics."""
+    engine = build_engine(test_database_url, "test-pool-recreate")
+    try:
+        await engine.dispose()
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+    assert pool_metrics["test-pool-recreate"].checkout_wait.count == 1
@@ -0,0 +1,60 @@
+"""Tests for per-request query accounting."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.db import query_accounting
+from app.db.query_accounting import QueryAccountingMiddleware, record_query, request_queries
+
+
+class RecordingLogger:
+    """Stand-in logger keeping warning calls."""
+
+    def __init__(self):
+        """Initialize with no calls."""
+        self.warnings: list[tuple[str, dict]] = []
+
+    def warning(self, event: str, **kwargs) -> None:
+        """Record a warning."""
+        self.warnings.append((event, kwargs))
+
+
+@pytest.mark.asyncio
+async def test_query_accounting_middleware(monkeypatch):
+    """Test the X-DB-* headers and flagging of a statement repeated within a request."""
+    monkeypatch.setattr(settings, "DB_QUERY_HEADERS", True)
+    log = RecordingLogger()
+    monkeypatch.setattr(query_accounting, "logger", log)
+
+    async def endpoint(request: Request) -> Response:
+        record_query("SELECT * FROM users WHERE id = $1", 0.002)
+        for _ in range(int(request.query_params.get("tasks", 0))):
+            record_query("SELECT * FROM tasks WHERE id = $1", 0.001)
+        return Response()
+
+    app = QueryAccountingMiddleware(Starlette(routes=[Route("/", endpoint)]), repeat_threshold=3)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/?tasks=2")
+        assert response.headers["X-DB-Query-Count"] == "3"
+        assert response.headers["X-DB-Time-Ms"] == "4.00"
+        assert "X-DB-Repeated-Statements" not in response.headers
+        assert log.warnings == []
+
+        response = await client.get("/?tasks=3")
+        assert response.headers["X-DB-Query-Count"] == "4"
+        assert response.headers["X-DB-Repeated-Statements"] == "1"
+        [(event, fields)] = log.warnings
+        assert event == "Repeated SQL statements"
+        assert fields["statements"] == {"SELECT * FROM tasks WHERE id = $1": 3}
+
+        monkeypatch.setattr(settings, "DB_QUERY_HEADERS", False)
+        assert "X-DB-Query-Count" not in (await client.get("/")).headers
+
+    # Outside a request nothing is recorded
+    record_query("SELECT 1", 0.001)
+    assert request_queries.get() is None
@@ -0,0 +1,114 @@
+"""Tests for the logging pipeline."""
+
+import io
+import json
+import threading
+
+import structlog
+
+from app.core import logging as app_logging
+from app.core.config import settings
+from app.core.logging import EventSampler, QueuedWriter, QueueLoggerFactory, setup_logging
+
+
+def test_event_sampler_keeps_share():
+    """Test that sampled events are kept at their rate and others untouched."""
+    sampler = EventSampler({"Task not found": 0.01})
+    kept = 0
+    for _ in range(1000):
+        try:
+            event_dict = sampler(None, "warning", {"event": "Task not found"})
+        except structlog.DropEvent:
+            continue
+        kept += 1
+        assert event_dict["sample_rate"] == 0.01
+    assert 9 <= kept <= 11
+    assert sampler(None, "info", {"event": "Other"}) == {"event": "Other"}
+
+
+def test_queued_writer_writes_in_background():
+    """Test that queued lines reach the stream, all of them by close()."""
+    stream = io.StringIO()
+    writer = QueuedWriter(stream, max_size=100)
+    logger = structlog.wrap_logger(
+        QueueLoggerFactory(writer)(), processors=[structlog.processors.JSONRenderer()]
+    )
+    for number in range(50):
+        logger.info("Line", number=number)
+    writer.close()
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["number"] for line in lines] == list(range(50))
+    assert writer.stats() == {"written": 50, "dropped": 0, "queued": 0}
+
+
+class BlockingStream(io.StringIO):
+    """Stream whose writes wait until released."""
+
+    def __init__(self):
+        """Initialize stream in the blocked state."""
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text: str) -> int:
+        """Write once released."""
+        self.release.wait(5)
+        return super().write(text)
+
+
+def test_queued_writer_drops_on_overflow():
+    """Test that a full queue drops and counts lines instead of blocking."""
+    stream = BlockingStream()
+    writer = QueuedWriter(stream, max_size=5)
+    for number in range(20):
+        writer.put(f"line {number}")
+    # At most one batch is held by the blocked writer thread, five more queue
+    assert writer.dropped >= 20 - 5 - 1
+    dropped = writer.dropped
+
+    stream.release.set()
+    writer.close()
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "line 0"
+    report = json.loads(lines[-1])
+    assert report["event"] == "Log records dropped"
+    assert report["dropped"] == dropped
+    assert len(lines) == 20 - dropped + 1
+
+
+def test_setup_logging_production_mode(monkeypatch):
+    """Test that production logging renders JSON, samples and writes through the queue."""
+    monkeypatch.setattr(settings, "DEBUG", False)
+    monkeypatch.setattr(settings, "LOG_QUEUE_SIZE", 100)
+    monkeypatch.setattr(settings, "LOG_SAMPLE_RATES", {"Sampled": 0.5})
+    stream = io.StringIO()
+    try:
+        setup_logging(stream)
+        assert app_logging.log_writer is not None
+        logger = structlog.get_logger("test-production")
+        for number in range(4):
+            logger.warning("Sampled", number=number)
+        logger.info("Kept")
+        assert "log_lines_dropped_total 0" in list(app_logging.log_writer_exposition())
+        app_logging.shutdown_logging()
+    finally:
+        monkeypatch.undo()
+        setup_logging()
+
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [event["event"] for event in events] == ["Sampled", "Sampled", "Kept"]
+    assert all("timestamp" in event for event in events)
+
+
+def test_setup_logging_inline(monkeypatch):
+    """Test that LOG_QUEUE_SIZE=0 writes inline without a writer thread."""
+    monkeypatch.setattr(settings, "DEBUG", False)
+    monkeypatch.setattr(settings, "LOG_QUEUE_SIZE", 0)
+    stream = io.StringIO()
+    try:
+        setup_logging(stream)
+        assert app_logging.log_writer is None
+        structlog.get_logger("test-inline").info("Inline")
+    finally:
+        monkeypatch.undo()
+        setup_logging()
+    assert json.loads(stream.getvalue())["event"] == "Inline"
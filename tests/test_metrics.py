@@ -0,0 +1,102 @@
+"""Tests for metrics collection and the /metrics endpoint."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.metrics import Counter, LabeledHistogram, MetricsRegistry
+from app.db.base import build_engine
+from app.db.pool import query_duration, query_errors, statement_kind
+
+
+def test_prometheus_exposition():
+    """Test the text format of counters and labelled histograms."""
+    counter = Counter("jobs_total", "Jobs run", ("queue",))
+    counter.inc('say "hi"\n')
+    counter.inc("default", amount=2)
+    histogram = LabeledHistogram("job_seconds", "Job time", ("queue",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "default")
+    histogram.observe(0.5, "default")
+    metrics = MetricsRegistry()
+    metrics.register(counter)
+    metrics.register(histogram)
+    metrics.register(lambda: ["# a gauge read at scrape time"])
+
+    assert metrics.render().splitlines() == [
+        "# HELP jobs_total Jobs run",
+        "# TYPE jobs_total counter",
+        'jobs_total{queue="say \\"hi\\"\\n"} 1',
+        'jobs_total{queue="default"} 2',
+        "# HELP job_seconds Job time",
+        "# TYPE job_seconds histogram",
+        'job_seconds_bucket{queue="default",le="0.1"} 1',
+        'job_seconds_bucket{queue="default",le="1"} 2',
+        'job_seconds_bucket{queue="default",le="+Inf"} 2',
+        'job_seconds_sum{queue="default"} 0.55',
+        'job_seconds_count{queue="default"} 2',
+        "# a gauge read at scrape time",
+    ]
+
+
+def test_statement_kind():
+    """Test that statements are labelled by a bounded set of keywords."""
+    assert statement_kind("  select id FROM tasks") == "SELECT"
+    assert statement_kind("WITH page AS (SELECT 1) SELECT * FROM page") == "WITH"
+    assert statement_kind("INSERT INTO tasks VALUES (1)") == "INSERT"
+    assert statement_kind("SAVEPOINT sa_1") == "OTHER"
+    assert statement_kind("") == "OTHER"
+
+
+@pytest.mark.asyncio
+async def test_query_metrics(test_database_url):
+    """Test that statements are timed per pool and failures counted."""
+    engine = build_engine(test_database_url, "test-metrics")
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+            with pytest.raises(DBAPIError):
+                await conn.execute(text("SELECT * FROM no_such_table"))
+    finally:
+        await engine.dispose()
+
+    assert query_duration.labels("test-metrics", "SELECT").count >= 2
+    assert query_errors.values[("test-metrics",)] == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient):
+    """Test that requests, handled exceptions, pools and caches show up in /metrics."""
+    await client.get("/health")
+    await client.get("/no/such/path")
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "metricsuser@example.com",
+            "username": "metricsuser",
+            "password": "metricspassword123",
+        },
+    )
+    token = register_response.json()["access_token"]
+    response = await client.get(
+        "/api/v1/tasks/999999", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 404
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    assert 'route="unmatched",status="404"' in body
+    assert 'route="/api/v1/tasks/{task_id}",status="404"' in body
+    assert 'app_exceptions_total{exception="TaskNotFoundError"}' in body
+    # Handlers that never ran are reported too, at zero
+    assert 'app_exceptions_total{exception="ServiceUnavailableError"}' in body
+    assert 'db_pool_size{pool="primary"}' in body
+    assert "# TYPE db_query_duration_seconds histogram" in body
+    assert 'cache_misses_total{cache="user_status"}' in body
+    assert 'cache_hits_total{cache="task"}' in body
+    assert "password_hash_rejected_total 0" in body
+    assert "password_hash_run_seconds_count" in body
@@ -0,0 +1,41 @@
+"""Tests for response serialization and content negotiation."""
+
+import json
+from datetime import datetime
+
+import msgpack
+
+from app.api.responses import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, negotiate, serialize
+from app.schemas.task import TaskResponse
+
+
+def test_negotiate():
+    """Test that MessagePack is chosen only when the client prefers it."""
+    assert negotiate(None) == JSON_MEDIA_TYPE
+    assert negotiate("*/*") == JSON_MEDIA_TYPE
+    assert negotiate("application/json, application/msgpack;q=0.5") == JSON_MEDIA_TYPE
+    assert negotiate("application/msgpack") == MSGPACK_MEDIA_TYPE
+    assert negotiate("application/x-msgpack, */*;q=0.1") == MSGPACK_MEDIA_TYPE
+    assert negotiate("application/msgpack, application/json") == MSGPACK_MEDIA_TYPE
+    assert negotiate("application/msgpack;q=0, */*") == JSON_MEDIA_TYPE
+    assert negotiate("application/msgpack;q=oops") == JSON_MEDIA_TYPE
+
+
+def test_serialize_msgpack_matches_json():
+    """Test that MessagePack carries the same values as JSON, and fewer bytes."""
+    tasks = [
+        {
+            "id": i,
+            "title": f"Task {i}",
+            "description": None,
+            "is_completed": bool(i % 2),
+            "user_id": 1,
+            "created_at": datetime(2026, 1, 2, 3, 4, 5, 678901),
+            "updated_at": None,
+        }
+        for i in range(3)
+    ]
+    as_json = serialize(list[TaskResponse], tasks)
+    as_msgpack = serialize(list[TaskResponse], tasks, MSGPACK_MEDIA_TYPE)
+    assert msgpack.unpackb(as_msgpack) == json.loads(as_json)
+    assert len(as_msgpack) < len(as_json)
@@ -0,0 +1,83 @@
+"""Tests for security utilities."""
+
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.core.exceptions import ServiceUnavailableError
+from app.core.security import (
+    PasswordHashPool,
+    create_access_token,
+    decode_access_token,
+    get_password_hash_async,
+    token_cache,
+    verify_password_async,
+)
+
+
+def test_decode_access_token_is_cached():
+    """Test that a verified token is served from the cache."""
+    token_cache.clear()
+    token = create_access_token({"sub": "cached@example.com", "user_id": 1})
+
+    assert decode_access_token(token)["user_id"] == 1
+    hits = token_cache.hits
+    payload = decode_access_token(token)
+    assert payload["user_id"] == 1
+    assert token_cache.hits == hits + 1
+
+    # Callers get a copy, so mutating it doesn't poison the cache
+    payload["user_id"] = 2
+    assert decode_access_token(token)["user_id"] == 1
+
+
+def test_cached_token_expires_with_exp(monkeypatch):
+    """Test that a cached entry is dropped at the token's exp."""
+    token_cache.clear()
+    token = create_access_token({"user_id": 1}, expires_delta=timedelta(seconds=60))
+    assert decode_access_token(token) is not None
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 120)
+    assert token_cache.get(token) is None
+
+
+def test_invalid_token_is_not_cached():
+    """Test that tampered tokens are rejected and never cached."""
+    token_cache.clear()
+    token = create_access_token({"user_id": 1})
+    tampered = token[:-2] + ("AA" if not token.endswith("AA") else "BB")
+
+    assert decode_access_token(tampered) is None
+    assert len(token_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_on_pool():
+    """Test async hashing and verification round trip."""
+    hashed = await get_password_hash_async("poolpassword123")
+    assert await verify_password_async("poolpassword123", hashed)
+    assert not await verify_password_async("wrongpassword", hashed)
+
+
+@pytest.mark.asyncio
+async def test_password_hash_pool_rejects_when_full():
+    """Test that calls beyond workers + queue fail fast and timings are recorded."""
+    pool = PasswordHashPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+    running = [asyncio.create_task(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceUnavailableError):
+        await pool.run(release.wait)
+
+    release.set()
+    assert await asyncio.gather(*running) == [True, True]
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["run_time"]["count"] == 2
+    assert stats["queue_wait"]["count"] == 2
+    pool.shutdown()
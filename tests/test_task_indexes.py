@@ -0,0 +1,63 @@
+"""Tests that task listing queries are served by the task indexes."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.models.task import Task
+from app.repositories.task_repository import filter_tasks, paginate
+from app.schemas.task import TaskFilter
+
+PLANNER_SETTINGS = ("enable_seqscan", "enable_bitmapscan", "enable_sort")
+
+CASES = [
+    ("id", TaskFilter(), "ix_tasks_user_id_id"),
+    ("-id", TaskFilter(), "ix_tasks_user_id_id"),
+    ("id", TaskFilter(completed=False), "ix_tasks_user_id_id_open"),
+    ("-id", TaskFilter(completed=False), "ix_tasks_user_id_id_open"),
+    ("id", TaskFilter(completed=True), "ix_tasks_user_id_id"),
+    (
+        "created_at",
+        TaskFilter(created_after=datetime(2024, 1, 1)),
+        "ix_tasks_user_id_created_at_id",
+    ),
+    (
+        "-created_at",
+        TaskFilter(created_after=datetime(2024, 1, 1), created_before=datetime(2025, 1, 1)),
+        "ix_tasks_user_id_created_at_id",
+    ),
+    ("created_at", TaskFilter(completed=False), "ix_tasks_user_id_created_at_id"),
+    ("-updated_at", TaskFilter(), "ix_tasks_user_id_updated_at_id"),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("order_by, filters, index", CASES)
+async def test_list_query_uses_index(test_engine, order_by, filters, index):
+    """Test that each filter and order combination is an index scan without a sort."""
+    query = paginate(
+        filter_tasks(select(Task).where(Task.user_id == 1), filters),
+        skip=0,
+        limit=101,
+        order_by=order_by,
+        after=None,
+    )
+    compiled = query.compile(dialect=test_engine.dialect)
+    params = [compiled.params[name] for name in compiled.positiontup]
+
+    async with test_engine.connect() as conn:
+        raw_connection = await conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        # The table is empty, so rule out the alternatives: a Sort left in the plan
+        # means no index can return the page in order
+        for setting in PLANNER_SETTINGS:
+            await driver_connection.execute(f"SET {setting} = off")
+        try:
+            rows = await driver_connection.fetch(f"EXPLAIN {compiled}", *params)
+        finally:
+            await driver_connection.execute("RESET ALL")
+    plan = "\n".join(row[0] for row in rows)
+
+    assert f" using {index} " in plan
+    assert "Sort" not in plan
@@ -1,8 +1,18 @@
 """Tests for task endpoints."""
 
+import csv
+import io
+import json
+
+import msgpack
 import pytest
 from httpx import AsyncClient
 
+from app.core.config import settings
+from app.core.read_cache import MemoryCacheBackend
+from app.repositories.task_stats_repository import TaskStatsRepository
+from app.services.task_service import task_cache
+
 
 @pytest.mark.asyncio
 async def test_create_task(client: AsyncClient):
@@ -63,6 +73,110 @@ async def test_list_tasks(client: AsyncClient):
     assert len(data) == 3
 
 
+@pytest.mark.asyncio
+async def test_list_tasks_cursor_pagination(client: AsyncClient):
+    """Test walking the task list with keyset cursors."""
+    # Register and get token
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "cursoruser@example.com",
+            "username": "cursoruser",
+            "password": "cursorpassword123",
+        },
+    )
+    token = register_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for i in range(5):
+        await client.post("/api/v1/tasks", json={"title": f"Task {i}"}, headers=headers)
+
+    for order_by in ("id", "created_at", "updated_at", "-id", "-created_at", "-updated_at"):
+        titles = []
+        params = {"limit": 2, "order_by": order_by}
+        while True:
+            response = await client.get("/api/v1/tasks", params=params, headers=headers)
+            assert response.status_code == 200
+            titles.extend(task["title"] for task in response.json())
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if not next_cursor:
+                break
+            params["cursor"] = next_cursor
+
+        expected = [f"Task {i}" for i in range(5)]
+        assert titles == (expected[::-1] if order_by.startswith("-") else expected)
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_invalid_cursor(client: AsyncClient):
+    """Test listing tasks with a malformed or mismatched cursor."""
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "badcursor@example.com",
+            "username": "badcursor",
+            "password": "badcursorpassword123",
+        },
+    )
+    token = register_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for i in range(3):
+        await client.post("/api/v1/tasks", json={"title": f"Task {i}"}, headers=headers)
+
+    response = await client.get("/api/v1/tasks", params={"cursor": "garbage"}, headers=headers)
+    assert response.status_code == 400
+
+    first_page = await client.get("/api/v1/tasks", params={"limit": 1}, headers=headers)
+    response = await client.get(
+        "/api/v1/tasks",
+        params={"cursor": first_page.headers["X-Next-Cursor"], "order_by": "created_at"},
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_filters(client: AsyncClient):
+    """Test filtering the task list by completion and creation time."""
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "filteruser@example.com",
+            "username": "filteruser",
+            "password": "filterpassword123",
+        },
+    )
+    headers = {"Authorization": f"Bearer {register_response.json()['access_token']}"}
+    created = []
+    for i in range(4):
+        response = await client.post("/api/v1/tasks", json={"title": f"Task {i}"}, headers=headers)
+        created.append(response.json())
+    for task in created[::2]:
+        await client.put(
+            f"/api/v1/tasks/{task['id']}", json={"is_completed": True}, headers=headers
+        )
+
+    response = await client.get("/api/v1/tasks", params={"completed": False}, headers=headers)
+    assert [task["title"] for task in response.json()] == ["Task 1", "Task 3"]
+    response = await client.get(
+        "/api/v1/tasks", params={"completed": True, "order_by": "-id"}, headers=headers
+    )
+    assert [task["title"] for task in response.json()] == ["Task 2", "Task 0"]
+
+    params = {
+        "order_by": "created_at",
+        "created_after": created[1]["created_at"],
+        "created_before": created[3]["created_at"],
+    }
+    response = await client.get("/api/v1/tasks", params=params, headers=headers)
+    assert [task["title"] for task in response.json()] == ["Task 1", "Task 2"]
+
+    params["order_by"] = "id"
+    response = await client.get("/api/v1/tasks", params=params, headers=headers)
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_get_task(client: AsyncClient):
     """Test getting a task by ID."""
@@ -165,3 +279,633 @@ async def test_delete_task(client: AsyncClient):
         headers={"Authorization": f"Bearer {token}"},
     )
     assert get_response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_batch_create_update_delete(client: AsyncClient):
+    """Test batch task endpoints and their per-item results."""
+    # Register two users
+    tokens = []
+    for name in ("batchowner", "batchother"):
+        register_response = await client.post(
+            "/api/v1/auth/register",
+            json={
+                "email": f"{name}@example.com",
+                "username": name,
+                "password": f"{name}password123",
+            },
+        )
+        tokens.append(register_response.json()["access_token"])
+    headers = {"Authorization": f"Bearer {tokens[0]}"}
+
+    other_task = await client.post(
+        "/api/v1/tasks",
+        json={"title": "Not yours"},
+        headers={"Authorization": f"Bearer {tokens[1]}"},
+    )
+    other_id = other_task.json()["id"]
+
+    # Batch create
+    response = await client.post(
+        "/api/v1/tasks/batch",
+        json={"items": [{"title": f"Batch {i}"} for i in range(3)]},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    results = response.json()["results"]
+    assert [r["task"]["title"] for r in results] == ["Batch 0", "Batch 1", "Batch 2"]
+    ids = [r["id"] for r in results]
+
+    # Batch update: two valid items, a duplicate, another user's task and a null title
+    response = await client.patch(
+        "/api/v1/tasks/batch",
+        json={
+            "items": [
+                {"id": ids[0], "is_completed": True},
+                {"id": ids[1], "title": "Renamed", "description": "New"},
+                {"id": ids[0], "title": "Duplicate"},
+                {"id": other_id, "title": "Hijacked"},
+                {"id": ids[2], "title": None},
+            ]
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["success"] for r in results] == [True, True, False, False, False]
+    assert results[0]["task"]["is_completed"] is True
+    assert results[0]["task"]["title"] == "Batch 0"
+    assert results[1]["task"]["title"] == "Renamed"
+    assert results[1]["task"]["description"] == "New"
+    assert results[3]["error"] == "Task not found"
+
+    # Batch delete
+    response = await client.request(
+        "DELETE",
+        "/api/v1/tasks/batch",
+        json={"ids": [ids[0], ids[1], other_id]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert [r["success"] for r in response.json()["results"]] == [True, True, False]
+
+    list_response = await client.get("/api/v1/tasks", headers=headers)
+    assert [task["id"] for task in list_response.json()] == [ids[2]]
+
+
+@pytest.mark.asyncio
+async def test_update_delete_missing_or_foreign_task(client: AsyncClient):
+    """Test not-found vs. forbidden responses for single-statement mutations."""
+    tokens = []
+    for name in ("owneruser", "intruder"):
+        register_response = await client.post(
+            "/api/v1/auth/register",
+            json={
+                "email": f"{name}@example.com",
+                "username": name,
+                "password": f"{name}password123",
+            },
+        )
+        tokens.append(register_response.json()["access_token"])
+    owner = {"Authorization": f"Bearer {tokens[0]}"}
+    intruder = {"Authorization": f"Bearer {tokens[1]}"}
+
+    create_response = await client.post("/api/v1/tasks", json={"title": "Mine"}, headers=owner)
+    task_id = create_response.json()["id"]
+
+    response = await client.put(f"/api/v1/tasks/{task_id}", json={"title": "X"}, headers=intruder)
+    assert response.status_code == 401
+    response = await client.delete(f"/api/v1/tasks/{task_id}", headers=intruder)
+    assert response.status_code == 401
+
+    response = await client.put("/api/v1/tasks/999999", json={"title": "X"}, headers=owner)
+    assert response.status_code == 404
+    response = await client.delete("/api/v1/tasks/999999", headers=owner)
+    assert response.status_code == 404
+
+    # The owner's update is visible on the next read
+    await client.put(f"/api/v1/tasks/{task_id}", json={"title": "Still mine"}, headers=owner)
+    response = await client.get(f"/api/v1/tasks/{task_id}", headers=owner)
+    assert response.json()["title"] == "Still mine"
+    assert response.json()["updated_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_task_endpoint_query_counts(client: AsyncClient, query_budget):
+    """Test each task endpoint's query budget once the user is resolved."""
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "querycount@example.com",
+            "username": "querycount",
+            "password": "querycountpassword123",
+        },
+    )
+    headers = {"Authorization": f"Bearer {register_response.json()['access_token']}"}
+    # Warm the user status cache
+    await client.get("/api/v1/tasks", headers=headers)
+
+    create_response = await client.post("/api/v1/tasks", json={"title": "Q"}, headers=headers)
+    query_budget(create_response, 1)
+    task_id = create_response.json()["id"]
+
+    batch = {"items": [{"title": f"Batch {i}"} for i in range(5)]}
+    batch_response = await client.post("/api/v1/tasks/batch", json=batch, headers=headers)
+    query_budget(batch_response, 1)
+    batch_ids = [result["id"] for result in batch_response.json()["results"]]
+
+    requests = [
+        ("GET", "/api/v1/tasks", None, 1),
+        ("GET", f"/api/v1/tasks/{task_id}", None, 1),
+        # Totals and per-day counts
+        ("GET", "/api/v1/tasks/stats", None, 2),
+        ("GET", "/api/v1/tasks/search?q=batch", None, 1),
+        ("PUT", f"/api/v1/tasks/{task_id}", {"is_completed": True}, 1),
+        (
+            "PATCH",
+            "/api/v1/tasks/batch",
+            {"items": [{"id": batch_id, "is_completed": True} for batch_id in batch_ids]},
+            1,
+        ),
+        ("DELETE", "/api/v1/tasks/batch", {"ids": batch_ids}, 1),
+        ("DELETE", f"/api/v1/tasks/{task_id}", None, 1),
+    ]
+    for method, url, body, budget in requests:
+        response = await client.request(method, url, json=body, headers=headers)
+        assert response.status_code < 300, (method, url, response.text)
+        query_budget(response, budget)
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets(client: AsyncClient, sql_statements: list[str]):
+    """Test fields= trims responses and the selected columns."""
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "sparse@example.com",
+            "username": "sparseuser",
+            "password": "sparsepassword123",
+        },
+    )
+    headers = {"Authorization": f"Bearer {register_response.json()['access_token']}"}
+    for i in range(3):
+        create_response = await client.post(
+            "/api/v1/tasks",
+            json={"title": f"Sparse {i}", "description": "x" * 1000},
+            headers=headers,
+        )
+    task_id = create_response.json()["id"]
+
+    sql_statements.clear()
+    response = await client.get(
+        "/api/v1/tasks",
+        params={"fields": "title,is_completed", "limit": 2},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()[0] == {"title": "Sparse 0", "id": task_id - 2, "is_completed": False}
+    assert "X-Next-Cursor" in response.headers
+    assert "description" not in sql_statements[-1]
+
+    response = await client.get(
+        f"/api/v1/tasks/{task_id}", params={"fields": "title"}, headers=headers
+    )
+    assert response.json() == {"title": "Sparse 2", "id": task_id}
+
+    response = await client.get("/api/v1/tasks", params={"fields": "secret"}, headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_tasks(client: AsyncClient):
+    """Test ranked full-text, prefix and typo-tolerant search."""
+    headers = {}
+    for name in ("searcher", "othersearcher"):
+        register_response = await client.post(
+            "/api/v1/auth/register",
+            json={"email": f"{name}@example.com", "username": name, "password": f"{name}pass123"},
+        )
+        headers[name] = {"Authorization": f"Bearer {register_response.json()['access_token']}"}
+    await client.post(
+        "/api/v1/tasks/batch",
+        json={
+            "items": [
+                {"title": "Buy groceries", "description": "Milk and bread"},
+                {"title": "Team meeting", "description": "Discuss groceries budget"},
+                {"title": "Fix parser bug"},
+            ]
+        },
+        headers=headers["searcher"],
+    )
+    await client.post(
+        "/api/v1/tasks", json={"title": "Buy groceries"}, headers=headers["othersearcher"]
+    )
+
+    async def search(q: str) -> list[str]:
+        response = await client.get(
+            "/api/v1/tasks/search", params={"q": q}, headers=headers["searcher"]
+        )
+        assert response.status_code == 200
+        return [result["task"]["title"] for result in response.json()]
+
+    # Title matches outrank description matches; other users' tasks never show up
+    assert await search("groceries") == ["Buy groceries", "Team meeting"]
+    assert await search("meting") == ["Team meeting"]
+    assert await search("pars") == ["Fix parser bug"]
+    assert await search("bread -milk") == []
+
+    response = await client.get("/api/v1/tasks/search", headers=headers["searcher"])
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_tasks(client: AsyncClient):
+    """Test streaming export as NDJSON and CSV."""
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "exporter@example.com",
+            "username": "exporter",
+            "password": "exporterpassword123",
+        },
+    )
+    headers = {"Authorization": f"Bearer {register_response.json()['access_token']}"}
+    await client.post(
+        "/api/v1/tasks/batch",
+        json={"items": [{"title": f"Export {i}", "description": "a,b\nc"} for i in range(5)]},
+        headers=headers,
+    )
+
+    response = await client.get("/api/v1/tasks/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["title"] for line in lines] == [f"Export {i}" for i in range(5)]
+    assert lines[0]["description"] == "a,b\nc"
+
+    response = await client.get("/api/v1/tasks/export", params={"format": "csv"}, headers=headers)
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 5
+    assert rows[0]["title"] == "Export 0"
+    assert rows[0]["description"] == "a,b\nc"
+    assert rows[0]["is_completed"] == "false"
+
+    # The session is still usable after the stream closed it
+    assert (await client.get("/api/v1/tasks", headers=headers)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_ndjson(client: AsyncClient, monkeypatch):
+    """Test NDJSON import in several COPY batches with per-line errors."""
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "importer@example.com",
+            "username": "importer",
+            "password": "importerpassword123",
+        },
+    )
+    headers = {"Authorization": f"Bearer {register_response.json()['access_token']}"}
+    body = "\n".join(
+        [
+            json.dumps({"title": "Import 0", "description": "first"}),
+            json.dumps({"title": "Import 1", "is_completed": True}),
+            "",
+            "{not json",
+            json.dumps({"title": ""}),
+            json.dumps(["Import"]),
+            json.dumps({"title": "Import 2", "user_id": 999}),
+        ]
+    ).encode()
+
+    async def chunks():
+        # Split mid-line so rows straddle chunk boundaries
+        for start in range(0, len(body), 7):
+            yield body[start : start + 7]
+
+    response = await client.post("/api/v1/tasks/import", content=chunks(), headers=headers)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 3
+    assert result["failed"] == 3
+    assert result["batches"] == 2
+    assert [error["line"] for error in result["errors"]] == [4, 5, 6]
+
+    response = await client.get("/api/v1/tasks", headers=headers)
+    tasks = response.json()
+    assert [task["title"] for task in tasks] == ["Import 0", "Import 1", "Import 2"]
+    assert tasks[1]["is_completed"] is True
+    assert {task["user_id"] for task in tasks} == {register_response.json()["user_id"]}
+
+
+@pytest.mark.asyncio
+async def test_import_tasks_csv_roundtrip(client: AsyncClient):
+    """Test that a CSV export imports back, including multi-line fields and stray quotes."""
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "csvimporter@example.com",
+            "username": "csvimporter",
+            "password": "csvimporterpassword123",
+        },
+    )
+    headers = {"Authorization": f"Bearer {register_response.json()['access_token']}"}
+    await client.post(
+        "/api/v1/tasks/batch",
+        json={"items": [{"title": "Round trip", "description": "a,b\nc"}, {"title": "Plain"}]},
+        headers=headers,
+    )
+    export = await client.get("/api/v1/tasks/export", params={"format": "csv"}, headers=headers)
+
+    response = await client.post(
+        "/api/v1/tasks/import",
+        params={"format": "csv"},
+        content=export.content + b'"",missing title\n',
+        headers=headers,
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 2
+    assert result["failed"] == 1
+    assert result["errors"][0]["line"] == 5
+
+    response = await client.get("/api/v1/tasks", headers=headers)
+    tasks = response.json()
+    assert len(tasks) == 4
+    assert tasks[2]["description"] == "a,b\nc"
+    assert tasks[3]["description"] is None
+
+    # A quote inside an unquoted cell is a literal character, not an open field
+    response = await client.post(
+        "/api/v1/tasks/import",
+        params={"format": "csv"},
+        content=b'title,description\nHe said "hi,stray\nAfter 1,\nAfter 2,x\n',
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["imported"] == 3
+    response = await client.get("/api/v1/tasks", headers=headers)
+    titles = [task["title"] for task in response.json()[4:]]
+    assert titles == ['He said "hi', "After 1", "After 2"]
+
+    response = await client.post(
+        "/api/v1/tasks/import",
+        params={"format": "csv"},
+        content=b"name\nx\n",
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_task_stats(client: AsyncClient, db_session):
+    """Test the stats rollup across write paths, X-Total-Count and a rebuild."""
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "statsuser@example.com",
+            "username": "statsuser",
+            "password": "statspassword123",
+        },
+    )
+    user_id = register_response.json()["user_id"]
+    headers = {"Authorization": f"Bearer {register_response.json()['access_token']}"}
+
+    response = await client.get("/api/v1/tasks/stats", headers=headers)
+    assert response.json() == {"total": 0, "open": 0, "completed": 0, "daily": []}
+
+    create_response = await client.post("/api/v1/tasks", json={"title": "One"}, headers=headers)
+    task_id = create_response.json()["id"]
+    await client.post(
+        "/api/v1/tasks/batch",
+        json={"items": [{"title": "Two"}, {"title": "Three"}, {"title": "Four"}]},
+        headers=headers,
+    )
+    await client.post(
+        "/api/v1/tasks/import",
+        content=b'{"title": "Five", "is_completed": true}\n',
+        headers=headers,
+    )
+    await client.put(f"/api/v1/tasks/{task_id}", json={"is_completed": True}, headers=headers)
+    await client.delete(f"/api/v1/tasks/{task_id + 1}", headers=headers)
+
+    response = await client.get("/api/v1/tasks/stats", headers=headers)
+    assert response.status_code == 200
+    stats = response.json()
+    assert (stats["total"], stats["open"], stats["completed"]) == (4, 2, 2)
+    assert [(day["created"], day["completed"]) for day in stats["daily"]] == [(4, 2)]
+
+    for params, count in [({}, "4"), ({"completed": True}, "2"), ({"completed": False}, "2")]:
+        response = await client.get("/api/v1/tasks", params={**params, "limit": 1}, headers=headers)
+        assert response.headers["X-Total-Count"] == count
+    response = await client.get(
+        "/api/v1/tasks", params={"cursor": response.headers["X-Next-Cursor"]}, headers=headers
+    )
+    # The last page is empty of further rows but still reports the count
+    assert response.headers["X-Total-Count"] == "4"
+    response = await client.get(
+        "/api/v1/tasks",
+        params={"order_by": "created_at", "created_after": "2000-01-01T00:00:00"},
+        headers=headers,
+    )
+    assert "X-Total-Count" not in response.headers
+
+    await TaskStatsRepository(db_session).rebuild(user_id)
+    response = await client.get("/api/v1/tasks/stats", headers=headers)
+    assert response.json() == stats
+
+
+@pytest.mark.asyncio
+async def test_conditional_requests(client: AsyncClient, sql_statements: list[str]):
+    """Test ETags, If-None-Match 304s without loading tasks, and If-Match on writes."""
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "etaguser@example.com",
+            "username": "etaguser",
+            "password": "etagpassword123",
+        },
+    )
+    headers = {"Authorization": f"Bearer {register_response.json()['access_token']}"}
+    create_response = await client.post("/api/v1/tasks", json={"title": "Tag"}, headers=headers)
+    task_id = create_response.json()["id"]
+    url = f"/api/v1/tasks/{task_id}"
+
+    response = await client.get(url, headers=headers)
+    etag = response.headers["ETag"]
+    sparse_response = await client.get(url, params={"fields": "title"}, headers=headers)
+    assert sparse_response.headers["ETag"] != etag
+
+    sql_statements.clear()
+    response = await client.get(url, headers={**headers, "If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    assert len(sql_statements) == 1 and "description" not in sql_statements[0]
+
+    list_response = await client.get("/api/v1/tasks", params={"limit": 10}, headers=headers)
+    list_etag = list_response.headers["ETag"]
+    sql_statements.clear()
+    response = await client.get(
+        "/api/v1/tasks", params={"limit": 10}, headers={**headers, "If-None-Match": list_etag}
+    )
+    assert response.status_code == 304
+    assert len(sql_statements) == 1 and "FROM tasks" not in sql_statements[0]
+    # Another page of the same list is a different representation
+    response = await client.get(
+        "/api/v1/tasks", params={"limit": 5}, headers={**headers, "If-None-Match": list_etag}
+    )
+    assert response.status_code == 200
+
+    response = await client.put(
+        url, json={"title": "Retagged"}, headers={**headers, "If-Match": etag}
+    )
+    assert response.status_code == 200
+    new_etag = response.headers["ETag"]
+    assert new_etag != etag
+
+    # Stale validators: the task and list both changed
+    response = await client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == new_etag
+    response = await client.get(
+        "/api/v1/tasks", params={"limit": 10}, headers={**headers, "If-None-Match": list_etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != list_etag
+
+    for method, body in [("PUT", {"title": "Lost update"}), ("DELETE", None)]:
+        response = await client.request(
+            method, url, json=body, headers={**headers, "If-Match": etag}
+        )
+        assert response.status_code == 412
+        # If-Match uses strong comparison
+        response = await client.request(
+            method, url, json=body, headers={**headers, "If-Match": f"W/{new_etag}"}
+        )
+        assert response.status_code == 412
+    assert (await client.get(url, headers=headers)).json()["title"] == "Retagged"
+
+    response = await client.delete(url, headers={**headers, "If-Match": new_etag})
+    assert response.status_code == 204
+    response = await client.get(url, headers={**headers, "If-None-Match": new_etag})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_task_read_cache(client: AsyncClient, sql_statements: list[str], monkeypatch):
+    """Test cached reads skip the database and are never served after a write."""
+    monkeypatch.setattr(task_cache, "backend", MemoryCacheBackend(max_bytes=1 << 20, ttl=60))
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "cacheuser@example.com",
+            "username": "cacheuser",
+            "password": "cachepassword123",
+        },
+    )
+    headers = {"Authorization": f"Bearer {register_response.json()['access_token']}"}
+    create_response = await client.post("/api/v1/tasks", json={"title": "Cached"}, headers=headers)
+    task_id = create_response.json()["id"]
+    url = f"/api/v1/tasks/{task_id}"
+
+    first = await client.get("/api/v1/tasks", headers=headers)
+    await client.get(url, headers=headers)
+    sql_statements.clear()
+    response = await client.get("/api/v1/tasks", headers=headers)
+    assert response.json() == first.json()
+    assert response.headers["ETag"] == first.headers["ETag"]
+    assert response.headers["X-Total-Count"] == "1"
+    assert (await client.get(url, headers=headers)).json()["title"] == "Cached"
+    assert sql_statements == []
+
+    writes = [
+        ("PUT", url, {"title": "Renamed"}),
+        ("POST", "/api/v1/tasks/batch", {"items": [{"title": "Batch"}]}),
+        ("PATCH", "/api/v1/tasks/batch", {"items": [{"id": task_id, "is_completed": True}]}),
+    ]
+    for method, write_url, body in writes:
+        await client.request(method, write_url, json=body, headers=headers)
+        listed = (await client.get("/api/v1/tasks", headers=headers)).json()
+        task = (await client.get(url, headers=headers)).json()
+        assert next(item for item in listed if item["id"] == task_id) == task
+    assert (task["title"], task["is_completed"], len(listed)) == ("Renamed", True, 2)
+
+    await client.delete(url, headers=headers)
+    assert (await client.get(url, headers=headers)).status_code == 404
+    assert len((await client.get("/api/v1/tasks", headers=headers)).json()) == 1
+    assert task_cache.stats()["hits"] > 0
+
+
+@pytest.mark.asyncio
+async def test_msgpack_requests_and_responses(client: AsyncClient):
+    """Test MessagePack bodies and Accept negotiation on task and auth endpoints."""
+    register_response = await client.post(
+        "/api/v1/auth/register",
+        content=msgpack.packb(
+            {
+                "email": "msgpackuser@example.com",
+                "username": "msgpackuser",
+                "password": "msgpackpassword123",
+            }
+        ),
+        headers={"Content-Type": "application/msgpack", "Accept": "application/msgpack"},
+    )
+    assert register_response.status_code == 201
+    assert register_response.headers["content-type"] == "application/msgpack"
+    token = msgpack.unpackb(register_response.content)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    msgpack_headers = {
+        **headers,
+        "Content-Type": "application/msgpack",
+        "Accept": "application/msgpack",
+    }
+
+    response = await client.post(
+        "/api/v1/tasks", content=msgpack.packb({"title": "Packed"}), headers=msgpack_headers
+    )
+    assert response.status_code == 201
+    task = msgpack.unpackb(response.content)
+    assert task["title"] == "Packed"
+
+    response = await client.put(
+        f"/api/v1/tasks/{task['id']}",
+        content=msgpack.packb({"is_completed": True}),
+        headers=msgpack_headers,
+    )
+    assert msgpack.unpackb(response.content)["is_completed"] is True
+
+    response = await client.post(
+        "/api/v1/tasks/batch",
+        content=msgpack.packb({"items": [{"title": "Packed batch"}]}),
+        headers=msgpack_headers,
+    )
+    assert msgpack.unpackb(response.content)["results"][0]["success"] is True
+
+    packed = await client.get("/api/v1/tasks", headers=msgpack_headers)
+    plain = await client.get("/api/v1/tasks", headers=headers)
+    assert packed.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(packed.content) == plain.json()
+    assert packed.headers["Vary"] == "Accept"
+    # Each representation has its own ETag
+    assert packed.headers["ETag"] != plain.headers["ETag"]
+    response = await client.get(
+        "/api/v1/tasks", headers={**headers, "If-None-Match": plain.headers["ETag"]}
+    )
+    assert response.status_code == 304
+    response = await client.get(
+        "/api/v1/tasks", headers={**msgpack_headers, "If-None-Match": plain.headers["ETag"]}
+    )
+    assert response.status_code == 200
+
+    response = await client.get("/api/v1/auth/me", headers=msgpack_headers)
+    assert msgpack.unpackb(response.content)["username"] == "msgpackuser"
+
+    response = await client.post("/api/v1/tasks", content=b"\xc1", headers=msgpack_headers)
+    assert response.status_code == 400
+    response = await client.post(
+        "/api/v1/tasks", content=msgpack.packb({"title": ""}), headers=msgpack_headers
+    )
+    assert response.status_code == 422